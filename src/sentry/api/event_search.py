@@ -1,8 +1,10 @@
 import re
-from collections import namedtuple
+import threading
+from collections import OrderedDict, namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
+from functools import lru_cache
+from typing import Any, Hashable, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
 from django.utils.functional import cached_property
 from parsimonious.exceptions import IncompleteParseError
@@ -1134,14 +1136,109 @@ default_config = SearchConfig(
 )
 
 
+#: Number of parsed query strings kept per process
+PARSE_TREE_CACHE_SIZE = 5000
+
+#: Number of visited search terms kept per process
+SEARCH_TERMS_CACHE_SIZE = 5000
+
+
+@lru_cache(maxsize=PARSE_TREE_CACHE_SIZE)
+def _parse_tree(query: str) -> Node:
+    # Visitors only read the tree, so the same tree can be visited many times.
+    return event_search_grammar.parse(query)
+
+
+class SearchTermsCache:
+    """
+    A bounded LRU cache of the search terms returned by `parse_search_query`.
+
+    Entries are keyed by the query string, the identity of the search config
+    and the parameters passed to the visitor. The config is stored with the
+    entry, so that a reused object id never yields another config's terms.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[SearchConfig, Tuple[Any, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, config: "SearchConfig") -> Union[Tuple[Any, ...], None]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] is not config:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, config: "SearchConfig", terms: Sequence[Any]) -> None:
+        with self._lock:
+            self._data[key] = (config, tuple(terms))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+search_terms_cache = SearchTermsCache(SEARCH_TERMS_CACHE_SIZE)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converts parameters into a hashable cache key, raising `TypeError` if it can't."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(val) for val in value)
+    hash(value)
+    return value
+
+
+def _is_time_dependent(terms: Sequence[Any]) -> bool:
+    """
+    Returns whether the terms contain dates, which may have been computed
+    relative to the current time (e.g. `timestamp:-24h`) and must not be cached.
+    """
+    for term in terms:
+        if isinstance(term, ParenExpression):
+            if _is_time_dependent(term.children):
+                return True
+        elif isinstance(term, (SearchFilter, AggregateFilter)):
+            raw_value = term.value.raw_value
+            if isinstance(raw_value, datetime) or (
+                isinstance(raw_value, (list, tuple))
+                and any(isinstance(val, datetime) for val in raw_value)
+            ):
+                return True
+    return False
+
+
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
 ) -> Sequence[SearchFilter]:
+    """
+    Parses a search query into a list of search terms.
+
+    Parse trees are cached by query string. The resulting terms are cached as
+    well, unless a query builder is passed in (which may resolve fields
+    differently per request), the parameters can't be hashed, or the terms
+    contain dates. The returned list is a fresh copy, but the terms in it are
+    shared and must not be mutated.
+    """
     if config is None:
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
@@ -1153,6 +1250,22 @@ def parse_search_query(
             )
         )
 
+    cache_key = None
+    if builder is None:
+        try:
+            cache_key = (query, id(config), _freeze(config_overrides), _freeze(params))
+        except TypeError:
+            pass
+        else:
+            cached = search_terms_cache.get(cache_key, config)
+            if cached is not None:
+                return list(cached)
+
+    base_config = config
     if config_overrides:
         config = SearchConfig.create_from(config, **config_overrides)
-    return SearchVisitor(config, params=params, builder=builder).visit(tree)
+    terms = SearchVisitor(config, params=params, builder=builder).visit(tree)
+
+    if cache_key is not None and not _is_time_dependent(terms):
+        search_terms_cache.set(cache_key, base_config, terms)
+    return terms
@@ -1,7 +1,11 @@
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import (
     Any,
     Callable,
+    Dict,
     List,
     Mapping,
     MutableMapping,
@@ -14,7 +18,9 @@ from typing import (
 
 import sentry_sdk
 from django.contrib.auth.models import AnonymousUser
+from django.db import connections
 
+from sentry import options
 from sentry.utils.json import JSONData
 
 logger = logging.getLogger(__name__)
@@ -23,6 +29,13 @@ K = TypeVar("K")
 
 registry: MutableMapping[Any, Any] = {}
 
+#: Maximum number of attribute fetchers running concurrently per process.
+ATTR_FETCHER_MAX_WORKERS = 8
+
+_attr_fetcher_pool: Optional[ThreadPoolExecutor] = None
+_attr_fetcher_pool_lock = threading.Lock()
+_attr_fetcher_local = threading.local()
+
 
 def register(type: Any) -> Callable[[Type[K]], Type[K]]:
     """A wrapper that adds the wrapped Serializer to the Serializer registry (see above) for the key `type`."""
@@ -87,6 +100,101 @@ def serialize(
             return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
 
 
+@dataclass(frozen=True)
+class AttrFetcher:
+    """
+    A lookup needed by `Serializer.get_attrs`, to be run by `resolve_attr_fetchers`.
+
+    :param func: Called with the results of the fetchers named in `depends_on`
+        as keyword arguments.
+    :param depends_on: Names of the fetchers whose results `func` needs.
+    :param io_bound: Whether the fetcher mostly waits on the network (Snuba,
+        RPC, the database) and may run concurrently with other fetchers.
+    """
+
+    func: Callable[..., Any]
+    depends_on: Sequence[str] = ()
+    io_bound: bool = False
+
+
+def _get_attr_fetcher_pool() -> ThreadPoolExecutor:
+    global _attr_fetcher_pool
+    with _attr_fetcher_pool_lock:
+        if _attr_fetcher_pool is None:
+            _attr_fetcher_pool = ThreadPoolExecutor(
+                max_workers=ATTR_FETCHER_MAX_WORKERS, thread_name_prefix="serializer-attrs"
+            )
+        return _attr_fetcher_pool
+
+
+def _run_attr_fetcher(name: str, fetcher: AttrFetcher, kwargs: Mapping[str, Any]) -> Any:
+    with sentry_sdk.start_span(op="serialize.get_attrs.fetch", description=name):
+        return fetcher.func(**kwargs)
+
+
+def _run_attr_fetcher_in_pool(
+    hub: sentry_sdk.Hub, name: str, fetcher: AttrFetcher, kwargs: Mapping[str, Any]
+) -> Any:
+    _attr_fetcher_local.in_pool = True
+    try:
+        with sentry_sdk.Hub(hub):
+            return _run_attr_fetcher(name, fetcher, kwargs)
+    finally:
+        _attr_fetcher_local.in_pool = False
+        # Pool threads open their own connections, which neither the end of
+        # the request nor CONN_MAX_AGE would close.
+        connections.close_all()
+
+
+def resolve_attr_fetchers(fetchers: Mapping[str, AttrFetcher]) -> Dict[str, Any]:
+    """
+    Run the given fetchers in dependency order and return their results by name.
+
+    With the `api.serializers.concurrent-attr-fetchers` option enabled, the
+    I/O-bound fetchers whose dependencies are met run concurrently on a shared,
+    bounded thread pool, while the others run on the calling thread. Every
+    fetcher is reported as its own span.
+    """
+    results: Dict[str, Any] = {}
+    pending = dict(fetchers)
+    # Other threads would not see changes made within a transaction.
+    concurrent = (
+        options.get("api.serializers.concurrent-attr-fetchers")
+        and not getattr(_attr_fetcher_local, "in_pool", False)
+        and not any(conn.in_atomic_block for conn in connections.all())
+    )
+
+    while pending:
+        ready = [
+            name
+            for name, fetcher in pending.items()
+            if all(dependency in results for dependency in fetcher.depends_on)
+        ]
+        if not ready:
+            raise ValueError(f"Unresolvable attribute fetcher dependencies: {sorted(pending)}")
+
+        # Submit the concurrent fetchers before running the others, so that
+        # they overlap with them.
+        if concurrent:
+            ready.sort(key=lambda name: not pending[name].io_bound)
+
+        futures: Dict[str, Future[Any]] = {}
+        for name in ready:
+            fetcher = pending.pop(name)
+            kwargs = {dependency: results[dependency] for dependency in fetcher.depends_on}
+            if concurrent and fetcher.io_bound:
+                futures[name] = _get_attr_fetcher_pool().submit(
+                    _run_attr_fetcher_in_pool, sentry_sdk.Hub.current, name, fetcher, kwargs
+                )
+            else:
+                results[name] = _run_attr_fetcher(name, fetcher, kwargs)
+
+        for name, future in futures.items():
+            results[name] = future.result()
+
+    return results
+
+
 class Serializer:
     """A Serializer class contains the logic to serialize a specific type of object."""
 
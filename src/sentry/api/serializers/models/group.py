@@ -27,7 +27,13 @@ from django.conf import settings
 from django.db.models import Min, prefetch_related_objects
 
 from sentry import analytics, tagstore
-from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers import (
+    AttrFetcher,
+    Serializer,
+    register,
+    resolve_attr_fetchers,
+    serialize,
+)
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.api.serializers.models.user import UserSerializerResponse
@@ -215,50 +221,11 @@ class GroupSerializerBase(Serializer, ABC):
         # making unnecessary queries.
         prefetch_related_objects(item_list, "project__organization")
 
-        if user.is_authenticated and item_list:
-            bookmarks = set(
-                GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", flat=True
-                )
-            )
-            seen_groups = dict(
-                GroupSeen.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", "last_seen"
-                )
-            )
-            subscriptions = self._get_subscriptions(item_list, user)
-        else:
-            bookmarks = set()
-            seen_groups = {}
-            subscriptions = defaultdict(lambda: (False, False, None))
-
-        resolved_assignees = self._serialize_assignees(item_list)
-
-        ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
-
-        release_resolutions, commit_resolutions = self._resolve_resolutions(item_list, user)
-
-        user_ids = {r[-1] for r in release_resolutions.values()}
-        user_ids.update(r.actor_id for r in ignore_items.values() if r.actor_id is not None)
-        if user_ids:
-            serialized_users = user_service.serialize_many(
-                filter={"user_ids": user_ids, "is_active": True},
-                as_user=user,
-            )
-            actors = {id: u for id, u in zip(user_ids, serialized_users)}
-        else:
-            actors = {}
-
-        share_ids = dict(
-            GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
-        )
-
-        seen_stats = self._get_seen_stats(item_list, user)
-
-        organization_id_list = list({item.project.organization_id for item in item_list})
         # if no groups, then we can't proceed but this seems to be a valid use case
         if not item_list:
             return {}
+
+        organization_id_list = list({item.project.organization_id for item in item_list})
         if len(organization_id_list) > 1:
             # this should never happen but if it does we should know about it
             logger.warning(
@@ -269,18 +236,93 @@ class GroupSerializerBase(Serializer, ABC):
         # should only have 1 org at this point
         organization_id = organization_id_list[0]
 
-        authorized = self._is_authorized(user, organization_id)
+        def get_actors(resolutions, ignore_items):
+            release_resolutions, _ = resolutions
+            user_ids = {r[-1] for r in release_resolutions.values()}
+            user_ids.update(r.actor_id for r in ignore_items.values() if r.actor_id is not None)
+            if not user_ids:
+                return {}
+            serialized_users = user_service.serialize_many(
+                filter={"user_ids": user_ids, "is_active": True},
+                as_user=user,
+            )
+            return {id: u for id, u in zip(user_ids, serialized_users)}
+
+        def get_annotations():
+            annotations_by_group_id: MutableMapping[int, List[Any]] = defaultdict(list)
+            for annotations_by_group in itertools.chain.from_iterable(
+                [
+                    self._resolve_integration_annotations(organization_id, item_list),
+                    [self._resolve_external_issue_annotations(item_list)],
+                ]
+            ):
+                merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
+            return annotations_by_group_id
 
-        annotations_by_group_id: MutableMapping[int, List[Any]] = defaultdict(list)
-        for annotations_by_group in itertools.chain.from_iterable(
-            [
-                self._resolve_integration_annotations(organization_id, item_list),
-                [self._resolve_external_issue_annotations(item_list)],
-            ]
-        ):
-            merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
+        fetchers = {
+            "resolved_assignees": AttrFetcher(
+                lambda: self._serialize_assignees(item_list), io_bound=True
+            ),
+            "ignore_items": AttrFetcher(
+                lambda: {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
+            ),
+            "resolutions": AttrFetcher(
+                lambda: self._resolve_resolutions(item_list, user), io_bound=True
+            ),
+            "actors": AttrFetcher(
+                get_actors, depends_on=("resolutions", "ignore_items"), io_bound=True
+            ),
+            "share_ids": AttrFetcher(
+                lambda: dict(
+                    GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
+                )
+            ),
+            "seen_stats": AttrFetcher(lambda: self._get_seen_stats(item_list, user), io_bound=True),
+            "authorized": AttrFetcher(lambda: self._is_authorized(user, organization_id)),
+            "annotations_by_group_id": AttrFetcher(get_annotations, io_bound=True),
+            "snuba_stats": AttrFetcher(
+                lambda seen_stats: self._get_group_snuba_stats(item_list, seen_stats),
+                depends_on=("seen_stats",),
+                io_bound=True,
+            ),
+        }
+        if user.is_authenticated:
+            fetchers.update(
+                {
+                    "bookmarks": AttrFetcher(
+                        lambda: set(
+                            GroupBookmark.objects.filter(
+                                user_id=user.id, group__in=item_list
+                            ).values_list("group_id", flat=True)
+                        )
+                    ),
+                    "seen_groups": AttrFetcher(
+                        lambda: dict(
+                            GroupSeen.objects.filter(
+                                user_id=user.id, group__in=item_list
+                            ).values_list("group_id", "last_seen")
+                        )
+                    ),
+                    "subscriptions": AttrFetcher(
+                        lambda: self._get_subscriptions(item_list, user), io_bound=True
+                    ),
+                }
+            )
 
-        snuba_stats = self._get_group_snuba_stats(item_list, seen_stats)
+        fetched = resolve_attr_fetchers(fetchers)
+
+        bookmarks = fetched.get("bookmarks", set())
+        seen_groups = fetched.get("seen_groups", {})
+        subscriptions = fetched.get("subscriptions", defaultdict(lambda: (False, False, None)))
+        resolved_assignees = fetched["resolved_assignees"]
+        ignore_items = fetched["ignore_items"]
+        release_resolutions, commit_resolutions = fetched["resolutions"]
+        actors = fetched["actors"]
+        share_ids = fetched["share_ids"]
+        seen_stats = fetched["seen_stats"]
+        authorized = fetched["authorized"]
+        annotations_by_group_id = fetched["annotations_by_group_id"]
+        snuba_stats = fetched["snuba_stats"]
 
         result = {}
         for item in item_list:
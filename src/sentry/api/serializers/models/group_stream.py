@@ -9,6 +9,7 @@ from typing import Any, Callable, Mapping, MutableMapping, Optional, Sequence
 from django.utils import timezone
 
 from sentry import release_health, tsdb
+from sentry.api.serializers import AttrFetcher, resolve_attr_fetchers
 from sentry.api.serializers.models.group import (
     BaseGroupSerializerResponse,
     GroupSerializer,
@@ -207,16 +208,18 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
     def get_attrs(
         self, item_list: Sequence[Group], user: Any, **kwargs: Any
     ) -> MutableMapping[Group, MutableMapping[str, Any]]:
-        if not self._collapse("base"):
-            attrs = super().get_attrs(item_list, user)
-        else:
+        def get_base_attrs():
+            if not self._collapse("base"):
+                return super(StreamGroupSerializerSnuba, self).get_attrs(item_list, user)
             seen_stats = self._get_seen_stats(item_list, user)
             if seen_stats:
-                attrs = {item: seen_stats.get(item, {}) for item in item_list}
-            else:
-                attrs = {item: {} for item in item_list}
+                return {item: seen_stats.get(item, {}) for item in item_list}
+            return {item: {} for item in item_list}
 
-        if self.stats_period and not self._collapse("stats"):
+        fetchers = {"attrs": AttrFetcher(get_base_attrs)}
+
+        with_stats = self.stats_period and not self._collapse("stats")
+        if with_stats:
             partial_get_stats = functools.partial(
                 self.get_stats,
                 item_list=item_list,
@@ -226,60 +229,31 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                 ),
                 environment_ids=self.environment_ids,
             )
-            stats = partial_get_stats()
-            filtered_stats = (
-                partial_get_stats(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
-            )
+            fetchers["stats"] = AttrFetcher(partial_get_stats, io_bound=True)
+            if self.conditions and not self._collapse("filtered"):
+                fetchers["filtered_stats"] = AttrFetcher(
+                    functools.partial(partial_get_stats, conditions=self.conditions), io_bound=True
+                )
+            if self._expand("sessions"):
+                fetchers["session_counts"] = AttrFetcher(
+                    lambda: self._get_session_counts(item_list), io_bound=True
+                )
+
+        fetched = resolve_attr_fetchers(fetchers)
+        attrs = fetched["attrs"]
+
+        if with_stats:
+            stats = fetched["stats"]
+            filtered_stats = fetched.get("filtered_stats")
             for item in item_list:
                 if filtered_stats:
                     attrs[item].update({"filtered_stats": filtered_stats[item.id]})
                 attrs[item].update({"stats": stats[item.id]})
 
             if self._expand("sessions"):
-                uniq_project_ids = list({item.project_id for item in item_list})
-                cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
-                cache_data = cache.get_many(cache_keys.values())
-                missed_items = []
+                session_counts = fetched["session_counts"]
                 for item in item_list:
-                    num_sessions = cache_data.get(cache_keys[item.project_id])
-                    if num_sessions is None:
-                        found = "miss"
-                        missed_items.append(item)
-                    else:
-                        found = "hit"
-                        attrs[item].update(
-                            {
-                                "sessionCount": num_sessions,
-                            }
-                        )
-                    metrics.incr(f"group.get_session_counts.{found}")
-
-                if missed_items:
-                    project_ids = list({item.project_id for item in missed_items})
-                    project_sessions = release_health.get_num_sessions_per_project(
-                        project_ids,
-                        self.start,
-                        self.end,
-                        self.environment_ids,
-                    )
-
-                    results = {}
-                    for project_id, count in project_sessions:
-                        cache_key = self._build_session_cache_key(project_id)
-                        results[project_id] = count
-                        cache.set(cache_key, count, 3600)
-
-                    for item in missed_items:
-                        if item.project_id in results.keys():
-                            attrs[item].update(
-                                {
-                                    "sessionCount": results[item.project_id],
-                                }
-                            )
-                        else:
-                            attrs[item].update({"sessionCount": None})
+                    attrs[item].update({"sessionCount": session_counts.get(item.project_id)})
 
         if self._expand("inbox"):
             inbox_stats = get_inbox_details(item_list)
@@ -446,6 +420,38 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             )
         return time_range_result
 
+    def _get_session_counts(self, item_list: Sequence[Group]) -> Mapping[int, Optional[int]]:
+        """Returns the number of sessions by project id, going through the cache."""
+        uniq_project_ids = list({item.project_id for item in item_list})
+        cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
+        cache_data = cache.get_many(cache_keys.values())
+        session_counts = {}
+        missed_project_ids = set()
+        for item in item_list:
+            num_sessions = cache_data.get(cache_keys[item.project_id])
+            if num_sessions is None:
+                found = "miss"
+                missed_project_ids.add(item.project_id)
+            else:
+                found = "hit"
+                session_counts[item.project_id] = num_sessions
+            metrics.incr(f"group.get_session_counts.{found}")
+
+        if missed_project_ids:
+            project_sessions = release_health.get_num_sessions_per_project(
+                list(missed_project_ids),
+                self.start,
+                self.end,
+                self.environment_ids,
+            )
+
+            for project_id, count in project_sessions:
+                cache_key = self._build_session_cache_key(project_id)
+                session_counts[project_id] = count
+                cache.set(cache_key, count, 3600)
+
+        return session_counts
+
     def _build_session_cache_key(self, project_id):
         start_key = end_key = env_key = ""
         if self.start:
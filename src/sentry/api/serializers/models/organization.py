@@ -238,9 +238,27 @@ class OrganizationSerializer(Serializer):
                 "avatar": avatars.get(item.id),
                 "auth_provider": auth_providers.get(item.id, None),
                 "has_api_key": configs_by_org_id[item.id].has_api_key,
+                "features": self._get_features(item, user),
             }
         return data
 
+    def _get_features(self, organization: Organization, user: User) -> List[str]:
+        from sentry.features.base import OrganizationFeature
+
+        # Retrieve all registered organization features
+        org_features = [
+            feature
+            for feature in features.all(feature_type=OrganizationFeature).keys()
+            if feature.startswith(_ORGANIZATION_SCOPE_PREFIX)
+        ]
+        results = features.prefetch(org_features, organization, actor=user)
+        return [
+            # Remove the organization scope prefix
+            feature_name[len(_ORGANIZATION_SCOPE_PREFIX) :]
+            for feature_name, active in results[organization].items()
+            if active
+        ]
+
     def _serialize_auth_providers(
         self,
         configs_by_org_id: Mapping[int, RpcOrganizationAuthConfig],
@@ -264,7 +282,6 @@ class OrganizationSerializer(Serializer):
         self, obj: Organization, attrs: Mapping[str, Any], user: User
     ) -> OrganizationSerializerResponse:
         from sentry import features
-        from sentry.features.base import OrganizationFeature
 
         if attrs.get("avatar"):
             avatar = {
@@ -276,32 +293,7 @@ class OrganizationSerializer(Serializer):
 
         status = OrganizationStatus(obj.status)
 
-        # Retrieve all registered organization features
-        org_features = [
-            feature
-            for feature in features.all(feature_type=OrganizationFeature).keys()
-            if feature.startswith(_ORGANIZATION_SCOPE_PREFIX)
-        ]
-        feature_list = set()
-
-        # Check features in batch using the entity handler
-        batch_features = features.batch_has(org_features, actor=user, organization=obj)
-
-        # batch_has has found some features
-        if batch_features:
-            for feature_name, active in batch_features.get(f"organization:{obj.id}", {}).items():
-                if active:
-                    # Remove organization prefix
-                    feature_list.add(feature_name[len(_ORGANIZATION_SCOPE_PREFIX) :])
-
-                # This feature_name was found via `batch_has`, don't check again using `has`
-                org_features.remove(feature_name)
-
-        # Remaining features should not be checked via the entity handler
-        for feature_name in org_features:
-            if features.has(feature_name, obj, actor=user, skip_entity=True):
-                # Remove the organization scope prefix
-                feature_list.add(feature_name[len(_ORGANIZATION_SCOPE_PREFIX) :])
+        feature_list = set(attrs["features"])
 
         # Do not include the onboarding feature if OrganizationOptions exist
         if (
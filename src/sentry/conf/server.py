@@ -1022,6 +1022,12 @@ CELERYBEAT_SCHEDULE_REGION = {
         "schedule": crontab(minute=0),
         "options": {"expires": 3600, "queue": "releasemonitor"},
     },
+    "snapshot-release-adoption": {
+        "task": "sentry.release_health.tasks.snapshot_release_adoption",
+        # Run every 5 minutes
+        "schedule": crontab(minute="*/5"),
+        "options": {"expires": 300, "queue": "releasemonitor"},
+    },
     "fetch-release-registry-data": {
         "task": "sentry.tasks.release_registry.fetch_release_registry_data",
         # Run every 5 minutes
@@ -2296,6 +2302,13 @@ SENTRY_TEAM_ROLES = (
 SENTRY_OPTIONS: dict[str, Any] = {}
 SENTRY_DEFAULT_OPTIONS: dict[str, Any] = {}
 
+# Redis cluster used to broadcast option changes, so that every process evicts
+# them from its local options cache right away. Disabled if ``None``.
+SENTRY_OPTIONS_INVALIDATION_REDIS_CLUSTER: str | None = None
+# How long options are kept in the local cache while a process is subscribed
+# to option changes.
+SENTRY_OPTIONS_INVALIDATION_TTL = 300
+
 # You should not change this setting after your database has been created
 # unless you have altered all schemas first
 SENTRY_USE_BIG_INTS = False
@@ -3233,6 +3246,9 @@ SENTRY_REPROCESSING_ATTACHMENT_CHUNK_SIZE = 2**20
 # for synchronization/progress report.
 SENTRY_REPROCESSING_SYNC_REDIS_CLUSTER = "default"
 
+# Which cluster is used to store snapshots of release adoption.
+SENTRY_RELEASE_ADOPTION_SNAPSHOTS_REDIS_CLUSTER = "default"
+
 # How long tombstones from reprocessing will live.
 SENTRY_REPROCESSING_TOMBSTONES_TTL = 24 * 3600
 
@@ -84,6 +84,11 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-replay-recordings": {
         "topic": settings.KAFKA_INGEST_REPLAYS_RECORDINGS,
         "strategy_factory": "sentry.replays.consumers.recording.ProcessReplayRecordingStrategyFactory",
+        "click_options": [
+            click.Option(["--threads", "num_threads"], type=int, default=4),
+            click.Option(["--max-pending-futures"], type=int, default=50),
+            *multiprocessing_options(default_max_batch_size=10),
+        ],
     },
     "ingest-monitors": {
         "topic": settings.KAFKA_INGEST_MONITORS,
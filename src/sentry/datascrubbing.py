@@ -1,11 +1,18 @@
 import copy
+import threading
+from typing import Any, List, Mapping, NamedTuple, Tuple
 
 import sentry_relay
+from cachetools import LRUCache
 from rest_framework import serializers
 
 from sentry.utils import json, metrics
+from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
 
+#: Number of distinct scrubbing configurations kept per process
+PII_CONFIGS_CACHE_SIZE = 1000
+
 
 def _escape_key(key):
     """
@@ -18,6 +25,13 @@ def _escape_key(key):
 
 
 def get_pii_config(project):
+    return _get_pii_config_from_options(
+        project.organization.get_option("sentry:relay_pii_config"),
+        project.get_option("sentry:relay_pii_config"),
+    )
+
+
+def _get_pii_config_from_options(organization_pii_config, project_pii_config):
     def _decode(value):
         if value:
             return safe_execute(json.loads, value, _with_transaction=False)
@@ -36,8 +50,8 @@ def get_pii_config(project):
     # here.
     return _merge_pii_configs(
         [
-            ("organization:", _decode(project.organization.get_option("sentry:relay_pii_config"))),
-            ("project:", _decode(project.get_option("sentry:relay_pii_config"))),
+            ("organization:", _decode(organization_pii_config)),
+            ("project:", _decode(project_pii_config)),
         ]
     )
 
@@ -82,20 +96,81 @@ def get_all_pii_configs(project):
     yield sentry_relay.convert_datascrubbing_config(get_datascrubbing_settings(project))
 
 
-def scrub_data(project, event):
-    for config in get_all_pii_configs(project):
-        metrics.timing(
-            "datascrubbing.config.num_applications", len(config.get("applications") or ())
+class PiiConfig(NamedTuple):
+    """A PII config ready to be applied, along with the sizes reported for it."""
+
+    config: Mapping[str, Any]
+    num_applications: int
+    selector_sizes: Tuple[int, ...]
+    rules_per_selector: Tuple[int, ...]
+    total_rules: int
+
+    @classmethod
+    def from_config(cls, config):
+        applications = config.get("applications") or {}
+        rules_per_selector = tuple(len(rules) for rules in applications.values())
+        return cls(
+            config=config,
+            num_applications=len(applications),
+            selector_sizes=tuple(len(selector) for selector in applications),
+            rules_per_selector=rules_per_selector,
+            total_rules=sum(rules_per_selector),
         )
-        total_rules = 0
-        for selector, rules in (config.get("applications") or {}).items():
-            metrics.timing("datascrubbing.config.selectors.size", len(selector))
-            metrics.timing("datascrubbing.config.rules_per_selector.size", len(rules))
-            total_rules += len(rules)
 
-        metrics.timing("datascrubbing.config.rules.size", total_rules)
 
-        event = sentry_relay.pii_strip_event(config, event)
+_pii_configs_cache: "LRUCache[str, Tuple[PiiConfig, ...]]" = LRUCache(
+    maxsize=PII_CONFIGS_CACHE_SIZE
+)
+_pii_configs_cache_lock = threading.Lock()
+
+
+def get_cached_pii_configs(project) -> Tuple[Tuple[PiiConfig, ...], bool]:
+    """
+    Returns the PII configs of `get_all_pii_configs` and whether they were cached.
+
+    Configs are cached per process by a hash of the options they are built
+    from, so changing any of the options invalidates them, and projects with
+    the same options share their configs. The configs must not be mutated.
+    """
+    organization_pii_config = project.organization.get_option("sentry:relay_pii_config")
+    project_pii_config = project.get_option("sentry:relay_pii_config")
+    datascrubbing_settings = get_datascrubbing_settings(project)
+    key = hash_values([organization_pii_config, project_pii_config, datascrubbing_settings])
+
+    with _pii_configs_cache_lock:
+        configs = _pii_configs_cache.get(key)
+    if configs is not None:
+        return configs, True
+
+    all_configs: List[Mapping[str, Any]] = []
+    pii_config = _get_pii_config_from_options(organization_pii_config, project_pii_config)
+    if pii_config:
+        all_configs.append(pii_config)
+    all_configs.append(sentry_relay.convert_datascrubbing_config(datascrubbing_settings))
+
+    configs = tuple(PiiConfig.from_config(config) for config in all_configs)
+    with _pii_configs_cache_lock:
+        _pii_configs_cache[key] = configs
+    return configs, False
+
+
+def scrub_data(project, event):
+    # Covers building the configs, to compare scrubbing with cold and warm configs
+    with metrics.timer("datascrubbing.scrub_data") as metric_tags:
+        configs, cached = get_cached_pii_configs(project)
+        metric_tags["config_cache"] = "hit" if cached else "miss"
+
+        for pii_config in configs:
+            metrics.timing("datascrubbing.config.num_applications", pii_config.num_applications)
+            for selector_size, num_rules in zip(
+                pii_config.selector_sizes, pii_config.rules_per_selector
+            ):
+                metrics.timing("datascrubbing.config.selectors.size", selector_size)
+                metrics.timing("datascrubbing.config.rules_per_selector.size", num_rules)
+
+            metrics.timing("datascrubbing.config.rules.size", pii_config.total_rules)
+
+            event = sentry_relay.pii_strip_event(pii_config.config, event)
 
     return event
 
@@ -57,6 +57,30 @@ deletion task needs to implement the `should_proceed` hook.
 The above would only proceed with the deletion if the record's status was correct.  When a deletion
 is cancelled by this hook, the `ScheduledDeletion` row will be removed.
 
+Set-based Deletions
+-------------------
+
+With the ``deletions.set-based-engine`` option enabled, ``ModelDeletionTask``:
+
+- paginates over the rows it deletes on their primary keys,
+- deletes rows with a single ``DELETE`` when neither the task nor the model customize deletion,
+  no signal handlers are connected to the model and no relation cascades to other models. The
+  ``post_delete`` hook every ``BaseManager`` connects is ignored unless the manager overrides it,
+  but managers with ``cache_fields`` invalidate their cache on deletion, so their models are
+  always deleted one at a time,
+- unless the deletion runs within a transaction, deletes the child relations whose model neither
+  refers to nor is referred to by the model of another relation concurrently. Meanwhile, the
+  other relations, e.g. the event data of groups, are deleted in order.
+
+Dry Runs
+--------
+
+``estimate()`` walks the same relations as a deletion and returns the number of rows it would
+delete per model, without deleting anything.
+
+>>> deletions.get(model=Project, query={"id": project.id}).estimate()
+Counter({'sentry.Project': 1, 'sentry.Group': 1200, ...})
+
 Using Deletions Manager Directly
 --------------------------------
 
@@ -1,12 +1,94 @@
+import inspect
 import logging
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+from django.db import connections, router
+from django.db.models import Model
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_delete, pre_delete
+
+from sentry import options
 from sentry.constants import ObjectStatus
+from sentry.db.models.manager.base import BaseManager
 from sentry.utils import metrics
 from sentry.utils.query import bulk_delete_objects
 
 _leaf_re = re.compile(r"^(UserReport|Event|Group)(.+)")
 
+#: Maximum number of child relations deleted concurrently by a task.
+CHILD_RELATIONS_CONCURRENCY = 4
+
+
+def _refers_to(model, other):
+    return any(field.related_model is other for field in model._meta.concrete_fields)
+
+
+def _split_independent(relations):
+    """
+    Splits relations into those which can be deleted in any order, i.e. the
+    only relation of their model, which neither refers to nor is referred to
+    by the model of another relation, and the others, which aren't relations
+    of models or depend on each other.
+    """
+    models = Counter(relation.params.get("model") for relation in relations)
+    independent = []
+    dependent = []
+    for relation in relations:
+        model = relation.params.get("model")
+        if (
+            model is None
+            or models[model] > 1
+            or any(
+                other is not None
+                and other is not model
+                and (_refers_to(model, other) or _refers_to(other, model))
+                for other in models
+            )
+        ):
+            dependent.append(relation)
+        else:
+            independent.append(relation)
+    return independent, dependent
+
+
+def _is_noop_receiver(receiver):
+    # Every `BaseManager` connects its `post_delete` hook, which does nothing
+    # unless the manager overrides it. Silo limited managers wrap it.
+    return inspect.unwrap(getattr(receiver, "__func__", receiver)) is BaseManager.post_delete
+
+
+class SetBasedCollector(Collector):
+    """
+    A collector which, unlike Django's, can fast delete models whose only
+    `post_delete` receivers are the no-op hooks of their managers.
+    """
+
+    def _has_signal_listeners(self, model):
+        return pre_delete.has_listeners(model) or not all(
+            _is_noop_receiver(receiver) for receiver in post_delete._live_receivers(model)
+        )
+
+
+def _drain(task):
+    # If we want smaller tasks then this also has to return when has_more is true.
+    # This could significant increase the number of tasks we spawn. Get better estimates
+    # by collecting metrics.
+    has_more = True
+    while has_more:
+        has_more = task.chunk()
+        if has_more:
+            metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
+
+
+def _drain_in_worker(task):
+    try:
+        _drain(task)
+    finally:
+        # Worker threads open their own connections.
+        connections.close_all()
+
 
 class BaseRelation:
     def __init__(self, params, task):
@@ -125,26 +207,62 @@ class BaseDeletionTask:
         for instance in instance_list:
             self.delete_instance(instance)
 
+    def get_child_task(self, relation):
+        return self.manager.get(
+            transaction_id=self.transaction_id,
+            actor_id=self.actor_id,
+            task=relation.task,
+            **relation.params,
+        )
+
     def delete_children(self, relations):
         # Ideally this runs through the deletion manager
-        for relation in relations:
-            task = self.manager.get(
-                transaction_id=self.transaction_id,
-                actor_id=self.actor_id,
-                task=relation.task,
-                **relation.params,
-            )
-
-            # If we want smaller tasks then this also has to return when has_more is true.
-            # This could significant increase the number of tasks we spawn. Get better estimates
-            # by collecting metrics.
-            has_more = True
-            while has_more:
-                has_more = task.chunk()
-                if has_more:
-                    metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
+        independent, dependent = _split_independent(relations)
+        if not self.can_delete_children_concurrently(independent):
+            for relation in relations:
+                _drain(self.get_child_task(relation))
+            return False
+
+        with ThreadPoolExecutor(
+            max_workers=CHILD_RELATIONS_CONCURRENCY, thread_name_prefix="deletions"
+        ) as pool:
+            futures = [
+                pool.submit(_drain_in_worker, self.get_child_task(relation))
+                for relation in independent
+            ]
+            # Meanwhile, the other relations are deleted in order.
+            for relation in dependent:
+                _drain(self.get_child_task(relation))
+            for future in futures:
+                future.result()
         return False
 
+    def can_delete_children_concurrently(self, relations):
+        """
+        Returns whether the given independent relations can be deleted in
+        worker threads.
+        """
+        if len(relations) < 2 or not options.get("deletions.set-based-engine"):
+            return False
+        # Other threads would neither see nor be able to wait on changes made
+        # within a transaction.
+        return not any(
+            connections[router.db_for_write(relation.params["model"])].in_atomic_block
+            for relation in relations
+        )
+
+    def estimate(self, counts=None):
+        """
+        Returns the estimated number of rows deleted per model, without
+        deleting anything. Data deleted outside of Postgres (e.g. event data)
+        is not counted.
+        """
+        return Counter() if counts is None else counts
+
+    def estimate_children(self, relations, counts):
+        for relation in relations:
+            self.get_child_task(relation).estimate(counts)
+
     def mark_deletion_in_progress(self, instance_list):
         pass
 
@@ -159,6 +277,8 @@ class ModelDeletionTask(BaseDeletionTask):
         self.query = query
         self.query_limit = query_limit or self.DEFAULT_QUERY_LIMIT or self.chunk_size
         self.order_by = order_by
+        # Primary key up to which all matching rows were deleted
+        self.last_id = None
 
     def __repr__(self):
         return "<{}: model={} query={} order_by={} transaction_id={} actor_id={}>".format(
@@ -182,6 +302,23 @@ class ModelDeletionTask(BaseDeletionTask):
             rel(obj_list) for rel in default_manager.bulk_dependencies[self.model]
         ]
 
+    def get_queryset(self, num_shards=None, shard_id=None):
+        queryset = getattr(self.model, self.manager_name).filter(**self.query)
+        if self.order_by:
+            queryset = queryset.order_by(self.order_by)
+        elif options.get("deletions.set-based-engine"):
+            # Paginate on primary keys rather than scanning past the rows
+            # deleted by previous chunks again.
+            queryset = queryset.order_by("id")
+            if self.last_id is not None:
+                queryset = queryset.filter(id__gt=self.last_id)
+
+        if num_shards:
+            assert num_shards > 1
+            assert shard_id < num_shards
+            queryset = queryset.extra(where=[f"id %% {num_shards} = {shard_id}"])
+        return queryset
+
     def chunk(self, num_shards=None, shard_id=None):
         """
         Deletes a chunk of this instance's data. Return ``True`` if there is
@@ -191,26 +328,79 @@ class ModelDeletionTask(BaseDeletionTask):
         remaining = self.chunk_size
 
         while remaining > 0:
-            queryset = getattr(self.model, self.manager_name).filter(**self.query)
-            if self.order_by:
-                queryset = queryset.order_by(self.order_by)
-
-            if num_shards:
-                assert num_shards > 1
-                assert shard_id < num_shards
-                queryset = queryset.extra(where=[f"id %% {num_shards} = {shard_id}"])
+            queryset = self.get_queryset(num_shards, shard_id)
 
             queryset = list(queryset[:query_limit])
             # If there are no more rows we are all done.
             if not queryset:
                 return False
 
-            self.delete_bulk(queryset)
+            if not self.delete_bulk(queryset):
+                # All rows up to here were deleted.
+                self.last_id = queryset[-1].id
             remaining = remaining - query_limit
         # We have more work to do as we didn't run out of rows to delete.
         return True
 
+    def estimate(self, counts=None):
+        if counts is None:
+            counts = Counter()
+
+        label = self.model._meta.label
+        counts[label] += 0
+        queryset = getattr(self.model, self.manager_name).filter(**self.query).order_by("id")
+        last_id = None
+        while True:
+            page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            instance_list = list(page[: self.query_limit])
+            if not instance_list:
+                return counts
+            last_id = instance_list[-1].id
+            counts[label] += len(instance_list)
+
+            child_relations = self.get_child_relations_bulk(instance_list)
+            child_relations = self.extend_relations_bulk(child_relations, instance_list)
+            self.estimate_children(self.filter_relations(child_relations), counts)
+            for instance in instance_list:
+                child_relations = self.get_child_relations(instance)
+                child_relations = self.extend_relations(child_relations, instance)
+                self.estimate_children(self.filter_relations(child_relations), counts)
+
+    def can_delete_set_based(self, queryset):
+        """
+        Returns whether rows can be deleted with a single ``DELETE`` rather
+        than one instance at a time, i.e. if nothing needs to happen when an
+        instance is deleted: neither this task nor the model customize
+        deletion, no signal handlers but the no-op hooks of managers are
+        connected and no relation cascades. Models whose managers cache
+        instances or override `post_delete` are deleted one at a time.
+        """
+        if not options.get("deletions.set-based-engine"):
+            return False
+        if type(self).delete_instance is not ModelDeletionTask.delete_instance:
+            return False
+        if self.model.delete is not Model.delete:
+            return False
+        return SetBasedCollector(using=queryset.db).can_fast_delete(queryset)
+
     def delete_instance_bulk(self, instance_list):
+        queryset = self.model._base_manager.filter(id__in=[i.id for i in instance_list])
+        if self.can_delete_set_based(queryset):
+            queryset._raw_delete(queryset.db)
+            model_name = self.model.__name__
+            if not _leaf_re.search(model_name):
+                for instance in instance_list:
+                    self.logger.info(
+                        "object.delete.executed",
+                        extra={
+                            "object_id": instance.id,
+                            "transaction_id": self.transaction_id,
+                            "app_label": self.model._meta.app_label,
+                            "model": model_name,
+                        },
+                    )
+            return
+
         # slow, but ensures Django cascades are handled
         for instance in instance_list:
             self.delete_instance(instance)
@@ -268,6 +458,14 @@ class BulkModelDeletionTask(ModelDeletionTask):
     def chunk(self):
         return self.delete_instance_bulk()
 
+    def estimate(self, counts=None):
+        if counts is None:
+            counts = Counter()
+        counts[self.model._meta.label] += (
+            getattr(self.model, self.manager_name).filter(**self.query).count()
+        )
+        return counts
+
     def delete_instance_bulk(self):
         try:
             return bulk_delete_objects(
@@ -116,16 +116,9 @@ class GroupDeletionTask(ModelDeletionTask):
     # balance the number of snuba replacements with memory limits.
     DEFAULT_CHUNK_SIZE = 1000
 
-    def delete_bulk(self, instance_list):
-        """
-        Group deletion operates as a quasi-bulk operation so that we don't flood
-        snuba replacements with deletions per group.
-        """
-        self.mark_deletion_in_progress(instance_list)
-
+    def get_child_relations_bulk(self, instance_list):
         group_ids = [group.id for group in instance_list]
 
-        # Remove child relations for all groups first.
         child_relations = []
         for model in _GROUP_RELATED_MODELS:
             child_relations.append(ModelRelation(model, {"group_id__in": group_ids}))
@@ -135,8 +128,17 @@ class GroupDeletionTask(ModelDeletionTask):
             child_relations.append(
                 BaseRelation(params={"groups": instance_list}, task=EventDataDeletionTask)
             )
+        return child_relations
 
-        self.delete_children(child_relations)
+    def delete_bulk(self, instance_list):
+        """
+        Group deletion operates as a quasi-bulk operation so that we don't flood
+        snuba replacements with deletions per group.
+        """
+        self.mark_deletion_in_progress(instance_list)
+
+        # Remove child relations for all groups first.
+        self.delete_children(self.get_child_relations_bulk(instance_list))
 
         # Remove group objects with children removed.
         return self.delete_instance_bulk(instance_list)
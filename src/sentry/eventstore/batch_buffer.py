@@ -0,0 +1,161 @@
+"""
+Buffers event ids in Redis so that they can be processed in batches, e.g.
+when reprocessing or unmerging issues with many events: Snuba prefers few big
+replacements over many small ones.
+
+Event ids are kept in sorted sets scored by the timestamps of their events.
+Snuba needs the time range of a batch to bound the partitions it touches, and
+since ``ZPOPMIN`` returns members in score order, the range is read off the
+ends of a popped chunk instead of being computed from every event. Buffers
+are drained in chunks of bounded size, so that no single command blocks Redis
+for long.
+
+Buffers written before event ids were kept in sorted sets are lists of
+``timestamp;event_id`` strings. They are still written to and read until
+they expire.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import redis
+
+from sentry.utils.dates import to_datetime, to_timestamp
+
+#: Number of event ids popped from a buffer at a time
+POP_CHUNK_SIZE = 1000
+
+# event ids, earliest and latest datetime
+Batch = Tuple[List[str], Optional[datetime], Optional[datetime]]
+
+
+def _is_wrong_type(error: Exception) -> bool:
+    return isinstance(error, redis.exceptions.ResponseError) and str(error).startswith("WRONGTYPE")
+
+
+class EventIdBatchBuffer:
+    """A buffer of event ids and their timestamps per Redis key."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def push(self, key: str, events: Iterable[Tuple[datetime, str]], ttl: int) -> int:
+        """
+        Adds `(datetime, event_id)` pairs to a buffer with a single round trip
+        and returns the size of the buffer.
+        """
+        scores = {event_id: to_timestamp(datetime) for datetime, event_id in events}
+        if not scores:
+            return self.size(key)
+
+        try:
+            with self.client.pipeline(transaction=False) as pipeline:
+                pipeline.zadd(key, scores)
+                pipeline.expire(key, ttl)
+                pipeline.zcard(key)
+                return pipeline.execute()[-1]
+        except redis.exceptions.ResponseError as e:
+            if not _is_wrong_type(e):
+                raise
+
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.lpush(key, *(f"{score};{event_id}" for event_id, score in scores.items()))
+            pipeline.expire(key, ttl)
+            return pipeline.execute()[0]
+
+    def size(self, key: str) -> int:
+        return self.sizes([key])[0]
+
+    def sizes(self, keys: Sequence[str]) -> List[int]:
+        """Returns the sizes of several buffers with a single round trip."""
+        if not keys:
+            return []
+
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.zcard(key)
+            results = pipeline.execute(raise_on_error=False)
+
+        sizes = []
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                if not _is_wrong_type(result):
+                    raise result
+                result = self.client.llen(key)
+            sizes.append(result)
+        return sizes
+
+    def seal(self, key: str) -> Optional[str]:
+        """
+        Moves the contents of a buffer to a new key, which can be handed to a
+        task while events are pushed to the buffer again. Returns `None` if
+        the buffer is empty.
+        """
+        new_key = f"{key}:{uuid.uuid4().hex}"
+        try:
+            # `renamenx` is used instead of `rename` only to detect UUID collisions.
+            assert self.client.renamenx(key, new_key), "UUID collision for new_key?"
+        except redis.exceptions.ResponseError:
+            # `key` does not exist in Redis. `ResponseError` is a bit too broad
+            # but it seems we'd have to do string matching on error message
+            # otherwise.
+            return None
+        return new_key
+
+    def pop(self, key: str, count: int = POP_CHUNK_SIZE) -> Batch:
+        """
+        Removes up to `count` of the earliest events from a buffer, and
+        returns their ids and time range.
+        """
+        try:
+            members = self.client.zpopmin(key, count)
+        except redis.exceptions.ResponseError as e:
+            if not _is_wrong_type(e):
+                raise
+            return self._pop_list(key)
+
+        if not members:
+            return [], None, None
+        return (
+            [event_id for event_id, _ in members],
+            to_datetime(members[0][1]),
+            to_datetime(members[-1][1]),
+        )
+
+    def pop_all(self, key: str) -> Batch:
+        """Drains a buffer in chunks, and returns its event ids and time range."""
+        event_ids: List[str] = []
+        min_datetime = max_datetime = None
+        while True:
+            chunk, chunk_min, chunk_max = self.pop(key)
+            if not chunk:
+                break
+            event_ids.extend(chunk)
+            if min_datetime is None or chunk_min < min_datetime:
+                min_datetime = chunk_min
+            if max_datetime is None or chunk_max > max_datetime:
+                max_datetime = chunk_max
+            if len(chunk) < POP_CHUNK_SIZE:
+                break
+        return event_ids, min_datetime, max_datetime
+
+    def _pop_list(self, key: str) -> Batch:
+        event_ids = []
+        min_datetime = None
+        max_datetime = None
+
+        for row in self.client.lrange(key, 0, -1):
+            datetime_raw, event_id = row.split(";")
+            datetime = to_datetime(float(datetime_raw))
+
+            if min_datetime is None or datetime < min_datetime:
+                min_datetime = datetime
+            if max_datetime is None or datetime > max_datetime:
+                max_datetime = datetime
+
+            event_ids.append(event_id)
+
+        self.client.delete(key)
+        return event_ids, min_datetime, max_datetime
@@ -1,3 +1,6 @@
+from celery.signals import task_postrun, task_prerun
+from django.core.signals import request_finished, request_started
+
 from .base import (  # NOQA
     Feature,
     FeatureHandlerStrategy,
@@ -302,3 +305,11 @@ all = default_manager.all
 add_handler = default_manager.add_handler
 add_entity_handler = default_manager.add_entity_handler
 has_for_batch = default_manager.has_for_batch
+memoize = default_manager.memoize
+prefetch = default_manager.prefetch
+
+# Feature checks are memoized while a request or task is handled
+request_started.connect(default_manager.memo.start_request)
+request_finished.connect(default_manager.memo.reset)
+task_prerun.connect(default_manager.memo.start)
+task_postrun.connect(default_manager.memo.finish)
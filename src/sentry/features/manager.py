@@ -5,10 +5,14 @@ import logging
 __all__ = ["FeatureManager"]
 
 import abc
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
     Any,
+    Generator,
+    Hashable,
     Iterable,
     List,
     Mapping,
@@ -16,12 +20,15 @@ from typing import (
     MutableSet,
     Optional,
     Sequence,
+    Tuple,
     Type,
 )
 
 import sentry_sdk
 from django.conf import settings
 
+from sentry import options
+
 from .base import Feature, FeatureHandlerStrategy
 from .exceptions import FeatureNotRegistered
 
@@ -29,6 +36,85 @@ if TYPE_CHECKING:
     from sentry.features.handler import FeatureHandler
     from sentry.models import Organization, Project, User
 
+#: Maximum number of feature checks memoized per request or task
+MEMO_MAX_SIZE = 10000
+
+
+def _memo_entity_key(obj: Any) -> Optional[Tuple[str, Any]]:
+    id = getattr(obj, "id", None)
+    if id is None:
+        return None
+    return type(obj).__name__, id
+
+
+class FeatureCheckMemo(threading.local):
+    """
+    Results of feature checks, memoized while a request or task is handled.
+
+    Checks are keyed on the feature, the entities it is checked for and the
+    actor, which are all assumed not to change while the memo is active.
+    Checks of unsaved entities or with additional arguments are not memoized,
+    and nothing is memoized while the ``features.check-memo.enabled`` option
+    is off.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.results: MutableMapping[Hashable, bool] = {}
+
+    def start(self, **kwargs: Any) -> None:
+        self.depth += 1
+
+    def start_request(self, **kwargs: Any) -> None:
+        # Requests are never nested, so start over in case the previous one
+        # didn't finish cleanly.
+        self.depth = 1
+        self.results = {}
+
+    def finish(self, **kwargs: Any) -> None:
+        self.depth = max(self.depth - 1, 0)
+        if not self.depth:
+            self.results = {}
+
+    def reset(self, **kwargs: Any) -> None:
+        self.depth = 0
+        self.results = {}
+
+    def key(
+        self,
+        name: str,
+        args: Sequence[Any],
+        kwargs: Mapping[str, Any],
+        actor: Optional[User],
+        skip_entity: Optional[bool],
+    ) -> Optional[Hashable]:
+        if not self.depth or kwargs or not options.get("features.check-memo.enabled"):
+            return None
+
+        entities = []
+        for arg in args:
+            entity = _memo_entity_key(arg)
+            if entity is None:
+                return None
+            entities.append(entity)
+
+        actor_key = None
+        if actor is not None:
+            actor_key = _memo_entity_key(actor)
+            if actor_key is None:
+                return None
+
+        return name, tuple(entities), actor_key, bool(skip_entity)
+
+    def get(self, key: Optional[Hashable]) -> Optional[bool]:
+        if key is None:
+            return None
+        return self.results.get(key)
+
+    def set(self, key: Optional[Hashable], value: bool) -> None:
+        if key is not None and len(self.results) < MEMO_MAX_SIZE:
+            self.results[key] = value
+
 
 class RegisteredFeatureManager:
     """
@@ -136,6 +222,7 @@ class FeatureManager(RegisteredFeatureManager):
         self._feature_registry: MutableMapping[str, Type[Feature]] = {}
         self.entity_features: MutableSet[str] = set()
         self._entity_handler: Optional[FeatureHandler] = None
+        self.memo = FeatureCheckMemo()
 
     def all(self, feature_type: Type[Feature] = Feature) -> Mapping[str, Type[Feature]]:
         """
@@ -219,30 +306,130 @@ class FeatureManager(RegisteredFeatureManager):
 
         >>> FeatureManager.has('organizations:feature', organization, actor=request.user)
 
+        While a request or task is handled, results are memoized (see
+        ``memoize``).
         """
+        actor = kwargs.pop("actor", None)
+        memo_key = self.memo.key(name, args, kwargs, actor, skip_entity)
+        rv = self.memo.get(memo_key)
+        if rv is not None:
+            return rv
+
         try:
-            actor = kwargs.pop("actor", None)
-            feature = self.get(name, *args, **kwargs)
+            rv = self._has(name, actor, skip_entity, *args, **kwargs)
+        except Exception:
+            logging.exception("Failed to run feature check")
+            return False
 
-            # Check registered feature handlers
-            rv = self._get_handler(feature, actor)
-            if rv is not None:
-                return rv
+        self.memo.set(memo_key, rv)
+        return rv
+
+    def _has(
+        self,
+        name: str,
+        actor: Optional[User],
+        skip_entity: Optional[bool],
+        *args: Any,
+        **kwargs: Any,
+    ) -> bool:
+        feature = self.get(name, *args, **kwargs)
 
-            if self._entity_handler and not skip_entity:
-                rv = self._entity_handler.has(feature, actor)
-                if rv is not None:
-                    return rv
+        # Check registered feature handlers
+        rv = self._get_handler(feature, actor)
+        if rv is not None:
+            return rv
 
-            rv = settings.SENTRY_FEATURES.get(feature.name, False)
+        if self._entity_handler and not skip_entity:
+            rv = self._entity_handler.has(feature, actor)
             if rv is not None:
                 return rv
 
-            # Features are by default disabled if no plugin or default enables them
-            return False
-        except Exception:
-            logging.exception("Failed to run feature check")
-            return False
+        rv = settings.SENTRY_FEATURES.get(feature.name, False)
+        if rv is not None:
+            return rv
+
+        # Features are by default disabled if no plugin or default enables them
+        return False
+
+    @contextmanager
+    def memoize(self) -> Generator[None, None, None]:
+        """
+        Memoize the results of ``has`` within the block, in the current thread.
+
+        This is done for every request and task. Blocks can be nested, and
+        results are forgotten when the outermost one exits.
+        """
+        self.memo.start()
+        try:
+            yield
+        finally:
+            self.memo.finish()
+
+    def prefetch(
+        self,
+        feature_names: Sequence[str],
+        organization: Organization,
+        projects: Optional[Sequence[Project]] = None,
+        actor: Optional[User] = None,
+    ) -> Mapping[Any, Mapping[str, bool]]:
+        """
+        Determine in batches if features are enabled for an organization, or
+        for projects of it.
+
+        Features are first checked with the entity handler's ``batch_has``.
+        Project features it doesn't handle are then checked with
+        ``has_for_batch``, and organization features with ``has``.
+
+        The results are memoized like those of ``has``, so that features can
+        be prefetched before they are checked for each object individually.
+        The return value maps the organization, or each project, to the
+        result of each feature.
+
+        >>> FeatureManager.prefetch(['projects:feature'], organization, projects, actor=user)
+        """
+        objects: Sequence[Any] = projects if projects is not None else [organization]
+        results: MutableMapping[Any, MutableMapping[str, bool]] = {obj: {} for obj in objects}
+        if not objects:
+            return results
+
+        scope = "project" if projects is not None else "organization"
+        remaining = list(feature_names)
+
+        batch_features = self.batch_has(
+            feature_names, actor=actor, projects=projects, organization=organization
+        )
+        # batch_has has found some features
+        if batch_features:
+            batch_checked = set()
+            for obj in objects:
+                for feature_name, active in batch_features.get(f"{scope}:{obj.id}", {}).items():
+                    results[obj][feature_name] = active
+                    batch_checked.add(feature_name)
+
+            remaining = [name for name in remaining if name not in batch_checked]
+            for feature_name in batch_checked:
+                for obj in objects:
+                    active = results[obj].setdefault(feature_name, False)
+                    # Registered handlers take precedence over the entity
+                    # handler in ``has``, so only the entity handler's results
+                    # for other features are what ``has`` would return.
+                    if not self._handler_registry.get(feature_name):
+                        self.memo.set(self.memo.key(feature_name, [obj], {}, actor, False), active)
+
+        # Remaining features should not be checked via the entity handler
+        for feature_name in remaining:
+            if projects is not None:
+                for obj, active in self.has_for_batch(
+                    feature_name, organization, projects, actor
+                ).items():
+                    results[obj][feature_name] = active
+                    self.memo.set(self.memo.key(feature_name, [obj], {}, actor, False), active)
+            else:
+                results[organization][feature_name] = self.has(
+                    feature_name, organization, actor=actor, skip_entity=True
+                )
+
+        return results
 
     def batch_has(
         self,
@@ -264,7 +451,7 @@ class FeatureManager(RegisteredFeatureManager):
             )
         else:
             # Fall back to default handler if no entity handler available.
-            project_features = filter(lambda name: name.startswith("projects:"), feature_names)
+            project_features = [name for name in feature_names if name.startswith("projects:")]
             if projects and project_features:
                 results: MutableMapping[str, Mapping[str, bool]] = {}
                 for project in projects:
@@ -273,18 +460,18 @@ class FeatureManager(RegisteredFeatureManager):
                         proj_results[feature_name] = self.has(feature_name, project, actor=actor)
                 return results
 
-            org_features = filter(lambda name: name.startswith("organizations:"), feature_names)
+            org_features = [name for name in feature_names if name.startswith("organizations:")]
             if organization and org_features:
                 org_results = {}
                 for feature_name in org_features:
                     org_results[feature_name] = self.has(feature_name, organization, actor=actor)
                 return {f"organization:{organization.id}": org_results}
 
-            unscoped_features = filter(
-                lambda name: not name.startswith("organizations:")
-                and not name.startswith("projects:"),
-                feature_names,
-            )
+            unscoped_features = [
+                name
+                for name in feature_names
+                if not name.startswith("organizations:") and not name.startswith("projects:")
+            ]
             if unscoped_features:
                 unscoped_results = {}
                 for feature_name in unscoped_features:
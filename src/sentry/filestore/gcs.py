@@ -197,6 +197,26 @@ class GoogleCloudFile(File):
 
         return super().read(num_bytes)
 
+    def read_range(self, start, end):
+        """
+        Reads the bytes from `start` to `end` with a range request, rather
+        than downloading the whole object.
+        """
+        if "r" not in self._mode:
+            raise AttributeError("File was not opened in read mode.")
+        if self._file is not None:
+            self._file.seek(start)
+            return self._file.read(end - start)
+        if start >= end:
+            return b""
+
+        def _try_download():
+            # `end` is inclusive
+            return self.blob.download_as_bytes(start=start, end=end - 1)
+
+        with metrics.timer("filestore.read_range", instance="gcs"):
+            return try_repeated(_try_download)
+
     def write(self, content):
         if "w" not in self._mode:
             raise AttributeError("File was not opened in write mode.")
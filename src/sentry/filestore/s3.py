@@ -177,6 +177,22 @@ class S3Boto3StorageFile(File):
             raise AttributeError("File was not opened in read mode.")
         return super().read(*args, **kwargs)
 
+    def read_range(self, start, end):
+        """
+        Reads the bytes from `start` to `end` with a range request, rather
+        than downloading the whole object.
+        """
+        if "r" not in self._mode:
+            raise AttributeError("File was not opened in read mode.")
+        if self._file is not None or self._storage.gzip:
+            # Ranges of gzipped objects are ranges of the compressed content.
+            self.file.seek(start)
+            return self.file.read(end - start)
+        if start >= end:
+            return b""
+        with metrics.timer("filestore.read_range", instance="s3"):
+            return self.obj.get(Range=f"bytes={start}-{end - 1}")["Body"].read()
+
     def write(self, content):
         if "w" not in self._mode:
             raise AttributeError("File was not opened in write mode.")
@@ -19,6 +19,8 @@ class NamespaceOption:
     """Option name to emit tracking data of this namespace, such as metrics."""
     meta_store: str
     """Option name to emit store metadata belonging to this namespace."""
+    state: str
+    """Prefix to store the state of the incremental clusterer between runs."""
 
 
 class ClustererNamespace(Enum):
@@ -29,6 +31,7 @@ class ClustererNamespace(Enum):
         persistent_storage="sentry:transaction_name_cluster_rules",
         tracker="txcluster.rules_per_project",
         meta_store="sentry:transaction_name_cluster_meta",
+        state="txnames.state",
     )
     SPANS = NamespaceOption(
         name="spans",
@@ -37,4 +40,5 @@ class ClustererNamespace(Enum):
         persistent_storage="sentry:span_description_cluster_rules",
         tracker="span.descs.rules_per_project",
         meta_store="sentry:span_descriptions_cluster_meta",
+        state="span.descs.state",
     )
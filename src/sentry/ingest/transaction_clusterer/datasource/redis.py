@@ -26,6 +26,10 @@ MAX_SET_SIZE = 4000
 #: Remove the set if it has not received any updates for 24 hours.
 SET_TTL = 24 * 60 * 60
 
+#: Retention of the incremental clusterer state.
+#: Remove the state if it has not been updated for a week.
+STATE_TTL = 7 * 24 * 60 * 60
+
 
 # TODO(iker): accept multiple values to add to the set. Right now, multiple
 # calls for each individual value are required, producing too many Redis calls.
@@ -38,6 +42,11 @@ def _get_redis_key(namespace: ClustererNamespace, project: Project) -> str:
     return f"{prefix}:o:{project.organization_id}:p:{project.id}"
 
 
+def _get_state_redis_key(namespace: ClustererNamespace, project: Project) -> str:
+    prefix = namespace.value.state
+    return f"{prefix}:o:{project.organization_id}:p:{project.id}"
+
+
 def get_redis_client() -> Any:
     # XXX(iker): we may want to revisit the decision of having a single Redis cluster.
     cluster_key = settings.SENTRY_TRANSACTION_NAMES_REDIS_CLUSTER
@@ -88,6 +97,17 @@ def clear_transaction_names(project: Project) -> None:
     client.delete(redis_key)
 
 
+def get_clusterer_state(namespace: ClustererNamespace, project: Project) -> Optional[str]:
+    """Return the serialized incremental clusterer state of the given project"""
+    client = get_redis_client()
+    return client.get(_get_state_redis_key(namespace, project))
+
+
+def set_clusterer_state(namespace: ClustererNamespace, project: Project, state: str) -> None:
+    client = get_redis_client()
+    client.set(_get_state_redis_key(namespace, project), state, ex=STATE_TTL)
+
+
 def record_transaction_name(project: Project, event_data: Mapping[str, Any], **kwargs: Any) -> None:
     transaction_name = event_data.get("transaction")
 
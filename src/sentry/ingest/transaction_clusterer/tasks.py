@@ -1,9 +1,9 @@
 from itertools import islice
-from typing import Any, Sequence
+from typing import Any, List, Sequence
 
 import sentry_sdk
 
-from sentry import features
+from sentry import features, options
 from sentry.ingest.transaction_clusterer.base import ReplacementRule
 from sentry.models import Project
 from sentry.tasks.base import instrumented_task
@@ -12,7 +12,7 @@ from sentry.utils import metrics
 from . import ClustererNamespace, rules
 from .datasource import redis
 from .meta import track_clusterer_run
-from .tree import TreeClusterer
+from .tree import IncrementalTreeClusterer, TreeClusterer
 
 #: Minimum number of children in the URL tree which triggers a merge.
 #: See ``TreeClusterer`` for more information.
@@ -22,6 +22,14 @@ from .tree import TreeClusterer
 #: NOTE: We could make this configurable through django settings or even per-project in the future.
 MERGE_THRESHOLD = 200
 
+#: Maximum number of nodes in the tree kept by the incremental clusterer.
+MAX_INCREMENTAL_NODES = 50000
+
+#: Maximum age of the tree kept by the incremental clusterer, in seconds.
+#: The tree is rebuilt from scratch after this, so that noise from old
+#: transaction names does not accumulate forever.
+MAX_INCREMENTAL_AGE = 7 * 24 * 60 * 60
+
 #: Number of projects to process in one celery task
 #: The number 100 was chosen at random and might still need tweaking.
 PROJECTS_PER_TASK = 100
@@ -66,7 +74,11 @@ def cluster_projects(projects: Sequence[Project]) -> None:
                 span.set_data("project_id", project.id)
                 tx_names = list(redis.get_transaction_names(project))
                 new_rules = []
-                if len(tx_names) >= MERGE_THRESHOLD:
+                if options.get("txnames.incremental-clusterer"):
+                    new_rules = _get_rules_incrementally(
+                        ClustererNamespace.TRANSACTIONS, project, tx_names
+                    )
+                elif len(tx_names) >= MERGE_THRESHOLD:
                     clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
                     clusterer.add_input(tx_names)
                     new_rules = clusterer.get_rules()
@@ -95,6 +107,23 @@ def cluster_projects(projects: Sequence[Project]) -> None:
             )
 
 
+def _get_rules_incrementally(
+    namespace: ClustererNamespace, project: Project, inputs: Sequence[str]
+) -> List[ReplacementRule]:
+    """Feed the inputs collected since the last run into the project's
+    persisted clusterer and compute its rules."""
+    clusterer = IncrementalTreeClusterer.loads(
+        redis.get_clusterer_state(namespace, project),
+        merge_threshold=MERGE_THRESHOLD,
+        max_nodes=MAX_INCREMENTAL_NODES,
+        max_age=MAX_INCREMENTAL_AGE,
+    )
+    clusterer.add_input(inputs)
+    new_rules = clusterer.get_rules()
+    redis.set_clusterer_state(namespace, project, clusterer.dumps())
+    return new_rules
+
+
 @instrumented_task(
     name="sentry.ingest.span_clusterer.tasks.spawn_span_cluster_projects",
     queue="transactions.name_clusterer",  # XXX(iker): we should use a different queue
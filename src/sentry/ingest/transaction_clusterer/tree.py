@@ -46,16 +46,19 @@ The replacement rules are interpreted by Relay to match and replace `*`, and to
 """
 
 import logging
+import time
 from collections import UserDict, defaultdict
-from typing import Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Union
 
 import sentry_sdk
 from typing_extensions import TypeAlias
 
+from sentry.utils import json
+
 from .base import Clusterer, ReplacementRule
 from .rule_validator import RuleValidator
 
-__all__ = ["TreeClusterer"]
+__all__ = ["TreeClusterer", "IncrementalTreeClusterer"]
 
 
 class Merged:
@@ -122,6 +125,197 @@ class TreeClusterer(Clusterer):
         return ReplacementRule(path_str)
 
 
+class CompactTrie:
+    """A trie over path segments that can be kept and extended between runs.
+
+    Every distinct segment is stored once in ``segments`` and referenced by its
+    index, and nodes are plain ``{segment index: node index}`` dicts stored in
+    a flat list, with the root at index 0. Nodes below which new paths were
+    inserted are marked as dirty until rules are extracted again.
+    """
+
+    def __init__(
+        self,
+        segments: Optional[List[str]] = None,
+        children: Optional[List[Dict[int, int]]] = None,
+        dirty: Optional[Set[int]] = None,
+        max_nodes: Optional[int] = None,
+    ) -> None:
+        self.segments = segments or []
+        self._segment_ids = {segment: idx for idx, segment in enumerate(self.segments)}
+        self.children = children or [{}]
+        self.dirty = dirty if dirty is not None else set()
+        self.max_nodes = max_nodes
+
+    def __len__(self) -> int:
+        return len(self.children)
+
+    def _intern(self, segment: str) -> int:
+        segment_id = self._segment_ids.get(segment)
+        if segment_id is None:
+            segment_id = self._segment_ids[segment] = len(self.segments)
+            self.segments.append(segment)
+        return segment_id
+
+    def insert(self, parts: Sequence[str]) -> bool:
+        """Inserts a path and returns whether it added any nodes."""
+        node = 0
+        path = [node]
+        created = False
+        for part in parts:
+            segment_id = self._intern(part)
+            child = self.children[node].get(segment_id)
+            if child is None:
+                if self.max_nodes is not None and len(self.children) >= self.max_nodes:
+                    break
+                child = self.children[node][segment_id] = len(self.children)
+                self.children.append({})
+                created = True
+            node = child
+            path.append(node)
+
+        if created:
+            self.dirty.update(path)
+        return created
+
+    def to_node(self, idx: int = 0) -> "Node":
+        """Materializes the subtree below ``idx`` as a ``Node`` tree."""
+        return Node(
+            {
+                self.segments[segment_id]: self.to_node(child)
+                for segment_id, child in self.children[idx].items()
+            }
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segments": self.segments,
+            "children": [
+                [item for pair in node.items() for item in pair] for node in self.children
+            ],
+            "dirty": sorted(self.dirty),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_nodes: Optional[int] = None) -> "CompactTrie":
+        return cls(
+            segments=data["segments"],
+            children=[dict(zip(node[::2], node[1::2])) for node in data["children"]],
+            dirty=set(data["dirty"]),
+            max_nodes=max_nodes,
+        )
+
+
+class IncrementalTreeClusterer(Clusterer):
+    """A ``TreeClusterer`` that keeps its tree between runs.
+
+    Inputs are added to a ``CompactTrie`` that is serialized with ``dumps``
+    and restored with ``loads``, so every run only needs to feed in the names
+    seen since the previous one. Rules are cached per trie node, and merging
+    and rule extraction are only redone for subtrees that received new paths.
+    """
+
+    def __init__(
+        self,
+        *,
+        merge_threshold: int,
+        trie: Optional[CompactTrie] = None,
+        created_at: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+    ) -> None:
+        self._merge_threshold = merge_threshold
+        self._trie = trie or CompactTrie(max_nodes=max_nodes)
+        self._rule_paths: Dict[int, List[List[str]]] = {}
+        self.created_at = created_at if created_at is not None else time.time()
+
+    def add_input(self, strings: Iterable[str]) -> None:
+        for string in strings:
+            self._trie.insert(string.split(SEP))
+
+    def get_rules(self) -> List[ReplacementRule]:
+        with sentry_sdk.start_span(op="cluster_merge"):
+            rule_paths = self._get_rule_paths(0)
+        self._trie.dirty.clear()
+
+        rules = [ReplacementRule(SEP.join(path) + "/**") for path in rule_paths]
+        rules = [rule for rule in rules if RuleValidator(rule).is_valid()]
+        rules.sort(key=len, reverse=True)
+        return rules
+
+    def _get_rule_paths(self, idx: int) -> List[List[str]]:
+        """Returns the paths of all merged nodes below ``idx``, relative to it."""
+        if idx not in self._trie.dirty:
+            # Every clean node has been visited before, and only non-empty
+            # results are kept.
+            return self._rule_paths.get(idx, [])
+
+        children = self._trie.children[idx]
+        rule_paths: List[List[str]]
+        if len(children) >= self._merge_threshold:
+            # The children of this node are merged into a single subtree, so
+            # their own cached rules do not apply.
+            merged = Node._merge_nodes(self._trie.to_node(child) for child in children.values())
+            merged.merge(self._merge_threshold)
+            rule_paths = [["*"]] + [
+                ["*"] + ["*" if isinstance(key, Merged) else key for key in path]
+                for path in merged.paths()
+                if path[-1] is MERGED
+            ]
+        else:
+            rule_paths = [
+                [self._trie.segments[segment_id]] + path
+                for segment_id, child in children.items()
+                for path in self._get_rule_paths(child)
+            ]
+
+        if rule_paths:
+            self._rule_paths[idx] = rule_paths
+        else:
+            self._rule_paths.pop(idx, None)
+        return rule_paths
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "created_at": self.created_at,
+                "merge_threshold": self._merge_threshold,
+                "trie": self._trie.to_dict(),
+                "rule_paths": [[idx, paths] for idx, paths in self._rule_paths.items()],
+            }
+        )
+
+    @classmethod
+    def loads(
+        cls,
+        data: Optional[str],
+        *,
+        merge_threshold: int,
+        max_nodes: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> "IncrementalTreeClusterer":
+        """Restores a clusterer from ``dumps`` output.
+
+        A fresh clusterer is returned if there is no state or if the state is
+        older than ``max_age`` seconds, so that noise does not accumulate in
+        the tree forever.
+        """
+        state = json.loads(data) if data else None
+        if state is None or (max_age is not None and time.time() - state["created_at"] > max_age):
+            return cls(merge_threshold=merge_threshold, max_nodes=max_nodes)
+
+        clusterer = cls(
+            merge_threshold=merge_threshold,
+            trie=CompactTrie.from_dict(state["trie"], max_nodes=max_nodes),
+            created_at=state["created_at"],
+        )
+        if state["merge_threshold"] == merge_threshold:
+            clusterer._rule_paths = {idx: paths for idx, paths in state["rule_paths"]}
+        else:
+            # Cached rules were computed with a different threshold.
+            clusterer._trie.dirty.update(range(len(clusterer._trie)))
+        return clusterer
+
+
 #: Represents the edges between graph nodes. These edges serve as keys in the
 #: node dictionary.
 Edge: TypeAlias = Union[str, Merged]
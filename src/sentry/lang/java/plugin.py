@@ -87,44 +87,77 @@ class JavaStacktraceProcessor(StacktraceProcessor):
 
         return False
 
+    def preprocess_frame(self, processable_frame):
+        # Mapping files are addressed by their debug ids, so frames are
+        # remapped the same way for the same images.
+        frame = processable_frame.frame
+        processable_frame.set_cache_key_from_values(
+            (
+                "proguard",
+                sorted(self.images),
+                frame["module"],
+                frame["function"],
+                frame.get("lineno") or 0,
+            )
+        )
+
     def process_frame(self, processable_frame, processing_task):
         frame = processable_frame.frame
         raw_frame = dict(frame)
 
+        remapped = processable_frame.cache_value
+        if remapped is None:
+            remapped = self._remap_frame(frame)
+            # Frames remapped while mapping files are missing are not cached,
+            # as they may still be uploaded.
+            if len(self.mapping_views) == len(self.images):
+                processable_frame.set_cache_value(remapped)
+
+        if not remapped:
+            return
+
+        new_frames = []
+        bottom_class = remapped[0][0]
+        for module, function, lineno in remapped:
+            frame = dict(raw_frame)
+            frame["module"] = module
+            if function is not None:
+                frame["function"] = function
+                frame["lineno"] = lineno
+
+            # clear the filename for all *foreign* classes
+            if module != bottom_class:
+                frame.pop("filename", None)
+                frame.pop("abs_path", None)
+
+            new_frames.append(frame)
+
+        return new_frames, [raw_frame], []
+
+    def _remap_frame(self, frame):
+        """
+        Returns the frames a frame is remapped to as ``[module, function,
+        lineno]``, with only the module set if just the class was remapped.
+        """
         # first, try to remap complete frames
         for view in self.mapping_views:
             mapped = view.remap_frame(frame["module"], frame["function"], frame.get("lineno") or 0)
 
             if len(mapped) > 0:
-                new_frames = []
-                bottom_class = mapped[-1].class_name
-
                 # sentry expects stack traces in reverse order
-                for new_frame in reversed(mapped):
-                    frame = dict(raw_frame)
-                    frame["module"] = new_frame.class_name
-                    frame["function"] = new_frame.method
-                    frame["lineno"] = new_frame.line
-
-                    # clear the filename for all *foreign* classes
-                    if frame["module"] != bottom_class:
-                        frame.pop("filename", None)
-                        frame.pop("abs_path", None)
-
-                    new_frames.append(frame)
-
-                return new_frames, [raw_frame], []
+                return [
+                    [new_frame.class_name, new_frame.method, new_frame.line]
+                    for new_frame in reversed(mapped)
+                ]
 
         # second, if that is not possible, try to re-map only the class-name
         for view in self.mapping_views:
             mapped = view.remap_class(frame["module"])
 
             if mapped:
-                new_frame = dict(raw_frame)
-                new_frame["module"] = mapped
-                return [new_frame], [raw_frame], []
+                return [[mapped, None, None]]
 
-        return
+        return []
 
 
 # A processor that delegates to JavaStacktraceProcessor for restoring code
@@ -153,6 +186,13 @@ class JavaSourceLookupStacktraceProcessor(StacktraceProcessor):
         self._handles_frame = platform == "java" and self.available and "module" in frame
         return self._proguard_processor_handles_frame or self._handles_frame
 
+    def preprocess_frame(self, processable_frame):
+        # Only remapping is cached, source context is looked up every time.
+        if self.proguard_processor.handles_frame(
+            processable_frame.frame, processable_frame.stacktrace_info
+        ):
+            self.proguard_processor.preprocess_frame(processable_frame)
+
     def preprocess_step(self, processing_task):
         proguard_processor_preprocess_rv = False
         if self._proguard_processor_handles_frame:
@@ -1,10 +1,11 @@
 import dataclasses
 import logging
+import threading
 import time
 import uuid
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urljoin
 
 import sentry_sdk
@@ -23,6 +24,7 @@ from sentry.utils import json, metrics
 
 MAX_ATTEMPTS = 3
 REQUEST_CACHE_TIMEOUT = 3600
+POLLER_INTERVAL = 0.5
 
 logger = logging.getLogger(__name__)
 
@@ -79,10 +81,32 @@ class Symbolicator:
             timeout=settings.SYMBOLICATOR_POLL_TIMEOUT,
         )
         self.task_id_cache_key = _task_id_cache_key_for_event(project.id, event_id)
+        self.poll_count = 0
+
+    def _query_task(self, task_id: str):
+        # A non-zero timeout turns the query into a long poll: symbolicator
+        # holds the request open until the task completes or the timeout
+        # elapses. It is bounded by the poll timeout so that the HTTP timeout
+        # in `SymbolicatorSession._request` still applies.
+        timeout = min(
+            max(options.get("symbolicator.query-task-timeout"), 0),
+            settings.SYMBOLICATOR_POLL_TIMEOUT,
+        )
+
+        if options.get("symbolicator.async-poller"):
+            json_response, polls = get_poller().wait_for(
+                self.sess, task_id, timeout or settings.SYMBOLICATOR_POLL_TIMEOUT
+            )
+            self.poll_count += polls
+            return json_response, True
+
+        self.poll_count += 1
+        return self.sess.query_task(task_id, timeout=timeout), timeout > 0
 
     def _process(self, task_name: str, path: str, **kwargs):
         task_id = default_cache.get(self.task_id_cache_key)
         json_response = None
+        waited = False
 
         with self.sess:
             try:
@@ -90,7 +114,7 @@ class Symbolicator:
                     # Processing has already started and we need to poll
                     # symbolicator for an update. This in turn may put us back into
                     # the queue.
-                    json_response = self.sess.query_task(task_id)
+                    json_response, waited = self._query_task(task_id)
 
                 if json_response is None:
                     # This is a new task, so we compute all request parameters
@@ -119,11 +143,18 @@ class Symbolicator:
                 default_cache.set(
                     self.task_id_cache_key, json_response["request_id"], REQUEST_CACHE_TIMEOUT
                 )
-                raise RetrySymbolication(retry_after=json_response["retry_after"])
+                # If we already blocked on the query there is no point in
+                # sleeping before polling again.
+                raise RetrySymbolication(retry_after=0 if waited else json_response["retry_after"])
             else:
                 # Once we arrive here, we are done processing. Clean up the
                 # task id from the cache.
                 default_cache.delete(self.task_id_cache_key)
+                metrics.timing(
+                    "events.symbolicator.poll_count",
+                    self.poll_count,
+                    tags={"task_name": task_name},
+                )
                 return json_response
 
     def process_minidump(self, minidump):
@@ -325,11 +356,14 @@ class SymbolicatorSession:
         ):
             return self._request(method="post", path=path, params=params, **kwargs)
 
-    def query_task(self, task_id):
+    def query_task(self, task_id, timeout=0):
         task_url = f"requests/{task_id}"
 
         params = {
-            "timeout": 0,  # Only wait when creating, but not when querying tasks
+            # By default only wait when creating, but not when querying tasks.
+            # A non-zero timeout makes symbolicator hold the request until the
+            # task is done or the timeout elapses.
+            "timeout": timeout,
             "scope": self.project_id,
         }
 
@@ -346,3 +380,133 @@ class SymbolicatorSession:
             # %5000 to reduce cardinality of metrics tagging with worker id
             cls._worker_id = str(uuid.uuid4().int % 5000)
         return cls._worker_id
+
+
+@dataclass
+class _PendingRequest:
+    sess: SymbolicatorSession
+    created_at: float
+    done: threading.Event = dataclasses.field(default_factory=threading.Event)
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    polls: int = 0
+
+
+class SymbolicatorPoller:
+    """
+    Polls symbolicator for all outstanding requests of this process from a
+    single background thread.
+
+    Instead of every event polling for its own request on a fixed cadence,
+    callers register their request id and block on `wait_for` until the
+    poller sees the request complete or the wait times out. Completed
+    responses are kept until their caller picks them up, as symbolicator only
+    hands out a response to the first poll that sees it.
+    """
+
+    def __init__(self, interval: float = POLLER_INTERVAL) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: Dict[str, _PendingRequest] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def wait_for(
+        self, sess: SymbolicatorSession, task_id: str, timeout: float
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Waits up to `timeout` seconds for `task_id` to complete.
+
+        Returns the symbolicator response (or `None` if symbolicator lost the
+        task) along with the number of polls issued for it so far. A response
+        with status `pending` is returned if the task did not finish in time.
+        """
+        with self._lock:
+            pending = self._pending.get(task_id)
+            if pending is None:
+                pending = self._pending[task_id] = _PendingRequest(
+                    sess=SymbolicatorSession(
+                        url=sess.url,
+                        project_id=sess.project_id,
+                        event_id=sess.event_id,
+                        timeout=sess.timeout,
+                    ),
+                    created_at=time.monotonic(),
+                )
+            self._ensure_running()
+
+        self._wakeup.set()
+
+        if not pending.done.wait(timeout):
+            return {"status": "pending", "request_id": task_id, "retry_after": 0}, pending.polls
+
+        with self._lock:
+            self._pending.pop(task_id, None)
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.response, pending.polls
+
+    def _ensure_running(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="symbolicator-poller", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self.poll_once():
+                time.sleep(self.interval)
+
+    def poll_once(self) -> bool:
+        """
+        Polls every outstanding request once. Returns whether there are
+        requests left to poll.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for task_id, pending in list(self._pending.items()):
+                # Responses that were never picked up, e.g. because the
+                # waiting task was killed, must not accumulate forever.
+                if now - pending.created_at > REQUEST_CACHE_TIMEOUT:
+                    del self._pending[task_id]
+            outstanding = [
+                (task_id, pending)
+                for task_id, pending in self._pending.items()
+                if not pending.done.is_set()
+            ]
+
+        metrics.gauge("events.symbolicator.poller.outstanding", len(outstanding))
+
+        for task_id, pending in outstanding:
+            try:
+                with pending.sess:
+                    json_response = pending.sess.query_task(task_id)
+            except Exception as e:
+                pending.error = e
+                pending.done.set()
+                continue
+
+            pending.polls += 1
+            if json_response is None or json_response["status"] != "pending":
+                pending.response = json_response
+                pending.done.set()
+
+        with self._lock:
+            return any(not pending.done.is_set() for pending in self._pending.values())
+
+
+_poller: Optional[SymbolicatorPoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_poller() -> SymbolicatorPoller:
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = SymbolicatorPoller()
+        return _poller
@@ -0,0 +1,224 @@
+__all__ = ["AggregatingMetricsBackend"]
+
+import atexit
+import logging
+import os
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from sentry.utils.imports import import_string
+
+from .base import MetricsBackend, Tags, TagValue
+
+logger = logging.getLogger(__name__)
+
+#: Seconds metrics are aggregated for before being sent
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+#: Number of buffered series and timing samples after which metrics are sent
+#: right away
+DEFAULT_MAX_BUFFER_SIZE = 10000
+
+# (key, instance, tags)
+SeriesKey = Tuple[str, Optional[str], Tuple[Tuple[str, TagValue], ...]]
+
+
+def _series_key(key: str, instance: Optional[str], tags: Optional[Tags]) -> SeriesKey:
+    if not tags:
+        return key, instance, ()
+    return key, instance, tuple(sorted(tags.items(), key=lambda item: str(item[0])))
+
+
+class MetricsBuffer:
+    """
+    Aggregates metrics in process and sends them to a backend from a
+    background thread, every `flush_interval` seconds or once `max_size`
+    series and samples are buffered.
+
+    Counters are summed and only the last value of gauges is sent, per key,
+    instance and tags. Timings are sent as recorded: statsd clients apply
+    sample rates themselves, so summarizing them would skew the counts and
+    percentiles computed by the server. Their sample rate is left to the
+    backend as well.
+    """
+
+    def __init__(
+        self,
+        backend: MetricsBackend,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_size: int = DEFAULT_MAX_BUFFER_SIZE,
+    ) -> None:
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._lock = Lock()
+        self._wake = Event()
+        self._started = False
+        self._reset()
+        atexit.register(self.flush)
+        if hasattr(os, "register_at_fork"):
+            # The flusher thread doesn't survive a fork, and the child must
+            # not send what its parent buffered.
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _reset(self) -> None:
+        self._counters: Dict[SeriesKey, Union[float, int]] = {}
+        self._gauges: Dict[SeriesKey, float] = {}
+        self._timings: List[Tuple[SeriesKey, float, float]] = []
+        self._size = 0
+
+    def _after_fork(self) -> None:
+        self._lock = Lock()
+        self._wake = Event()
+        self._started = False
+        self._reset()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            thread = Thread(target=self._run, name="metrics-flusher")
+            thread.daemon = True
+            thread.start()
+            self._started = True
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _added(self, size: int) -> None:
+        # Called with the lock held
+        self._size = size
+        if size >= self.max_size:
+            self._wake.set()
+
+    def incr(self, series: SeriesKey, amount: Union[float, int]) -> None:
+        if not self._started:
+            self._start()
+        with self._lock:
+            counters = self._counters
+            if series in counters:
+                counters[series] += amount
+            else:
+                counters[series] = amount
+                self._added(self._size + 1)
+
+    def gauge(self, series: SeriesKey, value: float) -> None:
+        if not self._started:
+            self._start()
+        with self._lock:
+            gauges = self._gauges
+            size = self._size if series in gauges else self._size + 1
+            gauges[series] = value
+            self._added(size)
+
+    def timing(self, series: SeriesKey, value: float, sample_rate: float) -> None:
+        if not self._started:
+            self._start()
+        with self._lock:
+            self._timings.append((series, value, sample_rate))
+            self._added(self._size + 1)
+
+    def flush(self) -> None:
+        """
+        Sends all buffered metrics.
+        """
+        with self._lock:
+            counters, gauges, timings = self._counters, self._gauges, self._timings
+            self._reset()
+
+        if not (counters or gauges or timings):
+            return
+
+        backend = self.backend
+        try:
+            with backend.batch():
+                for (key, instance, tags), amount in counters.items():
+                    backend.incr(key, instance, dict(tags), amount)
+                for (key, instance, tags), value in gauges.items():
+                    backend.gauge(key, value, instance, dict(tags))
+                for (key, instance, tags), value, sample_rate in timings:
+                    backend.timing(key, value, instance, dict(tags), sample_rate)
+        except Exception:
+            logger.exception("Unable to flush metrics")
+
+
+class AggregatingMetricsBackend(MetricsBackend):
+    """
+    Wraps another backend, aggregating metrics in process and sending them
+    from a background thread, so that recording a metric costs no syscall.
+
+    For example, to aggregate metrics sent to statsd::
+
+        SENTRY_METRICS_BACKEND = "sentry.metrics.aggregating.AggregatingMetricsBackend"
+        SENTRY_METRICS_OPTIONS = {
+            "backend": "sentry.metrics.statsd.StatsdMetricsBackend",
+            "backend_options": {"host": "127.0.0.1", "port": 8125},
+        }
+
+    Sample rates of counters and gauges are applied when they are recorded,
+    and their aggregates are sent unsampled.
+    """
+
+    # `MetricsBackend` is thread local, but all threads share a buffer.
+    _buffers: "WeakKeyDictionary[AggregatingMetricsBackend, MetricsBuffer]" = WeakKeyDictionary()
+    _buffers_lock = Lock()
+
+    def __init__(
+        self,
+        backend: str,
+        backend_options: Optional[Mapping[str, Any]] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+    ) -> None:
+        super().__init__(prefix="")
+
+        with self._buffers_lock:
+            buffer = self._buffers.get(self)
+            if buffer is None:
+                inner = import_string(backend)(**(backend_options or {}))
+                buffer = self._buffers[self] = MetricsBuffer(
+                    inner, flush_interval=flush_interval, max_size=max_buffer_size
+                )
+        self.buffer = buffer
+
+    def flush(self) -> None:
+        self.buffer.flush()
+
+    def incr(
+        self,
+        key: str,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        amount: Union[float, int] = 1,
+        sample_rate: float = 1,
+    ) -> None:
+        if not self._should_sample(sample_rate):
+            return
+        if sample_rate < 1:
+            amount = amount / sample_rate
+        self.buffer.incr(_series_key(key, instance, tags), amount)
+
+    def timing(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        self.buffer.timing(_series_key(key, instance, tags), value, sample_rate)
+
+    def gauge(
+        self,
+        key: str,
+        value: float,
+        instance: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        sample_rate: float = 1,
+    ) -> None:
+        if self._should_sample(sample_rate):
+            self.buffer.gauge(_series_key(key, instance, tags), value)
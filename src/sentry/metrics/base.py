@@ -1,8 +1,9 @@
 __all__ = ["MetricsBackend"]
 
+from contextlib import contextmanager
 from random import random
 from threading import local
-from typing import Mapping, MutableMapping, Optional, Union
+from typing import Generator, Mapping, MutableMapping, Optional, Union
 
 from django.conf import settings
 
@@ -60,3 +61,11 @@ class MetricsBackend(local):
         sample_rate: float = 1,
     ) -> None:
         raise NotImplementedError
+
+    @contextmanager
+    def batch(self) -> Generator[None, None, None]:
+        """
+        Sends the metrics recorded within the block together, if the backend
+        supports it.
+        """
+        yield
@@ -1,6 +1,7 @@
 __all__ = ["StatsdMetricsBackend"]
 
-from typing import Any, Optional, Union
+from contextlib import contextmanager
+from typing import Any, Generator, Optional, Union
 
 import statsd
 
@@ -46,3 +47,13 @@ class StatsdMetricsBackend(MetricsBackend):
         sample_rate: float = 1,
     ) -> None:
         self.client.gauge(self._full_key(self._get_key(key)), value, sample_rate)
+
+    @contextmanager
+    def batch(self) -> Generator[None, None, None]:
+        client = self.client
+        with client.pipeline() as pipeline:
+            self.client = pipeline
+            try:
+                yield
+            finally:
+                self.client = client
@@ -2,19 +2,101 @@ import io
 import mmap
 import os
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from hashlib import sha1
+from typing import Optional
 
 from django.core.files.base import ContentFile
 from django.core.files.base import File as FileObj
 from django.db import models, router, transaction
 from django.utils import timezone
 
+from sentry import options
 from sentry.db.models import BoundedPositiveIntegerField, JSONField, Model
 from sentry.models.files.utils import DEFAULT_BLOB_SIZE, AssembleChecksumMismatch, nooplogger
 from sentry.utils import metrics
 from sentry.utils.db import atomic_transaction
 
+#: Number of blobs fetched at the same time when a file is prefetched or assembled
+BLOB_FETCH_CONCURRENCY = 4
+
+#: Number of bytes read from blobs, and hashed, at a time
+BLOB_READ_SIZE = 65535
+
+#: Size of the blocks files are read in when read through the block cache
+BLOCK_SIZE = 256 * 1024
+
+#: Number of blocks kept per open file by the block cache
+BLOCK_CACHE_SIZE = 64
+
+#: Number of threads fetching blocks ahead of reads, shared by all open files
+READ_AHEAD_POOL_SIZE = 16
+
+_read_ahead_pool: Optional[ThreadPoolExecutor] = None
+_read_ahead_pool_lock = threading.Lock()
+
+
+def _get_read_ahead_pool() -> ThreadPoolExecutor:
+    global _read_ahead_pool
+    if _read_ahead_pool is None:
+        with _read_ahead_pool_lock:
+            if _read_ahead_pool is None:
+                _read_ahead_pool = ThreadPoolExecutor(
+                    max_workers=READ_AHEAD_POOL_SIZE, thread_name_prefix="filestore-read-ahead"
+                )
+    return _read_ahead_pool
+
+
+def _read_blob_range(blob, start, end):
+    """
+    Reads the bytes from ``start`` to ``end`` of a blob.  Storage backends
+    which support range requests expose them as ``read_range`` on their
+    files, with any other backend the blob is opened and seeked.
+    """
+    with blob.getfile() as f:
+        read_range = getattr(f, "read_range", None)
+        if read_range is not None:
+            return read_range(start, end)
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _fetch_blobs(fileobj, size, blobs):
+    """
+    Writes blobs into ``fileobj`` concurrently, each at its offset.  ``blobs``
+    is a sequence of ``(offset, getfile)`` tuples and ``size`` the total size
+    of the file.  Returns the futures of the individual fetches.
+    """
+    if size == 0:
+        return []
+
+    # Zero out the file
+    fileobj.seek(size - 1)
+    fileobj.write(b"\x00")
+    fileobj.flush()
+
+    mem = mmap.mmap(fileobj.fileno(), size)
+
+    def fetch_file(offset, getfile):
+        with getfile() as sf:
+            while True:
+                chunk = sf.read(BLOB_READ_SIZE)
+                if not chunk:
+                    break
+                mem[offset : offset + len(chunk)] = chunk
+                offset += len(chunk)
+
+    try:
+        with ThreadPoolExecutor(max_workers=BLOB_FETCH_CONCURRENCY) as exe:
+            futures = [exe.submit(fetch_file, offset, getfile) for offset, getfile in blobs]
+        mem.flush()
+    finally:
+        mem.close()
+    return futures
+
 
 class ChunkedFileBlobIndexWrapper:
     def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
@@ -74,27 +156,7 @@ class ChunkedFileBlobIndexWrapper:
             self._curfile = f
             return
 
-        # Zero out the file
-        f.seek(size - 1)
-        f.write(b"\x00")
-        f.flush()
-
-        mem = mmap.mmap(f.fileno(), size)
-
-        def fetch_file(offset, getfile):
-            with getfile() as sf:
-                while True:
-                    chunk = sf.read(65535)
-                    if not chunk:
-                        break
-                    mem[offset : offset + len(chunk)] = chunk
-                    offset += len(chunk)
-
-        with ThreadPoolExecutor(max_workers=4) as exe:
-            for idx in self._indexes:
-                exe.submit(fetch_file, idx.offset, idx.blob.getfile)
-
-        mem.flush()
+        _fetch_blobs(f, size, [(idx.offset, idx.blob.getfile) for idx in self._indexes])
         self._curfile = f
 
     def close(self):
@@ -177,6 +239,134 @@ class ChunkedFileBlobIndexWrapper:
         return bytes(result)
 
 
+class CachedFileBlobIndexWrapper(ChunkedFileBlobIndexWrapper):
+    """
+    Reads a file in blocks of ``block_size`` bytes, which are fetched with
+    range reads where the storage backend supports them and kept in a
+    bounded LRU cache, so that random reads (e.g. into zip archives) only
+    fetch the blocks they touch rather than whole blobs or the whole file.
+
+    After every read the next ``read_ahead`` blocks are fetched in the
+    background, which keeps sequential reads from waiting on every block.
+    """
+
+    def __init__(
+        self,
+        indexes,
+        mode=None,
+        block_size=BLOCK_SIZE,
+        read_ahead=0,
+        cache_size=BLOCK_CACHE_SIZE,
+    ):
+        self.block_size = block_size
+        self.read_ahead = read_ahead
+        self.cache_size = max(cache_size, read_ahead + 1)
+        self._blocks: "OrderedDict[tuple, Future]" = OrderedDict()
+        self._pos = 0
+        super().__init__(indexes, mode=mode)
+        self._offsets = [idx.offset for idx in self._indexes]
+        self._size = sum(idx.blob.size for idx in self._indexes)
+
+    @property
+    def size(self):
+        return self._size
+
+    def open(self):
+        self.closed = False
+        self._pos = 0
+
+    def close(self):
+        for future in self._blocks.values():
+            future.cancel()
+        self._blocks.clear()
+        self.closed = True
+
+    def _seek(self, pos):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if pos < 0:
+            raise OSError("Invalid argument")
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        return self._pos
+
+    def _fetch_block(self, key):
+        n, block = key
+        blob = self._indexes[n].blob
+        start = block * self.block_size
+        return _read_blob_range(blob, start, min(start + self.block_size, blob.size))
+
+    def _cache(self, key, future):
+        self._blocks[key] = future
+        while len(self._blocks) > self.cache_size:
+            _, evicted = self._blocks.popitem(last=False)
+            evicted.cancel()
+
+    def _get_block(self, key):
+        future = self._blocks.get(key)
+        if future is None or future.cancelled() or (future.done() and future.exception()):
+            # Blocks which failed to be fetched ahead are fetched once more.
+            future = Future()
+            future.set_result(self._fetch_block(key))
+            self._cache(key, future)
+        else:
+            self._blocks.move_to_end(key)
+        return future.result()
+
+    def _next_block(self, key):
+        n, block = key
+        if (block + 1) * self.block_size < self._indexes[n].blob.size:
+            return n, block + 1
+        # Skip over empty blobs
+        n += 1
+        while n < len(self._indexes) and not self._indexes[n].blob.size:
+            n += 1
+        if n < len(self._indexes):
+            return n, 0
+        return None
+
+    def _schedule_read_ahead(self, key):
+        pool = None
+        for _ in range(self.read_ahead):
+            key = self._next_block(key)
+            if key is None:
+                break
+            if key in self._blocks:
+                continue
+            if pool is None:
+                pool = _get_read_ahead_pool()
+            self._cache(key, pool.submit(self._fetch_block, key))
+
+    def read(self, n=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        if n < 0:
+            n = self._size - self._pos
+
+        result = bytearray()
+        key = None
+        while n > 0 and self._pos < self._size:
+            idx = bisect_right(self._offsets, self._pos) - 1
+            pos_in_blob = self._pos - self._offsets[idx]
+            key = (idx, pos_in_blob // self.block_size)
+            start = pos_in_blob % self.block_size
+            chunk = self._get_block(key)[start : start + n]
+            if not chunk:
+                raise OSError("Blob is shorter than its recorded size")
+            result.extend(chunk)
+            self._pos += len(chunk)
+            n -= len(chunk)
+
+        if key is not None:
+            self._schedule_read_ahead(key)
+        return bytes(result)
+
+
 class AbstractFile(Model):
     __include_in_export__ = False
 
@@ -195,10 +385,20 @@ class AbstractFile(Model):
     DELETE_UNREFERENCED_BLOB_TASK = None
 
     def _get_chunked_blob(self, mode=None, prefetch=False, prefetch_to=None, delete=True):
-        return ChunkedFileBlobIndexWrapper(
+        indexes = (
             self.FILE_BLOB_INDEX_MODEL.objects.filter(file=self)
             .select_related("blob")
-            .order_by("offset"),
+            .order_by("offset")
+        )
+        if not prefetch and options.get("filestore.block-cache.enabled"):
+            return CachedFileBlobIndexWrapper(
+                indexes,
+                mode=mode,
+                block_size=options.get("filestore.block-cache.block-size"),
+                read_ahead=options.get("filestore.block-cache.read-ahead"),
+            )
+        return ChunkedFileBlobIndexWrapper(
+            indexes,
             mode=mode,
             prefetch=prefetch,
             prefetch_to=prefetch_to,
@@ -208,7 +408,9 @@ class AbstractFile(Model):
     def getfile(self, mode=None, prefetch=False):
         """Returns a file object.  By default the file is fetched on
         demand but if prefetch is enabled the file is fully prefetched
-        into a tempfile before reading can happen.
+        into a tempfile before reading can happen.  With the
+        ``filestore.block-cache.enabled`` option, files fetched on demand are
+        read in cached blocks with read-ahead.
         """
         impl = self._get_chunked_blob(mode, prefetch)
         return FileObj(impl, self.name)
@@ -287,34 +489,51 @@ class AbstractFile(Model):
         This creates a file, from file blobs and returns a temp file with the
         contents.
         """
-        tf = tempfile.NamedTemporaryFile()
-        with atomic_transaction(
-            using=(
-                router.db_for_write(self.FILE_BLOB_MODEL),
-                router.db_for_write(self.FILE_BLOB_INDEX_MODEL),
-            )
-        ):
-            file_blobs = self.FILE_BLOB_MODEL.objects.filter(id__in=file_blob_ids).all()
+        file_blobs = self.FILE_BLOB_MODEL.objects.filter(id__in=file_blob_ids).all()
 
-            # Ensure blobs are in the order and duplication as provided
-            blobs_by_id = {blob.id: blob for blob in file_blobs}
-            file_blobs = [blobs_by_id[blob_id] for blob_id in file_blob_ids]
+        # Ensure blobs are in the order and duplication as provided
+        blobs_by_id = {blob.id: blob for blob in file_blobs}
+        file_blobs = [blobs_by_id[blob_id] for blob_id in file_blob_ids]
+
+        offsets = []
+        offset = 0
+        for blob in file_blobs:
+            offsets.append(offset)
+            offset += blob.size
+
+        # Blobs are fetched and hashed before any rows are written, so that no
+        # transaction is held open while talking to the storage backend.
+        tf = tempfile.NamedTemporaryFile()
+        try:
+            for future in _fetch_blobs(
+                tf, offset, [(o, blob.getfile) for o, blob in zip(offsets, file_blobs)]
+            ):
+                future.result()
 
             new_checksum = sha1(b"")
-            offset = 0
-            for blob in file_blobs:
-                self.FILE_BLOB_INDEX_MODEL.objects.create(file=self, blob=blob, offset=offset)
-                with blob.getfile() as blobfile:
-                    for chunk in blobfile.chunks():
-                        new_checksum.update(chunk)
-                        tf.write(chunk)
-                offset += blob.size
+            tf.seek(0)
+            while True:
+                chunk = tf.read(BLOB_READ_SIZE)
+                if not chunk:
+                    break
+                new_checksum.update(chunk)
 
             self.size = offset
             self.checksum = new_checksum.hexdigest()
 
             if checksum != self.checksum:
                 raise AssembleChecksumMismatch("Checksum mismatch")
+        except BaseException:
+            tf.close()
+            raise
+
+        with atomic_transaction(using=router.db_for_write(self.FILE_BLOB_INDEX_MODEL)):
+            self.FILE_BLOB_INDEX_MODEL.objects.bulk_create(
+                [
+                    self.FILE_BLOB_INDEX_MODEL(file=self, blob=blob, offset=o)
+                    for o, blob in zip(offsets, file_blobs)
+                ]
+            )
 
         metrics.timing("filestore.file-size", offset)
         if commit:
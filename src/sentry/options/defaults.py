@@ -275,11 +275,50 @@ register("beacon.anonymous", type=Bool, flags=FLAG_REQUIRED)
 # Filestore (default)
 register("filestore.backend", default="filesystem", flags=FLAG_NOSTORE)
 register("filestore.options", default={"location": "/tmp/sentry-files"}, flags=FLAG_NOSTORE)
+# Read files fetched on demand in cached blocks, using range reads where the
+# backend supports them, and fetch the next blocks ahead of reads.
+register(
+    "filestore.block-cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "filestore.block-cache.block-size",
+    type=Int,
+    default=256 * 1024,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "filestore.block-cache.read-ahead",
+    type=Int,
+    default=4,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Filestore for control silo
 register("filestore.control.backend", default="", flags=FLAG_NOSTORE)
 register("filestore.control.options", default={}, flags=FLAG_NOSTORE)
 
+# Features
+# Memoize feature checks while a request or task is handled.
+register(
+    "features.check-memo.enabled",
+    type=Bool,
+    default=True,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Tagstore
+# Fetch the tag keys and top values of issues with a single batch of queries,
+# and cache them briefly so that the issue details endpoints share them.
+register(
+    "tagstore.batched-group-tag-keys",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Symbol server
 register(
     "symbolserver.enabled",
@@ -368,6 +407,49 @@ register(
     default=0,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Search recording segments for clicks while decompressing them, instead of parsing them whole.
+register(
+    "replay.ingest.streaming-click-extraction",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Deletions
+#
+# Paginate deletions on primary keys, delete rows without cascades or signal handlers with a single
+# query, and delete independent child relations concurrently.
+register(
+    "deletions.set-based-engine",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Release health
+#
+# Merge the metrics queries of release health overviews which share their filters and groups, and
+# send them concurrently.
+register(
+    "release-health.overview-query-fan-out",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Periodically store the sessions and users of the releases of active projects, and read release
+# adoption from these snapshots unless they are older than the given number of seconds.
+register(
+    "release-health.adoption-snapshots.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "release-health.adoption-snapshots.max-age",
+    type=Int,
+    default=600,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Analytics
 register("analytics.backend", default="noop", flags=FLAG_NOSTORE)
@@ -485,6 +567,9 @@ register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_A
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Reuse resolved columns, orderby and groupby across query builders with the same definition
+register("discover.query-plan-cache", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
     "snuba.tagstore.cache-tagkeys-rate",
@@ -567,6 +652,11 @@ register(
 register("symbolicator.sourcemaps-processing-ab-test", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Gradually migrate from file_id to download_id
 register("symbolicator.sourcemap-lookup-id-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Long-poll timeout in seconds when querying pending symbolicator tasks. `0`
+# disables long polling. Bounded by `SYMBOLICATOR_POLL_TIMEOUT`.
+register("symbolicator.query-task-timeout", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Poll pending symbolicator tasks from a single background thread per process.
+register("symbolicator.async-poller", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # Normalization after processors
 register("store.normalize-after-processing", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)  # unused
@@ -726,6 +816,8 @@ register(
     default=[],
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Run independent I/O-bound lookups of serializers concurrently.
+register("api.serializers.concurrent-attr-fetchers", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # Switch for more performant project counter incr
 register(
@@ -1299,6 +1391,8 @@ register(
 register("hybrid_cloud.outbox_rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # controls whether we allow people to upload artifact bundles instead of release bundles
 register("sourcemaps.enable-artifact-bundles", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Keep the transaction name clusterer tree between runs and update it incrementally.
+register("txnames.incremental-clusterer", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Decides whether an incoming transaction triggers an update of the clustering rule applied to it.
 register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Decides whether an incoming span triggers an update of the clustering rule applied to it.
@@ -0,0 +1,145 @@
+"""
+Push invalidation of the local options cache.
+
+Without it, every process keeps options in its local cache for the key's TTL
+(10 seconds by default) and then re-reads them from the network cache, so a
+changed option takes up to a TTL to propagate. With it, option changes are
+broadcast over Redis pub/sub and every subscribed process evicts them from
+its local cache right away, which lets options stay cached for much longer.
+
+Messages can be missed while a process is not subscribed, so options are only
+kept for longer while the subscription is up, and the local cache is flushed
+whenever it drops.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from sentry.options.store import OptionsStore
+
+logger = logging.getLogger("sentry")
+
+#: Redis pub/sub channel option changes are published to
+INVALIDATION_CHANNEL = "sentry.options.invalidate"
+
+#: Seconds to wait before subscribing again after the connection dropped
+RECONNECT_DELAY = 5
+
+
+class OptionsInvalidation:
+    """
+    Publishes option changes, and evicts them from the local cache of a store
+    on a background thread.
+    """
+
+    def __init__(self, cluster: str, ttl: int, channel: str = INVALIDATION_CHANNEL) -> None:
+        self.cluster = cluster
+        self.ttl = ttl
+        self.channel = channel
+        self._lock = threading.Lock()
+        # Process the listener was started in. Threads don't survive a fork,
+        # so forked workers start their own.
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pubsub = None
+        self._listening = False
+        # Bumped on every eviction, so that values fetched while an
+        # invalidation came in are not kept for longer.
+        self._generation = 0
+
+    @property
+    def client(self):
+        from sentry.utils.redis import redis_clusters
+
+        return redis_clusters.get(self.cluster)
+
+    def publish(self, cache_key: str) -> None:
+        self.client.publish(self.channel, cache_key)
+
+    def generation(self) -> Optional[int]:
+        """
+        Returns the current generation if the local cache is kept up to date,
+        to be passed to `is_current` once a value has been fetched.
+        """
+        if self._listening and self._pid == os.getpid():
+            return self._generation
+        return None
+
+    def is_current(self, generation: Optional[int]) -> bool:
+        """
+        Returns whether nothing was invalidated since `generation`, in which
+        case a value fetched in the meantime may be kept for longer.
+        """
+        return generation is not None and generation == self.generation()
+
+    def listen(self, store: OptionsStore) -> None:
+        """
+        Starts evicting invalidated options from the local cache of `store`,
+        unless this process already does.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._listening = False
+            self._thread = threading.Thread(
+                target=self._listen, args=(store, pid), name="options-invalidation", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = RECONNECT_DELAY) -> None:
+        """
+        Stops evicting invalidated options, and waits for the listener thread
+        to exit.
+        """
+        with self._lock:
+            self._pid = None
+            thread, self._thread = self._thread, None
+            if self._pubsub is not None:
+                # Wakes up the listener, which stops once unsubscribed.
+                self._pubsub.unsubscribe()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _listen(self, store: OptionsStore, pid: int) -> None:
+        while True:
+            pubsub = None
+            try:
+                with self._lock:
+                    if self._pid != pid:
+                        return
+                    pubsub = self._pubsub = self.client.pubsub()
+                    pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self._listening = True
+                    elif message["type"] == "message":
+                        cache_key = message["data"]
+                        if isinstance(cache_key, bytes):
+                            cache_key = cache_key.decode("utf-8")
+                        self._generation += 1
+                        store.evict_local_cache(cache_key)
+            except Exception:
+                logger.warning("options.invalidation.disconnected", exc_info=True)
+            finally:
+                if pubsub is not None:
+                    with self._lock:
+                        self._pubsub = None
+                    pubsub.close()
+                if self._listening:
+                    # Changes may have been missed while disconnected.
+                    self._listening = False
+                    store.flush_local_cache()
+
+            if self._pid != pid:
+                return
+            time.sleep(RECONNECT_DELAY)
@@ -4,15 +4,19 @@ import dataclasses
 import logging
 from random import random
 from time import time
-from typing import Any, Optional, Set
+from typing import TYPE_CHECKING, Any, Optional, Set
 
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 
 from sentry.options.manager import UpdateChannel
 
+if TYPE_CHECKING:
+    from sentry.options.invalidation import OptionsInvalidation
+
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
+INVALIDATION_ERR = "Unable to publish option invalidation for %s"
 
 logger = logging.getLogger("sentry")
 
@@ -49,9 +53,11 @@ class Key:
         return False
 
 
-def _make_cache_value(key, value):
+def _make_cache_value(key, value, ttl=None):
     now = int(time())
-    return (value, now + key.ttl, now + key.ttl + key.grace)
+    if ttl is None:
+        ttl = key.ttl
+    return (value, now + ttl, now + ttl + key.grace)
 
 
 class OptionsStore:
@@ -66,9 +72,10 @@ class OptionsStore:
     OptionsManager instead, unless you need raw access to something.
     """
 
-    def __init__(self, cache=None, ttl=None):
+    def __init__(self, cache=None, ttl=None, invalidation: Optional[OptionsInvalidation] = None):
         self.cache = cache
         self.ttl = ttl
+        self.invalidation = invalidation
         self.flush_local_cache()
 
     @property
@@ -112,6 +119,7 @@ class OptionsStore:
         if self.cache is None:
             return None
 
+        generation = self._local_cache_generation()
         cache_key = key.cache_key
         try:
             value = self.cache.get(cache_key)
@@ -121,10 +129,25 @@ class OptionsStore:
             value = None
 
         if value is not None and key.ttl > 0:
-            self._local_cache[cache_key] = _make_cache_value(key, value)
+            self._local_cache[cache_key] = self._make_local_cache_value(key, value, generation)
 
         return value
 
+    def _local_cache_generation(self) -> Optional[int]:
+        if self.invalidation is None:
+            return None
+        self.invalidation.listen(self)
+        return self.invalidation.generation()
+
+    def _make_local_cache_value(self, key, value, generation: Optional[int] = None):
+        """
+        Keeps values in the local cache for longer while changes to them are
+        pushed to this process, unless they changed while being fetched.
+        """
+        if self.invalidation is not None and self.invalidation.is_current(generation):
+            return _make_cache_value(key, value, max(key.ttl, self.invalidation.ttl))
+        return _make_cache_value(key, value)
+
     def get_local_cache(self, key, force_grace=False):
         """
         Attempt to fetch a key out of the local cache.
@@ -182,6 +205,7 @@ class OptionsStore:
         between a miss vs error, but not worth it now since the value
         is limited at the moment.
         """
+        generation = self._local_cache_generation()
         try:
             value = self.model.objects.get(key=key.name).value
         except (self.model.DoesNotExist, ProgrammingError, OperationalError):
@@ -196,7 +220,7 @@ class OptionsStore:
             # NOTE: There is definitely a race condition here between updating
             # the store and the cache
             try:
-                self.set_cache(key, value)
+                self.set_cache(key, value, generation)
             except Exception:
                 if not silent:
                     logger.warning(
@@ -225,7 +249,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value, channel)
-        return self.set_cache(key, value)
+        result = self.set_cache(key, value)
+        self.publish_invalidation(key)
+        return result
 
     def set_store(self, key, value, channel: UpdateChannel):
         from sentry.db.models.query import create_or_update
@@ -240,14 +266,14 @@ class OptionsStore:
             },
         )
 
-    def set_cache(self, key, value):
+    def set_cache(self, key, value, generation: Optional[int] = None):
         if self.cache is None:
             return None
 
         cache_key = key.cache_key
 
         if key.ttl > 0:
-            self._local_cache[cache_key] = _make_cache_value(key, value)
+            self._local_cache[cache_key] = self._make_local_cache_value(key, value, generation)
 
         try:
             self.cache.set(cache_key, value, self.ttl)
@@ -266,7 +292,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
-        return self.delete_cache(key)
+        result = self.delete_cache(key)
+        self.publish_invalidation(key)
+        return result
 
     def delete_store(self, key):
         self.model.objects.filter(key=key.name).delete()
@@ -285,6 +313,27 @@ class OptionsStore:
             logger.warning(CACHE_UPDATE_ERR, key.name, extra={"key": key.name}, exc_info=True)
             return False
 
+    def publish_invalidation(self, key) -> None:
+        """
+        Tells every process to evict the key from its local cache. This is
+        done once the network cache is updated, so that they don't fetch the
+        previous value from it again. Publishing is allowed to fail, in which
+        case other processes pick up the change once their local cache expires.
+        """
+        if self.invalidation is None:
+            return
+
+        try:
+            self.invalidation.publish(key.cache_key)
+        except Exception:
+            logger.warning(INVALIDATION_ERR, key.name, extra={"key": key.name}, exc_info=True)
+
+    def evict_local_cache(self, cache_key: str) -> None:
+        try:
+            del self._local_cache[cache_key]
+        except KeyError:
+            pass
+
     def clean_local_cache(self):
         """
         Iterate over our local cache items, and
@@ -336,3 +385,6 @@ class OptionsStore:
 
     def set_cache_impl(self, cache) -> None:
         self.cache = cache
+
+    def set_invalidation_impl(self, invalidation: Optional[OptionsInvalidation]) -> None:
+        self.invalidation = invalidation
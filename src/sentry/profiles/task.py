@@ -150,7 +150,12 @@ def _symbolicate_profile(profile: Profile, project: Project) -> bool:
 
             # WARNING(loewenheim): This function call may mutate `profile`'s frame list!
             # See comments in the function for why this happens.
-            raw_modules, raw_stacktraces, frames_sent = _prepare_frames_from_profile(profile)
+            (
+                raw_modules,
+                raw_stacktraces,
+                frames_sent,
+                sample_frame_indices,
+            ) = _prepare_frames_from_profile(profile)
 
             set_measurement("profile.frames.sent", len(frames_sent))
 
@@ -167,6 +172,7 @@ def _symbolicate_profile(profile: Profile, project: Project) -> bool:
                     modules=modules,
                     stacktraces=stacktraces,
                     frames_sent=frames_sent,
+                    sample_frame_indices=sample_frame_indices,
                 )
 
             profile["processed_by_symbolicator"] = True
@@ -268,11 +274,14 @@ def _normalize(profile: Profile, organization: Organization) -> None:
             profile["device_classification"] = classification
 
 
-def _prepare_frames_from_profile(profile: Profile) -> Tuple[List[Any], List[Any], set[int]]:
+def _prepare_frames_from_profile(
+    profile: Profile,
+) -> Tuple[List[Any], List[Any], set[int], Optional[List[List[int]]]]:
     with sentry_sdk.start_span(op="task.profiling.symbolicate.prepare_frames"):
         modules = profile["debug_meta"]["images"]
         frames: List[Any] = []
         frames_sent: set[int] = set()
+        sample_frame_indices: Optional[List[List[int]]] = None
 
         # NOTE: the usage of `adjust_instruction_addr` assumes that all
         # the profilers on all the platforms are walking stacks right from a
@@ -288,34 +297,90 @@ def _prepare_frames_from_profile(profile: Profile) -> Tuple[List[Any], List[Any]
                 frames = [profile["profile"]["frames"][idx] for idx in frames_sent]
             else:
                 frames = profile["profile"]["frames"]
+                leaf_frames: dict[int, int] = {}
 
                 for stack in profile["profile"]["stacks"]:
                     if len(stack) > 0:
                         # Make a deep copy of the leaf frame with adjust_instruction_addr = False
                         # and append it to the list. This ensures correct behavior
                         # if the leaf frame also shows up in the middle of another stack.
+                        # Stacks sharing the same leaf frame share the same copy.
                         first_frame_idx = stack[0]
-                        frame = deepcopy(frames[first_frame_idx])
-                        frame["adjust_instruction_addr"] = False
-                        frames.append(frame)
-                        stack[0] = len(frames) - 1
+                        if first_frame_idx not in leaf_frames:
+                            frame = deepcopy(frames[first_frame_idx])
+                            frame["adjust_instruction_addr"] = False
+                            frames.append(frame)
+                            leaf_frames[first_frame_idx] = len(frames) - 1
+                        stack[0] = leaf_frames[first_frame_idx]
 
             stacktraces = [{"frames": frames}]
         # in the original format, we need to gather frames from all samples
         else:
-            stacktraces = []
             for s in profile["sampled_profile"]["samples"]:
-                frames = s["frames"]
+                if len(s["frames"]) > 0:
+                    s["frames"][0]["adjust_instruction_addr"] = False
 
-                if len(frames) > 0:
-                    frames[0]["adjust_instruction_addr"] = False
+            frames, sample_frame_indices = _intern_sample_frames(
+                profile["sampled_profile"]["samples"]
+            )
+            set_measurement("profile.frames.unique", len(frames))
+            stacktraces = [{"frames": frames}]
+        return (modules, stacktraces, frames_sent, sample_frame_indices)
+
+
+def _intern_sample_frames(samples: List[Any]) -> Tuple[List[Any], List[List[int]]]:
+    """
+    Deduplicates the frames of all samples of a legacy `sampled_profile` so that
+    each distinct frame is only sent to symbolicator once.
+
+    Returns the table of unique frames and, for every sample, the list of indices
+    into that table describing its stack.
+    """
+    unique_frames: List[Any] = []
+    frame_table: dict[Tuple[Any, ...], int] = {}
+    sample_frame_indices: List[List[int]] = []
+
+    for s in samples:
+        indices = []
+        for frame in s["frames"]:
+            key = (
+                frame.get("instruction_addr"),
+                frame.get("addr_mode"),
+                frame.get("package"),
+                frame.get("module"),
+                frame.get("adjust_instruction_addr"),
+            )
+            idx = frame_table.get(key)
+            if idx is None:
+                idx = frame_table[key] = len(unique_frames)
+                unique_frames.append(frame)
+            indices.append(idx)
+        sample_frame_indices.append(indices)
+
+    return unique_frames, sample_frame_indices
+
+
+def _expand_interned_frames(
+    stacktraces: List[Any], sample_frame_indices: List[List[int]]
+) -> List[Any]:
+    """
+    Maps the symbolicated unique frames back onto every sample, producing one
+    stacktrace per sample in the shape symbolicator would have returned had all
+    samples been sent individually.
+    """
+    symbolicated_frames = stacktraces[0]["frames"] if stacktraces else []
+    symbolicated_frames_dict = get_frame_index_map(symbolicated_frames)
 
-                stacktraces.append(
-                    {
-                        "frames": frames,
-                    }
-                )
-        return (modules, stacktraces, frames_sent)
+    return [
+        {
+            "frames": [
+                symbolicated_frames[i]
+                for idx in indices
+                for i in symbolicated_frames_dict.get(idx, [])
+            ]
+        }
+        for indices in sample_frame_indices
+    ]
 
 
 def symbolicate(
@@ -403,6 +468,7 @@ def _process_symbolicator_results(
     modules: List[Any],
     stacktraces: List[Any],
     frames_sent: set[int],
+    sample_frame_indices: Optional[List[List[int]]] = None,
 ) -> None:
     with sentry_sdk.start_span(op="task.profiling.symbolicate.process_results"):
         # update images with status after symbolication
@@ -416,6 +482,9 @@ def _process_symbolicator_results(
             )
             return
 
+        if sample_frame_indices is not None:
+            stacktraces = _expand_interned_frames(stacktraces, sample_frame_indices)
+
         if profile["platform"] == "rust":
             _process_symbolicator_results_for_rust(profile, stacktraces)
         elif profile["platform"] == "cocoa":
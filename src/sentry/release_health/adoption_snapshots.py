@@ -0,0 +1,267 @@
+"""
+Snapshots of release adoption.
+
+Release lists show the adoption of every listed release, i.e. the share of the
+sessions and users of its project in the last 24 hours which it had. Rather
+than counting them for every page load, the sessions and users of all releases
+of recently active projects are periodically counted and stored in Redis,
+where the metrics backend reads them from unless they are older than
+`release-health.adoption-snapshots.max-age` seconds.
+
+Unique users can't be added up, so snapshots are taken for every environment
+and for all environments. The adoption in several environments is still
+queried.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from django.conf import settings
+from snuba_sdk.expressions import Granularity
+
+from sentry import options
+from sentry.models.project import Project
+from sentry.release_health.base import EnvironmentName, ProjectId, ProjectRelease, ReleaseName
+from sentry.sentry_metrics.configuration import UseCaseKey
+from sentry.snuba.metrics import MetricField, MetricGroupByField, MetricsQuery, get_series
+from sentry.snuba.metrics.naming_layer.mri import SessionMRI
+from sentry.snuba.metrics.utils import MAX_POINTS
+from sentry.utils import metrics, redis
+from sentry.utils.hashlib import md5_text
+
+logger = logging.getLogger(__name__)
+
+#: Seconds snapshots are kept for if they are not taken again
+SNAPSHOT_TTL = 3600
+
+replace_snapshots = redis.load_script("release_health/adoption_snapshots.lua")
+
+#: Rollup of the counted sessions and users, as in `get_release_adoption`
+ROLLUP = 3600
+
+# Hash fields of snapshots. Releases are prefixed so that they can't collide.
+TIMESTAMP_FIELD = "ts"
+PROJECT_FIELD = "project"
+RELEASE_FIELD_PREFIX = "r:"
+
+# sessions per project, users per project, sessions per release, users per release
+AdoptionCounts = Tuple[
+    Dict[ProjectId, int],
+    Dict[ProjectId, int],
+    Dict[ProjectRelease, int],
+    Dict[ProjectRelease, int],
+]
+
+# (project, environment) -> (sessions, users) of the project and of its releases
+Snapshots = Dict[
+    Tuple[ProjectId, Optional[EnvironmentName]],
+    Tuple[Tuple[int, int], Dict[ReleaseName, Tuple[int, int]]],
+]
+
+
+def _get_client():
+    return redis.redis_clusters.get(settings.SENTRY_RELEASE_ADOPTION_SNAPSHOTS_REDIS_CLUSTER)
+
+
+def _get_key(project_id: ProjectId, environment: Optional[EnvironmentName]) -> str:
+    # Keys of a project share a hash tag so that they can be replaced by a
+    # single script on a cluster.
+    key = f"release-adoption:{{{project_id}}}"
+    if environment is not None:
+        key = f"{key}:{md5_text(environment).hexdigest()}"
+    return key
+
+
+def _format_counts(sessions: int, users: int) -> str:
+    return f"{sessions}:{users}"
+
+
+def _parse_counts(value: str) -> Tuple[int, int]:
+    sessions, users = value.split(":")
+    return int(sessions), int(users)
+
+
+def _count_sessions_and_users(
+    projects: Sequence[Project], org_id: int, start: datetime, end: datetime, groupby: List[str]
+) -> Optional[List[Tuple[Mapping[str, str], int, int]]]:
+    """
+    Counts sessions and users grouped by `groupby`, or returns `None` if
+    there are more groups than can be queried at once.
+    """
+    query = MetricsQuery(
+        org_id=org_id,
+        project_ids=[project.id for project in projects],
+        select=[
+            MetricField(metric_mri=SessionMRI.ALL.value, alias="sessions", op=None),
+            MetricField(metric_mri=SessionMRI.USER.value, alias="users", op="count_unique"),
+        ],
+        start=start,
+        end=end,
+        granularity=Granularity(ROLLUP),
+        groupby=[MetricGroupByField(field=field) for field in groupby],
+        include_series=False,
+        include_totals=True,
+    )
+    groups = get_series(
+        projects=projects, metrics_query=query, use_case_id=UseCaseKey.RELEASE_HEALTH
+    )["groups"]
+    if len(groups) >= MAX_POINTS:
+        return None
+
+    return [
+        (
+            group["by"],
+            int(group["totals"].get("sessions") or 0),
+            int(group["totals"].get("users") or 0),
+        )
+        for group in groups
+    ]
+
+
+def take_snapshots(
+    org_id: int, project_ids: Sequence[ProjectId], now: datetime
+) -> Optional[Snapshots]:
+    """
+    Counts the sessions and users of the last 24 hours of the given projects
+    and all their releases, per environment and for all environments.
+    Returns `None` if the projects have too many releases to be counted.
+    """
+    projects = list(Project.objects.filter(organization_id=org_id, id__in=project_ids))
+    if not projects:
+        return {}
+
+    start = now - timedelta(days=1)
+    snapshots: Snapshots = {}
+    for by_environment in (False, True):
+        groupby = ["project_id", "environment"] if by_environment else ["project_id"]
+        project_counts = _count_sessions_and_users(projects, org_id, start, now, groupby)
+        release_counts = _count_sessions_and_users(
+            projects, org_id, start, now, [*groupby, "release"]
+        )
+        if project_counts is None or release_counts is None:
+            return None
+
+        for by, sessions, users in project_counts:
+            environment = by.get("environment") if by_environment else None
+            if by_environment and environment is None:
+                # Sessions without an environment can't be filtered for.
+                continue
+            snapshots[by["project_id"], environment] = (sessions, users), {}
+
+        for by, sessions, users in release_counts:
+            environment = by.get("environment") if by_environment else None
+            snapshot = snapshots.get((by["project_id"], environment))
+            if snapshot is not None and by.get("release") is not None:
+                snapshot[1][by["release"]] = sessions, users
+
+    return snapshots
+
+
+def store_snapshots(snapshots: Snapshots, now: datetime) -> None:
+    """
+    Replaces the stored snapshots by the given ones. Snapshots of projects
+    and environments which had no sessions are left to expire.
+    """
+    timestamp = now.timestamp()
+    keys_by_project: Dict[ProjectId, List[str]] = defaultdict(list)
+    args_by_project: Dict[ProjectId, List[object]] = defaultdict(lambda: [SNAPSHOT_TTL])
+    for (project_id, environment), (project_counts, release_counts) in snapshots.items():
+        keys_by_project[project_id].append(_get_key(project_id, environment))
+        args = args_by_project[project_id]
+        args += [
+            len(release_counts) + 2,
+            TIMESTAMP_FIELD,
+            str(timestamp),
+            PROJECT_FIELD,
+            _format_counts(*project_counts),
+        ]
+        for release, counts in release_counts.items():
+            args += [RELEASE_FIELD_PREFIX + release, _format_counts(*counts)]
+
+    # The script replaces the snapshots of a project at once, including the
+    # releases they had which are gone. Cluster pipelines can't run scripts,
+    # so it is run once per project.
+    client = _get_client()
+    for project_id, keys in keys_by_project.items():
+        replace_snapshots(client, keys, args_by_project[project_id])
+
+    metrics.incr("release_health.adoption_snapshots.stored", amount=len(snapshots))
+
+
+def update_snapshots(org_id: int, project_ids: Sequence[ProjectId], now: datetime) -> None:
+    with metrics.timer("release_health.adoption_snapshots.update"):
+        snapshots = take_snapshots(org_id, project_ids, now)
+    if snapshots is None:
+        logger.warning(
+            "release_health.adoption_snapshots.too_many_releases",
+            extra={"org_id": org_id, "project_ids": project_ids},
+        )
+        return
+    store_snapshots(snapshots, now)
+
+
+def get_adoption_counts(
+    project_releases: Sequence[ProjectRelease],
+    environments: Optional[Sequence[EnvironmentName]],
+    now: datetime,
+) -> Optional[AdoptionCounts]:
+    """
+    Reads the sessions and users of the given releases and their projects
+    from snapshots, or returns `None` if there are no recent enough snapshots
+    of any of the projects.
+    """
+    max_age = options.get("release-health.adoption-snapshots.max-age")
+    if not max_age or not options.get("release-health.adoption-snapshots.enabled"):
+        return None
+    if environments is None:
+        environment = None
+    elif len(environments) == 1:
+        environment = environments[0]
+    else:
+        return None
+
+    releases_by_project: Dict[ProjectId, List[ReleaseName]] = defaultdict(list)
+    for project_id, release in project_releases:
+        releases_by_project[project_id].append(release)
+    if not releases_by_project:
+        return None
+
+    client = _get_client()
+    with client.pipeline(transaction=False) as pipeline:
+        for project_id, releases in releases_by_project.items():
+            pipeline.hmget(
+                _get_key(project_id, environment),
+                [
+                    TIMESTAMP_FIELD,
+                    PROJECT_FIELD,
+                    *(RELEASE_FIELD_PREFIX + release for release in releases),
+                ],
+            )
+        results = pipeline.execute()
+
+    oldest = now.timestamp() - max_age
+    sessions_per_project: Dict[ProjectId, int] = {}
+    users_per_project: Dict[ProjectId, int] = {}
+    sessions_per_release: Dict[ProjectRelease, int] = {}
+    users_per_release: Dict[ProjectRelease, int] = {}
+    for (project_id, releases), values in zip(releases_by_project.items(), results):
+        timestamp, project_counts, *release_counts = values
+        if timestamp is None or float(timestamp) < oldest:
+            metrics.incr("release_health.adoption_snapshots.miss")
+            return None
+
+        sessions_per_project[project_id], users_per_project[project_id] = _parse_counts(
+            project_counts
+        )
+        for release, counts in zip(releases, release_counts):
+            if counts is not None:
+                (
+                    sessions_per_release[project_id, release],
+                    users_per_release[project_id, release],
+                ) = _parse_counts(counts)
+
+    metrics.incr("release_health.adoption_snapshots.hit")
+    return sessions_per_project, users_per_project, sessions_per_release, users_per_release
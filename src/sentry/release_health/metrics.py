@@ -1,5 +1,7 @@
 import logging
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import (
     Any,
@@ -16,11 +18,14 @@ from typing import (
     Union,
 )
 
+from django.db import connections
 from snuba_sdk import Column, Condition, Direction, Op
 from snuba_sdk.expressions import Granularity, Limit
 
+from sentry import options
 from sentry.models import Environment
 from sentry.models.project import Project
+from sentry.release_health import adoption_snapshots
 from sentry.release_health.base import (
     CrashFreeBreakdown,
     CurrentAndPreviousCrashFreeRates,
@@ -56,6 +61,7 @@ from sentry.snuba.metrics import (
 from sentry.snuba.metrics.naming_layer.mri import SessionMRI
 from sentry.snuba.sessions import _make_stats, get_rollup_starts_and_buckets
 from sentry.snuba.sessions_v2 import AllowedResolution, QueryDefinition
+from sentry.utils import metrics
 from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.safe import get_path
 from sentry.utils.snuba import QueryOutsideRetentionError
@@ -77,6 +83,9 @@ DAY = HOUR * 24
 LEGACY_SESSIONS_DEFAULT_ROLLUP = HOUR
 USE_CASE_ID = UseCaseKey.RELEASE_HEALTH
 
+#: Number of threads sending the queries of release health overviews, shared by all requests
+OVERVIEW_QUERY_POOL_SIZE = 8
+
 logger = logging.getLogger(__name__)
 
 _K1 = TypeVar("_K1")
@@ -111,6 +120,54 @@ def _model_environment_ids_to_environment_names(
     return defaultdict(lambda: None, id_to_name)
 
 
+_overview_query_pool: Optional[ThreadPoolExecutor] = None
+_overview_query_pool_lock = threading.Lock()
+
+
+def _get_overview_query_pool() -> ThreadPoolExecutor:
+    global _overview_query_pool
+    if _overview_query_pool is None:
+        with _overview_query_pool_lock:
+            if _overview_query_pool is None:
+                _overview_query_pool = ThreadPoolExecutor(
+                    max_workers=OVERVIEW_QUERY_POOL_SIZE, thread_name_prefix="release-health"
+                )
+    return _overview_query_pool
+
+
+def _run_overview_query(part: str, query: Callable[[], _V]) -> _V:
+    with metrics.timer(
+        "release_health.metrics.get_release_health_data_overview.query", tags={"part": part}
+    ):
+        return query()
+
+
+def _run_overview_query_in_worker(part: str, query: Callable[[], _V]) -> _V:
+    try:
+        return _run_overview_query(part, query)
+    finally:
+        # Worker threads open their own connections.
+        connections.close_all()
+
+
+def _run_overview_queries(queries: Mapping[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Runs the queries of a release health overview, concurrently unless there
+    is only one of them, and returns their results by name.
+    """
+    # Other threads would not see changes made within a transaction, e.g.
+    # metric names indexed by the current request.
+    if len(queries) < 2 or any(conn.in_atomic_block for conn in connections.all()):
+        return {part: _run_overview_query(part, query) for part, query in queries.items()}
+
+    pool = _get_overview_query_pool()
+    futures = {
+        part: pool.submit(_run_overview_query_in_worker, part, query)
+        for part, query in queries.items()
+    }
+    return {part: future.result() for part, future in futures.items()}
+
+
 class MetricsReleaseHealthBackend(ReleaseHealthBackend):
     """
     Implementation of the ReleaseHealthBackend using the MetricsLayer API
@@ -263,10 +320,15 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         if org_id is None:
             org_id = self._get_org_id(project_ids)
 
+        counts = None
         if now is None:
             now = datetime.now(timezone.utc)
+            # Snapshots are only taken of the last 24 hours.
+            counts = adoption_snapshots.get_adoption_counts(project_releases, environments, now)
 
-        return self._get_release_adoption_impl(now, org_id, project_releases, environments)
+        return self._get_release_adoption_impl(
+            now, org_id, project_releases, environments, counts=counts
+        )
 
     @staticmethod
     def _get_release_adoption_impl(
@@ -274,6 +336,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         org_id: int,
         project_releases: Sequence[ProjectRelease],
         environments: Optional[Sequence[EnvironmentName]] = None,
+        counts: Optional[adoption_snapshots.AdoptionCounts] = None,
     ) -> ReleasesAdoption:
         start = now - timedelta(days=1)
         project_ids = [proj for proj, _rel in project_releases]
@@ -307,7 +370,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                     MetricGroupByField(field="release"),
                 ]
 
-        def _convert_results(groups: Any, total: bool) -> Dict[Any, int]:
+        def _convert_results(groups: Any, total: bool, alias: str = "value") -> Dict[Any, int]:
             """
             Converts the result groups into an array of values:
 
@@ -324,7 +387,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 else:
                     by = group.get("by", {})
                     idx = by.get("project_id"), by.get("release")
-                ret_val[idx] = get_path(group, "totals", "value")
+                ret_val[idx] = get_path(group, "totals", alias)
             return ret_val
 
         def _count_sessions(
@@ -369,6 +432,34 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             raw_result = get_series(projects=projects, metrics_query=query, use_case_id=USE_CASE_ID)
             return _convert_results(raw_result["groups"], total)
 
+        def _count_sessions_and_users(total: bool) -> Tuple[Dict[Any, int], Dict[Any, int]]:
+            select = [
+                MetricField(metric_mri=SessionMRI.ALL.value, alias="sessions", op=None),
+                MetricField(metric_mri=SessionMRI.USER.value, alias="users", op="count_unique"),
+            ]
+            query = MetricsQuery(
+                org_id=org_id,
+                start=start,
+                end=now,
+                project_ids=project_ids,
+                select=select,
+                groupby=_get_common_groupby(total),
+                where=_get_common_where(total),
+                granularity=Granularity(LEGACY_SESSIONS_DEFAULT_ROLLUP),
+                include_series=False,
+                include_totals=True,
+            )
+            raw_result = get_series(projects=projects, metrics_query=query, use_case_id=USE_CASE_ID)
+            # Groups without sessions or users have empty totals for them,
+            # which are left out like the separate queries would.
+            groups = raw_result["groups"]
+            sessions = _convert_results(groups, total, alias="sessions")
+            users = _convert_results(groups, total, alias="users")
+            return (
+                {idx: value for idx, value in sessions.items() if value},
+                {idx: value for idx, value in users.items() if value},
+            )
+
         # XXX(markus): Four queries are quite horrible for this... the old code
         # sufficed with two. From what I understand, ClickHouse would have to
         # gain a function uniqCombined64MergeIf, i.e. a conditional variant of
@@ -381,25 +472,42 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
         # S&S folks can search for it more easily. No string formatting
         # business please!
 
-        # Count of sessions/users for given list of environments and timerange, per-project
-        sessions_per_project: Dict[int, int] = _count_sessions(
-            total=True,
-            project_ids=project_ids,
-            referrer="release_health.metrics.get_release_adoption.total_sessions",
-        )
-        users_per_project: Dict[int, int] = _count_users(
-            total=True, referrer="release_health.metrics.get_release_adoption.total_users"
-        )
+        sessions_per_project: Dict[int, int]
+        users_per_project: Dict[int, int]
+        sessions_per_release: Dict[Tuple[int, str], int]
+        users_per_release: Dict[Tuple[int, str], int]
+        if counts is not None:
+            (
+                sessions_per_project,
+                users_per_project,
+                sessions_per_release,
+                users_per_release,
+            ) = counts
+        elif options.get("release-health.overview-query-fan-out"):
+            # Sessions and users share their filters and groups, so they are
+            # counted by the same query.
+            sessions_per_project, users_per_project = _count_sessions_and_users(total=True)
+            sessions_per_release, users_per_release = _count_sessions_and_users(total=False)
+        else:
+            # Count of sessions/users for given list of environments and timerange, per-project
+            sessions_per_project = _count_sessions(
+                total=True,
+                project_ids=project_ids,
+                referrer="release_health.metrics.get_release_adoption.total_sessions",
+            )
+            users_per_project = _count_users(
+                total=True, referrer="release_health.metrics.get_release_adoption.total_users"
+            )
 
-        # Count of sessions/users for given list of environments and timerange AND GIVEN RELEASES, per-project
-        sessions_per_release: Dict[Tuple[int, str], int] = _count_sessions(
-            total=False,
-            project_ids=project_ids,
-            referrer="release_health.metrics.get_release_adoption.releases_sessions",
-        )
-        users_per_release: Dict[Tuple[int, str], int] = _count_users(
-            total=False, referrer="release_health.metrics.get_release_adoption.releases_users"
-        )
+            # Count of sessions/users for given list of environments and timerange AND GIVEN RELEASES, per-project
+            sessions_per_release = _count_sessions(
+                total=False,
+                project_ids=project_ids,
+                referrer="release_health.metrics.get_release_adoption.releases_sessions",
+            )
+            users_per_release = _count_users(
+                total=False, referrer="release_health.metrics.get_release_adoption.releases_users"
+            )
 
         rv = {}
 
@@ -904,6 +1012,90 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                     ret_val[(proj_id, release, status)] = value
         return ret_val
 
+    @staticmethod
+    def _get_session_totals_for_overview(
+        projects: Sequence[Project],
+        where: List[Condition],
+        org_id: int,
+        granularity: int,
+        start: datetime,
+        end: datetime,
+    ) -> Tuple[
+        Mapping[Tuple[int, str], int],
+        Mapping[Tuple[int, str, str], int],
+        Mapping[Tuple[int, str, str], int],
+    ]:
+        """
+        Errored sessions, sessions by status, and users and crashed users with
+        a single query, in the shapes returned by
+        `_get_errored_sessions_for_overview`,
+        `_get_session_by_status_for_overview` and
+        `_get_users_and_crashed_users_for_overview`.
+        """
+        project_ids = [p.id for p in projects]
+
+        select = [
+            MetricField(metric_mri=SessionMRI.ERRORED_SET.value, alias="errored", op=None),
+            MetricField(metric_mri=SessionMRI.ABNORMAL.value, alias="abnormal", op=None),
+            MetricField(metric_mri=SessionMRI.CRASHED.value, alias="crashed", op=None),
+            MetricField(metric_mri=SessionMRI.ALL.value, alias="init", op=None),
+            MetricField(
+                metric_mri=SessionMRI.ERRORED_PREAGGREGATED.value, alias="errored_preaggr", op=None
+            ),
+            MetricField(metric_mri=SessionMRI.ALL_USER.value, alias="all_users", op=None),
+            MetricField(metric_mri=SessionMRI.CRASHED_USER.value, alias="crashed_users", op=None),
+        ]
+
+        groupby = [
+            MetricGroupByField(field="project_id"),
+            MetricGroupByField(field="release"),
+        ]
+
+        query = MetricsQuery(
+            org_id=org_id,
+            project_ids=project_ids,
+            select=select,
+            start=start,
+            end=end,
+            granularity=Granularity(granularity),
+            groupby=groupby,
+            where=where,
+            include_series=False,
+            include_totals=True,
+        )
+        raw_result = get_series(
+            projects=projects,
+            metrics_query=query,
+            use_case_id=USE_CASE_ID,
+        )
+        groups = raw_result["groups"]
+
+        errored_sessions = {}
+        sessions = {}
+        users = {}
+        for group in groups:
+            by = group.get("by", {})
+            proj_id = by.get("project_id")
+            release = by.get("release")
+
+            # Groups only found in some entities (e.g. sessions without
+            # users) have empty totals for the others, which the separate
+            # queries would not have returned.
+            totals = group.get("totals", {})
+            errored = totals.get("errored")
+            if errored:
+                errored_sessions[(proj_id, release)] = errored
+            for status in ["abnormal", "crashed", "init", "errored_preaggr"]:
+                value = totals.get(status)
+                if value:
+                    sessions[(proj_id, release, status)] = value
+            for status in ["all_users", "crashed_users"]:
+                value = totals.get(status)
+                if value:
+                    users[(proj_id, release, status)] = value
+
+        return errored_sessions, sessions, users
+
     @staticmethod
     def _get_health_stats_for_overview(
         projects: Sequence[Project],
@@ -997,38 +1189,68 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         where = [filter_projects_by_project_release(project_releases)]
 
-        if health_stats_period:
-            health_stats_data = self._get_health_stats_for_overview(
-                projects=projects,
-                where=where,
-                org_id=org_id,
-                stat=stat,
-                granularity=granularity,
-                start=summary_start,
-                end=now,
-                buckets=stats_buckets,
-            )
+        if options.get("release-health.overview-query-fan-out"):
+            queries: Dict[str, Callable[[], Any]] = {
+                "durations": lambda: self._get_session_duration_data_for_overview(
+                    projects, where, org_id, rollup, summary_start, now
+                ),
+                "totals": lambda: self._get_session_totals_for_overview(
+                    projects, where, org_id, rollup, summary_start, now
+                ),
+                "adoption": lambda: self.get_release_adoption(
+                    project_releases, environments, org_id=org_id
+                ),
+            }
+            if health_stats_period:
+                queries["health_stats"] = lambda: self._get_health_stats_for_overview(
+                    projects=projects,
+                    where=where,
+                    org_id=org_id,
+                    stat=stat,
+                    granularity=granularity,
+                    start=summary_start,
+                    end=now,
+                    buckets=stats_buckets,
+                )
+
+            results = _run_overview_queries(queries)
+            health_stats_data = results.get("health_stats", {})
+            rv_durations = results["durations"]
+            rv_errored_sessions, rv_sessions, rv_users = results["totals"]
+            release_adoption = results["adoption"]
         else:
-            health_stats_data = {}
+            if health_stats_period:
+                health_stats_data = self._get_health_stats_for_overview(
+                    projects=projects,
+                    where=where,
+                    org_id=org_id,
+                    stat=stat,
+                    granularity=granularity,
+                    start=summary_start,
+                    end=now,
+                    buckets=stats_buckets,
+                )
+            else:
+                health_stats_data = {}
 
-        rv_durations = self._get_session_duration_data_for_overview(
-            projects, where, org_id, rollup, summary_start, now
-        )
-        rv_errored_sessions = self._get_errored_sessions_for_overview(
-            projects, where, org_id, rollup, summary_start, now
-        )
-        rv_sessions = self._get_session_by_status_for_overview(
-            projects, where, org_id, rollup, summary_start, now
-        )
-        rv_users = self._get_users_and_crashed_users_for_overview(
-            projects, where, org_id, rollup, summary_start, now
-        )
+            rv_durations = self._get_session_duration_data_for_overview(
+                projects, where, org_id, rollup, summary_start, now
+            )
+            rv_errored_sessions = self._get_errored_sessions_for_overview(
+                projects, where, org_id, rollup, summary_start, now
+            )
+            rv_sessions = self._get_session_by_status_for_overview(
+                projects, where, org_id, rollup, summary_start, now
+            )
+            rv_users = self._get_users_and_crashed_users_for_overview(
+                projects, where, org_id, rollup, summary_start, now
+            )
 
-        # XXX: In order to be able to dual-read and compare results from both
-        # old and new backend, this should really go back through the
-        # release_health service instead of directly calling `self`. For now
-        # that makes the entire backend too hard to test though.
-        release_adoption = self.get_release_adoption(project_releases, environments)
+            # XXX: In order to be able to dual-read and compare results from both
+            # old and new backend, this should really go back through the
+            # release_health service instead of directly calling `self`. For now
+            # that makes the entire backend too hard to test though.
+            release_adoption = self.get_release_adoption(project_releases, environments)
 
         rv: Dict[ProjectRelease, ReleaseHealthOverview] = {}
 
@@ -7,6 +7,7 @@ from django.db.models import F, Q
 from django.utils import timezone
 from sentry_sdk import capture_exception
 
+from sentry import options
 from sentry.models import (
     Environment,
     Project,
@@ -15,7 +16,7 @@ from sentry.models import (
     ReleaseProjectEnvironment,
     ReleaseStatus,
 )
-from sentry.release_health import release_monitor
+from sentry.release_health import adoption_snapshots, release_monitor
 from sentry.release_health.release_monitor.base import Totals
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
@@ -65,6 +66,32 @@ def process_projects_with_sessions(org_id, project_ids) -> None:
         cleanup_adopted_releases(project_ids, adopted_ids)
 
 
+@instrumented_task(
+    name="sentry.release_health.tasks.snapshot_release_adoption",
+    queue="releasemonitor",
+    default_retry_delay=5,
+    max_retries=5,
+)
+def snapshot_release_adoption(**kwargs) -> None:
+    if not options.get("release-health.adoption-snapshots.enabled"):
+        return
+
+    # Snapshots of projects without recent sessions expire, and their
+    # adoption is queried again.
+    for org_id, project_ids in release_monitor.fetch_projects_with_recent_sessions().items():
+        snapshot_project_release_adoption.delay(org_id, project_ids)
+
+
+@instrumented_task(
+    name="sentry.release_health.tasks.snapshot_project_release_adoption",
+    queue="releasemonitor",
+    default_retry_delay=5,
+    max_retries=5,
+)
+def snapshot_project_release_adoption(org_id, project_ids) -> None:
+    adoption_snapshots.update_snapshots(org_id, project_ids, now=timezone.now())
+
+
 def adopt_releases(org_id: int, totals: Totals) -> Sequence[int]:
     # Using the totals calculated in sum_sessions_and_releases, mark any releases as adopted if they reach a threshold.
     adopted_ids = []
@@ -1,12 +1,12 @@
 import dataclasses
 import logging
 import random
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies import RunTaskInThreads, TransformStep
-from arroyo.processing.strategies.abstract import ProcessingStrategyFactory
+from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.types import Commit, Message, Partition
 from django.conf import settings
@@ -15,6 +15,7 @@ from sentry_kafka_schemas.schema_types.ingest_replay_recordings_v1 import Replay
 from sentry_sdk.tracing import Span
 
 from sentry.replays.usecases.ingest import ingest_recording
+from sentry.utils.arroyo import RunTaskWithMultiprocessing
 
 logger = logging.getLogger(__name__)
 
@@ -37,17 +38,52 @@ class ProcessReplayRecordingStrategyFactory(ProcessingStrategyFactory[KafkaPaylo
     """
     This consumer processes replay recordings, which are compressed payloads split up into
     chunks.
+
+    Processing a recording is mostly spent waiting for its upload to blob storage, so messages
+    are processed concurrently, on `num_threads` threads by default. With more than one
+    process, batches of messages are processed by a pool of `num_processes` processes instead.
+    Offsets are committed in order either way.
     """
 
+    def __init__(
+        self,
+        num_threads: int = 4,
+        max_pending_futures: int = 50,
+        num_processes: int = 1,
+        max_batch_size: int = 10,
+        max_batch_time: int = 1,
+        input_block_size: Optional[int] = None,
+        output_block_size: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.num_threads = num_threads
+        self.max_pending_futures = max_pending_futures
+        self.num_processes = num_processes
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+        self.input_block_size = input_block_size
+        self.output_block_size = output_block_size
+
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
-    ) -> Any:
+    ) -> ProcessingStrategy[KafkaPayload]:
+        if self.num_processes > 1:
+            return RunTaskWithMultiprocessing(
+                function=process_message,
+                next_step=CommitOffsets(commit),
+                num_processes=self.num_processes,
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                input_block_size=self.input_block_size,
+                output_block_size=self.output_block_size,
+            )
+
         step = RunTaskInThreads(
             processing_function=move_replay_to_permanent_storage,
-            concurrency=4,
-            max_pending_futures=50,
+            concurrency=self.num_threads,
+            max_pending_futures=self.max_pending_futures,
             next_step=CommitOffsets(commit),
         )
 
@@ -76,3 +112,9 @@ def move_replay_to_permanent_storage(message: Message[MessageContext]) -> Any:
     message_dict = context.message
 
     ingest_recording(message_dict, context.transaction, context.current_hub)
+
+
+def process_message(message: Message[KafkaPayload]) -> Any:
+    """Process a recording in a subprocess, where the Sentry transaction is started."""
+    context = initialize_message_context(message)
+    ingest_recording(context.message, context.transaction, context.current_hub)
@@ -17,6 +17,7 @@ from sentry.models.project import Project
 from sentry.replays.feature import has_feature_access
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, make_storage_driver
 from sentry.replays.usecases.ingest.dom_index import parse_and_emit_replay_actions
+from sentry.replays.usecases.ingest.event_stream import SegmentEventStream, iter_custom_events
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
 from sentry.utils.outcomes import Outcome, track_outcome
@@ -183,10 +184,14 @@ def replay_click_post_processor(
         return None
 
     try:
-        with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
-            decompressed_segment = decompress(segment_bytes)
-            parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
-            _report_size_metrics(len(segment_bytes), len(decompressed_segment))
+        if options.get("replay.ingest.streaming-click-extraction"):
+            # Decompress and parse the segment while searching it, and only as far as needed.
+            parsed_segment_data = iter_custom_events(segment_bytes)
+        else:
+            with metrics.timer("replays.usecases.ingest.decompress_and_parse"):
+                decompressed_segment = decompress(segment_bytes)
+                parsed_segment_data = json.loads(decompressed_segment, use_rapid_json=True)
+                _report_size_metrics(len(segment_bytes), len(decompressed_segment))
 
         # Emit DOM search metadata to Clickhouse.
         with transaction.start_child(
@@ -199,6 +204,13 @@ def replay_click_post_processor(
                 replay_id=message.replay_id,
                 segment_data=parsed_segment_data,
             )
+
+        if isinstance(parsed_segment_data, SegmentEventStream):
+            # The uncompressed size is only known if the whole segment was read.
+            _report_size_metrics(
+                len(segment_bytes),
+                parsed_segment_data.size_uncompressed if parsed_segment_data.exhausted else None,
+            )
     except Exception:
         logging.exception(
             "Failed to parse recording org={}, project={}, replay={}, segment={}".format(
@@ -0,0 +1,147 @@
+"""Stream the custom events of a recording segment.
+
+Recording segments are (usually zlib compressed) JSON arrays of RRWeb events. Most of their
+bytes are DOM snapshots and incremental mutations, while the click search only looks at a
+handful of custom events (breadcrumbs, performance spans and SDK options). Rather than
+decompressing and parsing a whole segment, it is decompressed in chunks and split into its
+top-level events by scanning for brackets outside of strings. Only events which can be custom
+events are parsed, every other event is skipped over without building any Python objects.
+
+The events are yielded as they are found so that consumers can stop reading, and
+decompressing, the segment once they found what they need.
+"""
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+from sentry.utils import json
+
+#: Number of compressed bytes decompressed at a time.
+CHUNK_SIZE = 16 * 1024
+
+#: RRWeb event type of custom events.
+CUSTOM_EVENT_TYPE = 5
+
+#: Custom events store their type in `data.tag`, events without it are not parsed.
+CUSTOM_EVENT_MARKER = b'"tag"'
+
+# Outside of strings, only brackets and the start of strings are looked at. Within strings, only
+# their end and escaped characters are.
+_STRUCTURE_RE = re.compile(rb'[\[\]{}"]')
+_STRING_RE = re.compile(rb'["\\]')
+
+_OPENING_BRACKETS = frozenset(b"[{")
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+
+class SegmentEventStream:
+    """Iterates over the custom events of a recording segment.
+
+    The number of decompressed bytes read so far is available as `size_uncompressed`. Once
+    the stream was exhausted it is the size of the whole decompressed segment.
+    """
+
+    def __init__(self, segment_bytes: bytes) -> None:
+        self.segment_bytes = segment_bytes
+        self.size_uncompressed = 0
+        self.exhausted = False
+
+    def _chunks(self) -> Iterator[bytes]:
+        data = self.segment_bytes
+        if data.startswith(b"["):
+            self.size_uncompressed = len(data)
+            yield data
+            return
+
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        for offset in range(0, len(data), CHUNK_SIZE):
+            chunk = decompressor.decompress(data[offset : offset + CHUNK_SIZE])
+            if chunk:
+                self.size_uncompressed += len(chunk)
+                yield chunk
+            if decompressor.eof:
+                break
+
+        if not decompressor.eof:
+            raise zlib.error("Incomplete or truncated recording segment")
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        buf = bytearray()
+        # Position up to which `buf` was scanned, and the start of the current event.
+        pos = 0
+        event_start: Optional[int] = None
+        depth = 0
+        # The scanner state is kept across chunks, so that strings spanning many chunks (e.g.
+        # inlined images) are scanned only once.
+        in_string = False
+        escaped = False
+
+        for chunk in self._chunks():
+            # Drop everything before the current event, it was processed already.
+            consumed = pos if event_start is None else event_start
+            if consumed:
+                del buf[:consumed]
+                pos -= consumed
+                if event_start is not None:
+                    event_start -= consumed
+            buf += chunk
+
+            while True:
+                if in_string:
+                    if escaped:
+                        if pos >= len(buf):
+                            break
+                        pos += 1
+                        escaped = False
+                    match = _STRING_RE.search(buf, pos)
+                    if match is None:
+                        # The string continues in the next chunk.
+                        pos = len(buf)
+                        break
+                    pos = match.end()
+                    if buf[match.start()] == _BACKSLASH:
+                        escaped = True
+                    else:
+                        in_string = False
+                    continue
+
+                match = _STRUCTURE_RE.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+
+                char = buf[match.start()]
+                pos = match.end()
+                if char == _QUOTE:
+                    in_string = True
+                    continue
+
+                if char in _OPENING_BRACKETS:
+                    depth += 1
+                    if depth == 1 and char != ord("["):
+                        raise ValueError("Recording segment is not a list of events")
+                    if depth == 2:
+                        event_start = match.start()
+                    continue
+
+                depth -= 1
+                if depth == 0:
+                    self.exhausted = True
+                    return
+                if depth == 1 and event_start is not None:
+                    event_bytes = bytes(buf[event_start:pos])
+                    event_start = None
+                    if CUSTOM_EVENT_MARKER in event_bytes:
+                        event = json.loads(event_bytes, use_rapid_json=True)
+                        if isinstance(event, dict) and event.get("type") == CUSTOM_EVENT_TYPE:
+                            yield event
+
+        raise ValueError("Incomplete recording segment")
+
+
+def iter_custom_events(segment_bytes: bytes) -> SegmentEventStream:
+    """Return a stream of the custom events of a (compressed) recording segment."""
+    return SegmentEventStream(segment_bytes)
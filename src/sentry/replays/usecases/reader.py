@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import functools
+import threading
 import uuid
 import zlib
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Iterator, List, Optional
+from typing import Deque, Iterator, List, Optional
 
 import sentry_sdk
 from django.db.models import Prefetch
@@ -27,8 +28,22 @@ from snuba_sdk import (
 from sentry.models.files.file import File, FileBlobIndex
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, filestore, storage
 from sentry.replays.models import ReplayRecordingSegment
+from sentry.utils import metrics
 from sentry.utils.snuba import raw_snql_query
 
+#: Number of threads downloading segments, shared by all requests of a process.
+DOWNLOAD_POOL_SIZE = 20
+
+#: Number of segments a request downloads ahead of the one it streams.  This bounds both its
+#: share of the download pool and the number of segments it holds in memory.
+DOWNLOAD_READ_AHEAD = 10
+
+#: Maximum size of the decompressed chunks streamed to the response.
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+
+_download_pool: Optional[ThreadPoolExecutor] = None
+_download_pool_lock = threading.Lock()
+
 # METADATA QUERY BEHAVIOR.
 
 
@@ -241,8 +256,23 @@ def _fetch_segments_from_snuba(
 # BLOB DOWNLOAD BEHAVIOR.
 
 
+def _get_download_pool() -> ThreadPoolExecutor:
+    global _download_pool
+    with _download_pool_lock:
+        if _download_pool is None:
+            _download_pool = ThreadPoolExecutor(
+                max_workers=DOWNLOAD_POOL_SIZE, thread_name_prefix="replay-segment-download"
+            )
+        return _download_pool
+
+
 def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[bytes]:
-    """Download segment data from remote storage."""
+    """Download segment data from remote storage.
+
+    Segments are downloaded on a process-wide pool, at most `DOWNLOAD_READ_AHEAD` ahead of the
+    segment being streamed, and are decompressed chunk by chunk as they are streamed.  Memory
+    use is bounded regardless of the number of segments.
+    """
 
     # start a sentry transaction to pass to the thread pool workers
     transaction = sentry_sdk.start_transaction(
@@ -250,24 +280,37 @@ def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[b
         name="ProjectReplayRecordingSegmentIndexEndpoint.download_segments",
         sampled=True,
     )
+    current_hub = sentry_sdk.Hub.current
 
-    download_segment_with_fixed_args = functools.partial(
-        download_segment, transaction=transaction, current_hub=sentry_sdk.Hub.current
-    )
+    pool = _get_download_pool()
+    pending: Deque[Future[Optional[bytes]]] = deque()
+    remaining = iter(segments)
+
+    def download_next() -> None:
+        segment = next(remaining, None)
+        if segment is not None:
+            pending.append(pool.submit(download_segment_blob, segment, transaction, current_hub))
+
+    for _ in range(DOWNLOAD_READ_AHEAD):
+        download_next()
 
     yield b"["
-    # Map all of the segments to a worker process for download.
-    with ThreadPoolExecutor(max_workers=10) as exe:
-        results = exe.map(download_segment_with_fixed_args, segments)
+    try:
+        for i in range(len(segments)):
+            result = pending.popleft().result()
+            download_next()
 
-        for i, result in enumerate(results):
             if result is None:
                 yield b"[]"
             else:
-                yield result
+                yield from iter_decompress(result)
 
             if i < len(segments) - 1:
                 yield b","
+    finally:
+        # The client went away, don't download the segments it won't read.
+        for future in pending:
+            future.cancel()
     yield b"]"
     transaction.finish()
 
@@ -278,6 +321,24 @@ def download_segment(
     current_hub: sentry_sdk.Hub,
 ) -> Optional[bytes]:
     """Return the segment blob data."""
+    result = download_segment_blob(segment, transaction, current_hub)
+    if result is None:
+        return None
+
+    with sentry_sdk.Hub(current_hub):
+        with sentry_sdk.start_span(
+            op="download_segment",
+            description="decompress",
+        ):
+            return decompress(result)
+
+
+def download_segment_blob(
+    segment: RecordingSegmentStorageMeta,
+    transaction: Span,
+    current_hub: sentry_sdk.Hub,
+) -> Optional[bytes]:
+    """Return the segment blob data, as stored."""
     with sentry_sdk.Hub(current_hub):
         with transaction.start_child(
             op="download_segment",
@@ -287,16 +348,11 @@ def download_segment(
             with sentry_sdk.start_span(
                 op="download_segment",
                 description="download",
+            ), metrics.timer(
+                "replays.usecases.reader.download_segment",
+                tags={"driver": "filestore" if segment.file_id else "storage"},
             ):
-                result = driver.get(segment)
-            if result is None:
-                return None
-
-            with sentry_sdk.start_span(
-                op="download_segment",
-                description="decompress",
-            ):
-                return decompress(result)
+                return driver.get(segment)
 
 
 def decompress(buffer: bytes) -> bytes:
@@ -309,3 +365,24 @@ def decompress(buffer: bytes) -> bytes:
         return buffer
 
     return zlib.decompress(buffer, zlib.MAX_WBITS | 32)
+
+
+def iter_decompress(buffer: bytes, chunk_size: int = DECOMPRESS_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield decompressed output in chunks of at most `chunk_size` bytes."""
+    if buffer.startswith(b"["):
+        yield buffer
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    data = buffer
+    while data:
+        chunk = decompressor.decompress(data, chunk_size)
+        if chunk:
+            yield chunk
+        data = decompressor.unconsumed_tail
+
+    chunk = decompressor.flush()
+    if chunk:
+        yield chunk
+    if not decompressor.eof:
+        raise zlib.error("Incomplete or truncated stream")
@@ -81,23 +81,21 @@ instead of group deletion is:
 
 import hashlib
 import logging
-import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Literal, Sequence, Tuple, Union
 
-import redis
 import sentry_sdk
 from django.conf import settings
 
 from sentry import eventstore, models, nodestore, options
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.deletions.defaults.group import DIRECT_GROUP_RELATED_MODELS
+from sentry.eventstore.batch_buffer import EventIdBatchBuffer
 from sentry.eventstore.models import Event
 from sentry.eventstore.processing import event_processing_store
 from sentry.utils import json, metrics, snuba
 from sentry.utils.cache import cache_key_for_event
-from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.redis import redis_clusters
 from sentry.utils.safe import get_path, set_path
 
@@ -288,10 +286,15 @@ def _send_delete_old_primary_hash_messages(
     # Events for a group are split and bucketed by their primary hashes. If flushing is to be
     # performed on a per-group basis, the event count needs to be summed up across all buckets
     # belonging to a single group.
-    event_count = 0
-    for primary_hash in old_primary_hashes:
-        key = _get_old_primary_hash_subset_key(project_id, group_id, primary_hash)
-        event_count += client.llen(key)
+    buffer = EventIdBatchBuffer(client)
+    event_count = sum(
+        buffer.sizes(
+            [
+                _get_old_primary_hash_subset_key(project_id, group_id, primary_hash)
+                for primary_hash in old_primary_hashes
+            ]
+        )
+    )
 
     if (
         not force_flush_batch
@@ -301,7 +304,7 @@ def _send_delete_old_primary_hash_messages(
 
     for primary_hash in old_primary_hashes:
         event_key = _get_old_primary_hash_subset_key(project_id, group_id, primary_hash)
-        event_ids, from_date, to_date = pop_batched_events_from_redis(event_key)
+        event_ids, from_date, to_date = buffer.pop_all(event_key)
 
         # Racing might be happening between two different tasks. Give up on the
         # task that's lagging behind by prematurely terminating flushing.
@@ -398,8 +401,9 @@ def buffered_delete_old_primary_hash(
 
     if old_primary_hash is not None and old_primary_hash != current_primary_hash:
         event_key = _get_old_primary_hash_subset_key(project_id, group_id, old_primary_hash)
-        client.lpush(event_key, f"{to_timestamp(datetime)};{event_id}")
-        client.expire(event_key, settings.SENTRY_REPROCESSING_TOMBSTONES_TTL)
+        EventIdBatchBuffer(client).push(
+            event_key, [(datetime, event_id)], ttl=settings.SENTRY_REPROCESSING_TOMBSTONES_TTL
+        )
 
         if old_primary_hash not in old_primary_hashes:
             old_primary_hashes.add(old_primary_hash)
@@ -492,35 +496,20 @@ def buffered_handle_remaining_events(
     "soft" precondition is fulfilled in `reprocess_group` by iterating through
     events in timestamp order.
 
-    Ideally we'd have batching implemented via a service like buffers, but for
-    more than counters.
+    Event IDs are batched with `EventIdBatchBuffer`, all events of a call are
+    pushed at once.
     """
 
-    client = _get_sync_redis_client()
+    buffer = EventIdBatchBuffer(_get_sync_redis_client())
     # We explicitly cluster by only project_id and group_id here such that our
     # RENAME command later succeeds.
     key = f"re2:remaining:{{{project_id}:{old_group_id}}}"
 
-    if datetime_to_event:
-        llen = client.lpush(
-            key,
-            *(f"{to_timestamp(datetime)};{event_id}" for datetime, event_id in datetime_to_event),
-        )
-        client.expire(key, settings.SENTRY_REPROCESSING_SYNC_TTL)
-    else:
-        llen = client.llen(key)
-
-    if force_flush_batch or llen > settings.SENTRY_REPROCESSING_REMAINING_EVENTS_BUF_SIZE:
-        new_key = f"{key}:{uuid.uuid4().hex}"
-
-        try:
-            # Rename `key` to a new temp key that is passed to celery task. We
-            # use `renamenx` instead of `rename` only to detect UUID collisions.
-            assert client.renamenx(key, new_key), "UUID collision for new_key?"
-        except redis.exceptions.ResponseError:
-            # `key` does not exist in Redis. `ResponseError` is a bit too broad
-            # but it seems we'd have to do string matching on error message
-            # otherwise.
+    size = buffer.push(key, datetime_to_event, ttl=settings.SENTRY_REPROCESSING_SYNC_TTL)
+
+    if force_flush_batch or size > settings.SENTRY_REPROCESSING_REMAINING_EVENTS_BUF_SIZE:
+        new_key = buffer.seal(key)
+        if new_key is None:
             return
 
         from sentry.tasks.reprocessing2 import handle_remaining_events
@@ -536,31 +525,11 @@ def buffered_handle_remaining_events(
 
 def pop_batched_events_from_redis(key):
     """
-    For redis key pointing to a list of buffered events structured like
-    `event id;datetime of event`, returns a list of event IDs, the
-    earliest datetime, and the latest datetime.
+    For redis key pointing to a buffer of events (see `EventIdBatchBuffer`),
+    returns a list of event IDs, the earliest datetime, and the latest
+    datetime.
     """
-    client = _get_sync_redis_client()
-    event_ids_batch = []
-    min_datetime = None
-    max_datetime = None
-
-    for row in client.lrange(key, 0, -1):
-        datetime_raw, event_id = row.split(";")
-        datetime = to_datetime(float(datetime_raw))
-
-        assert datetime is not None
-
-        if min_datetime is None or datetime < min_datetime:
-            min_datetime = datetime
-        if max_datetime is None or datetime > max_datetime:
-            max_datetime = datetime
-
-        event_ids_batch.append(event_id)
-
-    client.delete(key)
-
-    return event_ids_batch, min_datetime, max_datetime
+    return EventIdBatchBuffer(_get_sync_redis_client()).pop_all(key)
 
 
 def mark_event_reprocessed(data=None, group_id=None, project_id=None, num_events=1):
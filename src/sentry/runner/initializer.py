@@ -562,6 +562,18 @@ def bind_cache_to_option_store() -> None:
 
     default_store.set_cache_impl(default_cache)
 
+    # Option changes can be pushed to every process, which lets them keep
+    # options in their local cache for longer.
+    if settings.SENTRY_OPTIONS_INVALIDATION_REDIS_CLUSTER is not None:
+        from sentry.options.invalidation import OptionsInvalidation
+
+        default_store.set_invalidation_impl(
+            OptionsInvalidation(
+                settings.SENTRY_OPTIONS_INVALIDATION_REDIS_CLUSTER,
+                ttl=settings.SENTRY_OPTIONS_INVALIDATION_TTL,
+            )
+        )
+
 
 def apply_legacy_settings(settings: Any) -> None:
     from sentry import options
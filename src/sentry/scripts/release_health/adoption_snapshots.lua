@@ -0,0 +1,21 @@
+-- Replaces the adoption snapshots of a project, stored as one hash per key.
+-- KEYS: the snapshot keys, which share the hash tag of the project
+-- ARGV: the TTL of the snapshots, then for every key the number of its
+-- fields followed by the fields and their values
+assert(#KEYS > 0, "provide at least one snapshot key")
+
+local ttl = ARGV[1]
+-- HMSET is called in batches, as unpack is limited by the size of the stack.
+local batch_size = 1000
+
+local index = 2
+for _, key in ipairs(KEYS) do
+    local count = tonumber(ARGV[index])
+    local stop = index + count * 2
+    redis.call("DEL", key)
+    for start = index + 1, stop, batch_size * 2 do
+        redis.call("HMSET", key, unpack(ARGV, start, math.min(start + batch_size * 2 - 1, stop)))
+    end
+    redis.call("EXPIRE", key, ttl)
+    index = stop + 1
+end
@@ -40,6 +40,7 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.api import event_search
 from sentry.discover.arithmetic import (
     OperandType,
@@ -63,6 +64,12 @@ from sentry.search.events.datasets.profiles import ProfilesDatasetConfig
 from sentry.search.events.datasets.sessions import SessionsDatasetConfig
 from sentry.search.events.datasets.spans_indexed import SpansIndexedDatasetConfig
 from sentry.search.events.datasets.spans_metrics import SpansMetricsDatasetConfig
+from sentry.search.events.plan import (
+    QueryPlan,
+    is_plan_cacheable,
+    query_plan_cache,
+    track_param_reads,
+)
 from sentry.search.events.types import (
     EventsResponse,
     HistogramParams,
@@ -91,9 +98,13 @@ from sentry.utils.validators import INVALID_ID_DETAILS, INVALID_SPAN_ID, WILDCAR
 class BaseQueryBuilder:
     requires_organization_condition: bool = False
     organization_column: str = "organization.id"
+    # Params read while building a query plan, see `sentry.search.events.plan`
+    plan_param_reads: Optional[Set[str]] = None
 
     def get_middle(self):
         """Get the middle for comparison functions"""
+        if self.plan_param_reads is not None:
+            self.plan_param_reads.update(("start", "end"))
         if self.start is None or self.end is None:
             raise InvalidSearchQuery("Need both start & end to use percent_change")
         return self.start + (self.end - self.start) / 2
@@ -333,16 +344,50 @@ class QueryBuilder(BaseQueryBuilder):
         equations: Optional[List[str]] = None,
         orderby: Optional[List[str]] = None,
     ) -> None:
+        plan_key = self.get_plan_key(
+            query, use_aggregate_conditions, selected_columns, groupby_columns, equations, orderby
+        )
+        plan = query_plan_cache.get(plan_key) if plan_key is not None else None
+
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_time_conditions"):
             # Has to be done early, since other conditions depend on start and end
             self.resolve_time_conditions()
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_conditions"):
-            self.where, self.having = self.resolve_conditions(
-                query, use_aggregate_conditions=use_aggregate_conditions
-            )
+            if plan_key is None or plan is not None:
+                self.where, self.having = self.resolve_conditions(
+                    query, use_aggregate_conditions=use_aggregate_conditions
+                )
+            else:
+                with track_param_reads(self) as condition_reads:
+                    self.where, self.having = self.resolve_conditions(
+                        query, use_aggregate_conditions=use_aggregate_conditions
+                    )
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_params"):
             # params depends on parse_query, and conditions being resolved first since there may be projects in conditions
             self.where += self.resolve_params()
+
+        if plan is not None:
+            with sentry_sdk.start_span(op="QueryBuilder", description="apply_plan"):
+                self.apply_plan(plan)
+            return
+
+        if plan_key is None:
+            self.resolve_plan(selected_columns, groupby_columns, equations, orderby)
+            return
+
+        num_aggregates = len(self.aggregates)
+        with track_param_reads(self) as plan_reads:
+            self.resolve_plan(selected_columns, groupby_columns, equations, orderby)
+        if is_plan_cacheable(condition_reads | plan_reads):
+            query_plan_cache.set(plan_key, self.build_plan(num_aggregates))
+
+    def resolve_plan(
+        self,
+        selected_columns: Optional[List[str]],
+        groupby_columns: Optional[List[str]],
+        equations: Optional[List[str]],
+        orderby: Optional[List[str]],
+    ) -> None:
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_columns"):
             self.columns = self.resolve_select(selected_columns, equations)
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_orderby"):
@@ -350,6 +395,88 @@ class QueryBuilder(BaseQueryBuilder):
         with sentry_sdk.start_span(op="QueryBuilder", description="resolve_groupby"):
             self.groupby = self.resolve_groupby(groupby_columns)
 
+    def get_plan_key(
+        self,
+        query: Optional[str],
+        use_aggregate_conditions: bool,
+        selected_columns: Optional[List[str]],
+        groupby_columns: Optional[List[str]],
+        equations: Optional[List[str]],
+        orderby: Optional[Union[List[str], str]],
+    ) -> Optional[Tuple[Any, ...]]:
+        """The key of the query plan for this query, or None if it can't be reused.
+
+        Builders that resolve their query differently don't get a plan.
+        """
+        if type(self).resolve_query is not QueryBuilder.resolve_query:
+            return None
+        if self.parser_config_overrides or not options.get("discover.query-plan-cache"):
+            return None
+
+        project_id = self.filter_params.get("project_id")
+        organization = self.params.organization
+        return (
+            type(self),
+            self.dataset,
+            self.organization_id,
+            organization.id if organization is not None else None,
+            tuple(self.params.project_ids),
+            tuple(sorted(project_id)) if isinstance(project_id, (list, tuple)) else project_id,
+            query,
+            use_aggregate_conditions,
+            None if selected_columns is None else tuple(selected_columns),
+            None if groupby_columns is None else tuple(groupby_columns),
+            None if equations is None else tuple(equations),
+            orderby if orderby is None or isinstance(orderby, str) else tuple(orderby),
+            self.auto_fields,
+            self.auto_aggregations,
+            frozenset(self.functions_acl),
+            tuple(sorted(self.equation_config.items())),
+            self.has_metrics,
+            self.use_metrics_layer,
+            self.transform_alias_to_input_format,
+            self.skip_tag_resolution,
+        )
+
+    def build_plan(self, num_aggregates: int) -> QueryPlan:
+        """Capture what resolving the columns, orderby and groupby added to this builder.
+
+        Maps are captured whole, since the entries added while resolving the
+        conditions are the same for every builder with the same plan key.
+        """
+        return QueryPlan(
+            columns=tuple(self.columns),
+            orderby=tuple(self.orderby),
+            groupby=tuple(self.groupby),
+            aggregates=tuple(self.aggregates[num_aggregates:]),
+            functions={
+                alias: (details.field, details.instance.name, details.arguments.copy())
+                for alias, details in self.function_alias_map.items()
+            },
+            equation_alias_map=dict(self.equation_alias_map),
+            value_resolver_map=dict(self.value_resolver_map),
+            meta_resolver_map=dict(self.meta_resolver_map),
+            prefixed_to_tag_map=dict(self.prefixed_to_tag_map),
+            tag_to_prefixed_map=dict(self.tag_to_prefixed_map),
+            requires_other_aggregates=self.requires_other_aggregates,
+        )
+
+    def apply_plan(self, plan: QueryPlan) -> None:
+        self.columns = list(plan.columns)
+        self.orderby = list(plan.orderby)
+        self.groupby = list(plan.groupby)
+        self.aggregates.extend(plan.aggregates)
+        for alias, (field, name, arguments) in plan.functions.items():
+            self.function_alias_map[alias] = fields.FunctionDetails(
+                field, self.function_converter[name], dict(arguments)
+            )
+        self.equation_alias_map.update(plan.equation_alias_map)
+        self.value_resolver_map.update(plan.value_resolver_map)
+        self.meta_resolver_map.update(plan.meta_resolver_map)
+        self.prefixed_to_tag_map.update(plan.prefixed_to_tag_map)
+        self.tag_to_prefixed_map.update(plan.tag_to_prefixed_map)
+        self.requires_other_aggregates |= plan.requires_other_aggregates
+
     def load_config(
         self,
     ) -> Tuple[
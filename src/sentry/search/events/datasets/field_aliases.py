@@ -78,8 +78,8 @@ def get_team_transactions(
 
 
 def resolve_project_slug_alias(builder: builder.QueryBuilder, alias: str) -> SelectType:
-    builder.value_resolver_map[alias] = lambda project_id: builder.params.project_id_map.get(
-        project_id, ""
-    )
+    # Bind the map rather than the builder, so the resolver can be reused by query plans
+    project_id_map = builder.params.project_id_map
+    builder.value_resolver_map[alias] = lambda project_id: project_id_map.get(project_id, "")
     builder.meta_resolver_map[alias] = "string"
     return AliasedExpression(exp=builder.column("project_id"), alias=alias)
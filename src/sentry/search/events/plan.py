@@ -0,0 +1,184 @@
+"""
+Reusable query plans for the query builder.
+
+Resolving the selected columns, functions, equations, orderby and groupby of a
+query is pure given the dataset, the requested fields, the query string and
+the organization and projects the query runs on. A `QueryPlan` captures what
+that resolution adds to a builder, so that the next builder for the same
+definition (e.g. a dashboard widget refreshed by another request) can skip it
+and only apply the time range, project and environment conditions.
+
+Resolution is tracked while building a plan: if it reads any other parameter
+(the time range, environments, the user or their teams), or anything else
+marks it as such, the plan depends on the request and is not cached.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterator, Mapping, Optional, Set, Tuple
+
+from snuba_sdk import CurriedFunction, OrderBy
+
+from sentry.search.events.types import SelectType, SnubaParams
+
+#: Number of plans kept per process
+QUERY_PLAN_CACHE_SIZE = 1000
+
+#: Seconds a plan is reused for, which bounds how long a renamed project or a
+#: new custom measurement can go unnoticed.
+QUERY_PLAN_CACHE_TIMEOUT = 300
+
+#: Parameters a plan may depend on. These are all part of the plan key.
+PLAN_PARAMS = frozenset(
+    [
+        "organization",
+        "organization_id",
+        "projects",
+        "project_id",
+        "project_ids",
+        "project_id_map",
+        "project_slug_map",
+        "project_objects",
+    ]
+)
+
+
+class TrackedParams(dict):  # type: ignore[type-arg]
+    """Filter params recording which of them are read."""
+
+    def __init__(self, params: Mapping[str, Any], reads: Set[str]) -> None:
+        super().__init__(params)
+        self.reads = reads
+
+    def __getitem__(self, key: str) -> Any:
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        self.reads.add(str(key))
+        return super().__contains__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.reads.add(key)
+        return super().get(key, default)
+
+    def _read_all(self) -> None:
+        # Iterating over the params may read any of them.
+        self.reads.update(self.keys())
+        self.reads.add("*")
+
+    def __iter__(self) -> Iterator[str]:
+        self._read_all()
+        return super().__iter__()
+
+    def items(self):  # type: ignore[no-untyped-def]
+        self._read_all()
+        return super().items()
+
+    def values(self):  # type: ignore[no-untyped-def]
+        self._read_all()
+        return super().values()
+
+    def copy(self) -> "TrackedParams":
+        self._read_all()
+        return TrackedParams(self, self.reads)
+
+
+class TrackedSnubaParams(SnubaParams):
+    """Snuba params recording which of their attributes are read."""
+
+    def __getattribute__(self, name: str) -> Any:
+        if not name.startswith("_") and name != "plan_reads":
+            reads = object.__getattribute__(self, "__dict__").get("plan_reads")
+            if reads is not None:
+                reads.add(name)
+        return object.__getattribute__(self, name)
+
+
+def track_snuba_params(params: SnubaParams, reads: Set[str]) -> SnubaParams:
+    tracked = copy.copy(params)
+    tracked.__class__ = TrackedSnubaParams
+    tracked.plan_reads = reads  # type: ignore[attr-defined]
+    return tracked
+
+
+def is_plan_cacheable(reads: Set[str]) -> bool:
+    return reads <= PLAN_PARAMS
+
+
+@contextmanager
+def track_param_reads(builder: Any) -> Iterator[Set[str]]:
+    """
+    Swaps the builder's params for tracked copies and yields the set of
+    parameters read in the meantime.
+    """
+    reads: Set[str] = set()
+    params, filter_params = builder.params, builder.filter_params
+    builder.params = track_snuba_params(params, reads)
+    builder.filter_params = TrackedParams(filter_params, reads)
+    builder.plan_param_reads = reads
+    try:
+        yield reads
+    finally:
+        builder.params, builder.filter_params = params, filter_params
+        builder.plan_param_reads = None
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """The state a builder's column, orderby and groupby resolution adds to it."""
+
+    columns: Tuple[SelectType, ...]
+    orderby: Tuple[OrderBy, ...]
+    groupby: Tuple[SelectType, ...]
+    aggregates: Tuple[CurriedFunction, ...]
+    # alias -> (field, function name, arguments)
+    functions: Mapping[str, Tuple[str, str, Mapping[str, Any]]]
+    equation_alias_map: Mapping[str, SelectType]
+    value_resolver_map: Mapping[str, Callable[[Any], Any]]
+    meta_resolver_map: Mapping[str, str]
+    prefixed_to_tag_map: Mapping[str, str]
+    tag_to_prefixed_map: Mapping[str, str]
+    requires_other_aggregates: bool
+
+
+class QueryPlanCache:
+    """A bounded, in-process LRU cache of query plans with a time to live."""
+
+    def __init__(
+        self, max_size: int = QUERY_PLAN_CACHE_SIZE, timeout: float = QUERY_PLAN_CACHE_TIMEOUT
+    ) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[float, QueryPlan]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[QueryPlan]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, plan = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return plan
+
+    def set(self, key: Hashable, plan: QueryPlan) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, plan)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+query_plan_cache = QueryPlanCache()
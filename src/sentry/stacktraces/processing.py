@@ -1,5 +1,7 @@
 import logging
-from collections import namedtuple
+import threading
+import time
+from collections import OrderedDict, namedtuple
 from datetime import datetime
 
 import sentry_sdk
@@ -7,12 +9,17 @@ from django.utils import timezone
 
 from sentry.models import Project, Release
 from sentry.stacktraces.functions import set_in_app, trim_function_name
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import get_path, safe_execute
 
 logger = logging.getLogger(__name__)
 
+FRAME_CACHE_TIMEOUT = 3600
+LOCAL_FRAME_CACHE_SIZE = 10000
+LOCAL_FRAME_CACHE_TIMEOUT = 300
+
 StacktraceInfo = namedtuple(
     "StacktraceInfo", ["stacktrace", "container", "platforms", "is_exception"]
 )
@@ -30,6 +37,7 @@ class ProcessableFrame:
         self.data = None
         self.cache_key = None
         self.cache_value = None
+        self.cache_value_dirty = False
         self.processable_frames = processable_frames
 
     def __repr__(self):
@@ -63,8 +71,13 @@ class ProcessableFrame:
         return self.processable_frames[last_idx]
 
     def set_cache_value(self, value):
+        """Stores a value for this frame in the frame cache.  The write is
+        deferred until the processing task is closed so that all frames of
+        an event are written back in a single batch.
+        """
         if self.cache_key is not None:
-            cache.set(self.cache_key, value, 3600)
+            self.cache_value = value
+            self.cache_value_dirty = True
             return True
         return False
 
@@ -84,9 +97,19 @@ class StacktraceProcessingTask:
         self.processors = processors
 
     def close(self):
+        self.flush_frame_cache()
         for frame in self.iter_processable_frames():
             frame.close()
 
+    def flush_frame_cache(self):
+        to_write = {}
+        for frame in self.iter_processable_frames():
+            if frame.cache_value_dirty:
+                to_write[frame.cache_key] = frame.cache_value
+                frame.cache_value_dirty = False
+        if to_write:
+            write_frame_cache(to_write)
+
     def iter_processors(self):
         return iter(self.processors)
 
@@ -440,13 +463,92 @@ def get_crash_frame_from_event_data(data, frame_filter=None):
         return default
 
 
+class LocalFrameCache:
+    """A bounded, in-process LRU cache in front of the shared frame cache.
+
+    Frame cache keys are derived from the frame values the processor cares
+    about (typically including the release or debug files), so consecutive
+    events of the same release processed by a worker hit the same keys over
+    and over. Cached values are shared between events and must not be
+    mutated.
+    """
+
+    def __init__(self, max_size=LOCAL_FRAME_CACHE_SIZE, timeout=LOCAL_FRAME_CACHE_TIMEOUT):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get_many(self, keys):
+        rv = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                item = self._data.get(key)
+                if item is None:
+                    continue
+                expires, value = item
+                if expires < now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                rv[key] = value
+        return rv
+
+    def set_many(self, values):
+        expires = time.monotonic() + self.timeout
+        with self._lock:
+            for key, value in values.items():
+                self._data[key] = (expires, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_frame_cache = LocalFrameCache()
+
+
 def lookup_frame_cache(keys):
-    rv = {}
+    keys = list(keys)
+    rv = local_frame_cache.get_many(keys)
+    missing = [key for key in keys if key not in rv]
+    if missing:
+        found = {key: value for key, value in cache.get_many(missing).items() if value is not None}
+        local_frame_cache.set_many(found)
+        rv.update(found)
     for key in keys:
-        rv[key] = cache.get(key)
+        rv.setdefault(key, None)
     return rv
 
 
+def write_frame_cache(values):
+    local_frame_cache.set_many(values)
+    cache.set_many(values, FRAME_CACHE_TIMEOUT)
+
+
+def _record_frame_cache_metrics(to_lookup):
+    stats = {}
+    for processable_frames in to_lookup.values():
+        for processable_frame in processable_frames:
+            processor_stats = stats.setdefault(
+                processable_frame.processor.__class__.__name__, [0, 0]
+            )
+            processor_stats[processable_frame.cache_value is None] += 1
+
+    for processor_name, (hits, misses) in stats.items():
+        for result, amount in (("hit", hits), ("miss", misses)):
+            if amount:
+                metrics.incr(
+                    "stacktraces.frame_cache.lookup",
+                    amount=amount,
+                    tags={"processor": processor_name, "result": result},
+                )
+
+
 def get_stacktrace_processing_task(infos, processors):
     """Returns a list of all tasks for the processors.  This can skip over
     processors that seem to not handle any frames.
@@ -468,11 +570,14 @@ def get_stacktrace_processing_task(infos, processors):
                 processable_frame
             )
             if processable_frame.cache_key is not None:
-                to_lookup[processable_frame.cache_key] = processable_frame
-
-    frame_cache = lookup_frame_cache(to_lookup)
-    for cache_key, processable_frame in to_lookup.items():
-        processable_frame.cache_value = frame_cache.get(cache_key)
+                to_lookup.setdefault(processable_frame.cache_key, []).append(processable_frame)
+
+    if to_lookup:
+        frame_cache = lookup_frame_cache(to_lookup)
+        for cache_key, processable_frames in to_lookup.items():
+            for processable_frame in processable_frames:
+                processable_frame.cache_value = frame_cache.get(cache_key)
+        _record_frame_cache_metrics(to_lookup)
 
     return StacktraceProcessingTask(
         processable_stacktraces=by_stacktrace_info, processors=by_processor
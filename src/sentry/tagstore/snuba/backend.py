@@ -11,6 +11,7 @@ from pytz import UTC
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
 from snuba_sdk import Column, Condition, Direction, Entity, Function, Op, OrderBy, Query, Request
 
+from sentry import options
 from sentry.api.utils import default_start_end_dates
 from sentry.issues.grouptype import GroupCategory
 from sentry.models import (
@@ -81,6 +82,14 @@ DEFAULT_TYPE_CONDITION = ["type", "!=", "transaction"]
 
 tag_value_data_transformers = {"first_seen": parse_datetime, "last_seen": parse_datetime}
 
+# Seconds the tag keys and top values of a group are cached for, when batched
+GROUP_TAG_KEYS_CACHE_TTL = 30
+
+# Top values cached per tag key of a group. Callers asking for fewer values,
+# e.g. the tag distribution bars for 9 while the tags sidebar asks for 10, are
+# served a slice of them, so that they share the cache.
+GROUP_TAG_KEYS_CACHE_VALUE_LIMIT = 10
+
 
 def is_boolean_key(key):
     return key in BOOLEAN_KEYS
@@ -475,6 +484,18 @@ class SnubaTagStorage(TagStorage):
         return set(key.top_values)
 
     def get_group_tag_key(self, group, environment_id, key, tenant_ids=None):
+        if options.get("tagstore.batched-group-tag-keys"):
+            tag_keys = self.__get_cached_group_tag_keys_and_top_values(
+                group,
+                [environment_id] if environment_id else [],
+                [key],
+                TOP_VALUES_DEFAULT_LIMIT,
+                tenant_ids=tenant_ids,
+            )
+            if key not in tag_keys:
+                raise GroupTagKeyNotFound
+            return self.__make_group_tag_key(group, key, tag_keys[key])
+
         return self.__get_tag_key_and_top_values(
             group.project_id,
             group,
@@ -708,6 +729,20 @@ class SnubaTagStorage(TagStorage):
         # of top values for each key, so the total rows returned should be
         # num_keys * limit.
 
+        if options.get("tagstore.batched-group-tag-keys") and not (
+            kwargs.get("conditions") or kwargs.get("aggregations")
+        ):
+            tag_keys = self.__get_cached_group_tag_keys_and_top_values(
+                group,
+                environment_ids,
+                keys,
+                value_limit,
+                tenant_ids=tenant_ids,
+                start=kwargs.get("start"),
+                end=kwargs.get("end"),
+            )
+            return [self.__make_group_tag_key(group, key, data) for key, data in tag_keys.items()]
+
         # First get totals and unique counts by key.
         keys_with_counts = self.get_group_tag_keys(
             group, environment_ids, keys=keys, tenant_ids=tenant_ids
@@ -763,6 +798,176 @@ class SnubaTagStorage(TagStorage):
 
         return keys_with_counts
 
+    def __get_group_tag_keys_and_top_values_batched(
+        self, group, environment_ids, keys, value_limit, tenant_ids=None, start=None, end=None
+    ):
+        """
+        Fetches the totals and top values of the given tag keys of a group,
+        or of all its tag keys if `keys` is None, with a single batch of
+        Snuba queries. Returns a mapping of tag key to its (cacheable) data.
+        """
+        filters = {"project_id": get_project_list(group.project_id)}
+        if environment_ids:
+            filters["environment"] = sorted(environment_ids)
+        if keys is not None:
+            filters["tags_key"] = sorted(keys)
+        dataset, conditions, filters = self.apply_group_filters_conditions(group, [], filters)
+
+        params = {
+            "dataset": dataset,
+            "start": start,
+            "end": end,
+            "conditions": conditions,
+            "filter_keys": filters,
+            "orderby": "-count",
+            "tenant_ids": tenant_ids,
+        }
+        try:
+            totals, values = snuba.bulk_raw_query(
+                [
+                    snuba.SnubaQueryParams(
+                        groupby=["tags_key"],
+                        aggregations=[
+                            ["count()", "", "count"],
+                            ["uniq", "tags_value", "values_seen"],
+                        ],
+                        **params,
+                    ),
+                    snuba.SnubaQueryParams(
+                        groupby=["tags_key", "tags_value"],
+                        aggregations=[
+                            ["count()", "", "count"],
+                            ["min", SEEN_COLUMN, "first_seen"],
+                            ["max", SEEN_COLUMN, "last_seen"],
+                        ],
+                        limitby=[value_limit, "tags_key"],
+                        **params,
+                    ),
+                ],
+                referrer="tagstore.get_group_tag_keys_and_top_values",
+            )
+        except (snuba.QueryOutsideRetentionError, snuba.QueryOutsideGroupActivityError):
+            return {}
+
+        tag_keys = {
+            row["tags_key"]: {
+                "values_seen": row["values_seen"],
+                "count": row["count"],
+                "top_values": [],
+            }
+            for row in totals["data"]
+        }
+        # Rows are sorted by count, and so are the top values of each key.
+        for row in values["data"]:
+            data = tag_keys.get(row["tags_key"])
+            if data is not None:
+                data["top_values"].append(
+                    (row["tags_value"], row["count"], row["first_seen"], row["last_seen"])
+                )
+        return tag_keys
+
+    def __get_cached_group_tag_keys_and_top_values(
+        self, group, environment_ids, keys, value_limit, tenant_ids=None, start=None, end=None
+    ):
+        """
+        Like `__get_group_tag_keys_and_top_values_batched`, but caches every
+        tag key for `GROUP_TAG_KEYS_CACHE_TTL` seconds, so that the group
+        details endpoints share the tag keys they load, and only the keys
+        which are not cached yet are queried.
+        """
+        if value_limit > GROUP_TAG_KEYS_CACHE_VALUE_LIMIT:
+            tag_keys = self.__get_group_tag_keys_and_top_values_batched(
+                group, environment_ids, keys, value_limit, tenant_ids, start, end
+            )
+            return dict(sorted(tag_keys.items(), key=lambda item: -item[1]["count"]))
+
+        prefix = "tagstore.group_tag_keys:{}".format(
+            md5_text(
+                group.id,
+                *sorted(environment_ids or ()),
+                start.isoformat() if start else "",
+                end.isoformat() if end else "",
+            ).hexdigest()
+        )
+        all_keys_cache_key = f"{prefix}:keys"
+
+        if keys is None:
+            keys = cache.get(all_keys_cache_key)
+            query_all = keys is None
+        else:
+            query_all = False
+
+        tag_keys = {}
+        cache_keys = {}
+        missing = None
+        if keys is not None:
+            cache_keys = {key: f"{prefix}:{md5_text(key).hexdigest()}" for key in keys}
+            cached = cache.get_many(list(cache_keys.values()))
+            tag_keys = {
+                key: cached[cache_key]
+                for key, cache_key in cache_keys.items()
+                if cache_key in cached
+            }
+            missing = [key for key in keys if key not in tag_keys]
+            if tag_keys:
+                metrics.incr(
+                    "tagstore.group_tag_keys.cache", amount=len(tag_keys), tags={"result": "hit"}
+                )
+
+        if query_all or missing:
+            metrics.incr(
+                "tagstore.group_tag_keys.cache",
+                amount=len(missing) if missing else 1,
+                tags={"result": "miss"},
+            )
+            fetched = self.__get_group_tag_keys_and_top_values_batched(
+                group,
+                environment_ids,
+                missing,
+                GROUP_TAG_KEYS_CACHE_VALUE_LIMIT,
+                tenant_ids,
+                start,
+                end,
+            )
+            to_cache = {}
+            if query_all:
+                to_cache[all_keys_cache_key] = list(fetched)
+                cache_keys = {key: f"{prefix}:{md5_text(key).hexdigest()}" for key in fetched}
+            else:
+                # Remember the keys the group doesn't have, too.
+                for key in missing:
+                    fetched.setdefault(key, None)
+            for key, data in fetched.items():
+                to_cache[cache_keys[key]] = data or {}
+            cache.set_many(to_cache, GROUP_TAG_KEYS_CACHE_TTL)
+            tag_keys.update(fetched)
+
+        tag_keys = {
+            key: {**data, "top_values": data["top_values"][:value_limit]}
+            for key, data in tag_keys.items()
+            if data
+        }
+        return dict(sorted(tag_keys.items(), key=lambda item: -item[1]["count"]))
+
+    def __make_group_tag_key(self, group, key, data):
+        return GroupTagKey(
+            group_id=group.id,
+            key=key,
+            values_seen=data["values_seen"],
+            count=data["count"],
+            top_values=[
+                GroupTagValue(
+                    group_id=group.id,
+                    key=key,
+                    value=value,
+                    times_seen=times_seen,
+                    first_seen=parse_datetime(first_seen),
+                    last_seen=parse_datetime(last_seen),
+                )
+                for value, times_seen, first_seen, last_seen in data["top_values"]
+            ],
+        )
+
     def get_release_tags(self, organization_id, project_ids, environment_id, versions):
         filters = {"project_id": project_ids}
         if environment_id:
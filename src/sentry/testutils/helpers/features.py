@@ -55,6 +55,7 @@ def Feature(names):
 
     default_features = sentry.features.has
     default_batch_has = sentry.features.batch_has
+    default_prefetch = sentry.features.prefetch
 
     def resolve_feature_name_value_for_org(organization, feature_name_value):
         if isinstance(feature_name_value, list):
@@ -119,11 +120,32 @@ def Feature(names):
             }
             return {result_key: results}
 
+    def prefetch_features_override(feature_names, organization, projects=None, actor=None):
+        default_results = default_prefetch(
+            [name for name in feature_names if name not in names],
+            organization,
+            projects=projects,
+            actor=actor,
+        )
+        return {
+            obj: {
+                **default_results[obj],
+                **{
+                    name: features_override(name, obj, actor=actor)
+                    for name in feature_names
+                    if name in names
+                },
+            }
+            for obj in (projects if projects is not None else [organization])
+        }
+
     with patch("sentry.features.has") as features_has:
         features_has.side_effect = features_override
         with patch("sentry.features.batch_has") as features_batch_has:
             features_batch_has.side_effect = batch_features_override
-            yield
+            with patch("sentry.features.prefetch") as features_prefetch:
+                features_prefetch.side_effect = prefetch_features_override
+                yield
 
 
 def with_feature(feature):
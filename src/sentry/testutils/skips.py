@@ -104,3 +104,17 @@ def symbolicator_is_available() -> bool:
 requires_symbolicator = pytest.mark.skipif(
     not symbolicator_is_available(), reason="requires symbolicator server running"
 )
+
+
+def benchmark_is_available() -> bool:
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+requires_benchmark = pytest.mark.skipif(
+    not benchmark_is_available(), reason="requires pytest-benchmark"
+)
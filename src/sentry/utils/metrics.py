@@ -1,14 +1,15 @@
 __all__ = ["timing", "incr"]
 
 
+import atexit
 import functools
 import logging
 import time
 from contextlib import contextmanager
-from queue import Queue
+from queue import Empty, Full, Queue
 from random import random
-from threading import Thread
-from typing import Any, Callable, Generator, Optional, Tuple, Type, TypeVar, Union
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Generator, Optional, Tuple, Type, TypeVar, Union
 
 from django.conf import settings
 
@@ -62,37 +63,101 @@ def _sampled_value(value: Union[int, float], sample_rate: float) -> Union[int, f
     return value
 
 
+#: Maximum number of internal metric increments waiting to be written
+INTERNAL_METRICS_QUEUE_SIZE = 10000
+
+#: Seconds over which internal metric increments are aggregated before being
+#: written to TSDB
+INTERNAL_METRICS_FLUSH_INTERVAL = 1.0
+
+_InternalMetric = Tuple[str, Optional[str], Optional[Tags], Union[float, int], float]
+
+
 class InternalMetrics:
-    def __init__(self) -> None:
-        self._started = False
+    """
+    Writes internal metrics to TSDB on a background thread.
 
-    def _start(self) -> None:
-        q: Queue[Tuple[str, Optional[str], Optional[Tags], Union[float, int], float]]
-        self.q = q = Queue()
+    Increments are aggregated by key and instance over `flush_interval`, and
+    written with a single `incr_multi`. Increments that don't fit into the
+    queue are dropped and counted as `internal_metrics.dropped`. Pending
+    increments are written when the process exits.
+    """
 
-        def worker() -> None:
-            from sentry import tsdb
+    def __init__(
+        self,
+        queue_size: int = INTERNAL_METRICS_QUEUE_SIZE,
+        flush_interval: float = INTERNAL_METRICS_FLUSH_INTERVAL,
+    ) -> None:
+        self._started = False
+        self._closed = False
+        self._lock = Lock()
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
 
-            while True:
-                key, instance, tags, amount, sample_rate = q.get()
-                amount = _sampled_value(amount, sample_rate)
-                if instance:
-                    full_key = f"{key}.{instance}"
-                else:
-                    full_key = key
+    def _start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+
+            # `None` stops the worker.
+            self.q: Queue[Optional[_InternalMetric]] = Queue(maxsize=self.queue_size)
+            self._thread = t = Thread(target=self._worker, args=(self.q,))
+            t.daemon = True
+            t.start()
+
+            if not self._closed:
+                atexit.register(self.close)
+            self._started = True
+
+    def _worker(self, q: "Queue[Optional[_InternalMetric]]") -> None:
+        running = True
+        while running:
+            # Wait for the first increment, then aggregate for a while.
+            items = [q.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while items[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
                 try:
-                    tsdb.incr(tsdb.models.internal, full_key, count=amount)
-                except Exception:
-                    logger = logging.getLogger("sentry.errors")
-                    logger.exception("Unable to incr internal metric")
-                finally:
+                    items.append(q.get(timeout=timeout))
+                except Empty:
+                    break
+
+            counts: Dict[str, Union[float, int]] = {}
+            for item in items:
+                if item is None:
+                    running = False
+                    continue
+                key, instance, tags, amount, sample_rate = item
+                if instance:
+                    key = f"{key}.{instance}"
+                counts[key] = counts.get(key, 0) + _sampled_value(amount, sample_rate)
+
+            try:
+                self._write(counts)
+            finally:
+                for _ in items:
                     q.task_done()
 
-        t = Thread(target=worker)
-        t.setDaemon(True)
-        t.start()
+    def _write(self, counts: Dict[str, Union[float, int]]) -> None:
+        from sentry import tsdb
+
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+
+        if counts:
+            try:
+                tsdb.incr_multi(
+                    [(tsdb.models.internal, key, {"count": count}) for key, count in counts.items()]
+                )
+            except Exception:
+                logger = logging.getLogger("sentry.errors")
+                logger.exception("Unable to incr internal metric")
 
-        self._started = True
+        if dropped:
+            backend.incr("internal_metrics.dropped", amount=dropped)
 
     def incr(
         self,
@@ -104,7 +169,27 @@ class InternalMetrics:
     ) -> None:
         if not self._started:
             self._start()
-        self.q.put((key, instance, tags, amount, sample_rate))
+        try:
+            self.q.put_nowait((key, instance, tags, amount, sample_rate))
+        except Full:
+            with self._lock:
+                self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Writes pending increments and stops the worker.
+        """
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            self._closed = True
+
+        try:
+            self.q.put(None, timeout=timeout)
+        except Full:
+            return
+        self._thread.join(timeout)
 
 
 internal = InternalMetrics()
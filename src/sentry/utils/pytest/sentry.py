@@ -307,6 +307,18 @@ def pytest_runtest_teardown(item):
     for model in (OrganizationOption, ProjectOption, UserOption):
         model.objects.clear_local_cache()
 
+    from sentry.api.event_search import search_terms_cache
+
+    search_terms_cache.clear()
+
+    from sentry.search.events.plan import query_plan_cache
+
+    query_plan_cache.clear()
+
+    from sentry import features
+
+    features.default_manager.memo.reset()
+
     Hub.main.bind_client(None)
 
 
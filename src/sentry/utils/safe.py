@@ -43,6 +43,69 @@ def safe_execute(func, *args, **kwargs):
         return result
 
 
+class _RecursiveContainer(Exception):
+    pass
+
+
+class _Sizer:
+    """
+    Measures ``len(force_text(value))`` and ``len(repr(value))``, memoized per
+    value for the duration of a single `trim` call. The sizes of plain
+    containers are derived from the sizes of their items, so that nested
+    values are serialized only once.
+    """
+
+    def __init__(self):
+        # id -> (value, text size, repr size). Values are kept alive so that
+        # their ids are not reused while trimming.
+        self._memo = {}
+        # ids of the containers being measured
+        self._measuring = set()
+
+    def str_size(self, value):
+        if type(value) is str:
+            return len(value)
+        return self._sizes(value)[0]
+
+    def repr_size(self, value):
+        return self._sizes(value)[1]
+
+    def _sizes(self, value):
+        entry = self._memo.get(id(value))
+        if entry is None:
+            if type(value) in (dict, list, tuple):
+                # The text of plain containers is their repr.
+                try:
+                    size = self._container_size(value)
+                except _RecursiveContainer:
+                    if self._measuring:
+                        raise
+                    size = len(repr(value))
+                entry = (value, size, size)
+            else:
+                entry = (value, len(force_text(value)), len(repr(value)))
+            self._memo[id(value)] = entry
+        return entry[1], entry[2]
+
+    def _container_size(self, value):
+        if id(value) in self._measuring:
+            # Containers which contain themselves are measured as a whole.
+            raise _RecursiveContainer
+        self._measuring.add(id(value))
+        try:
+            if type(value) is dict:
+                # {k: v, ...}
+                size = sum(self.repr_size(k) + 2 + self.repr_size(v) for k, v in value.items())
+            else:
+                # [v, ...] or (v, ...), and (v,)
+                size = sum(self.repr_size(v) for v in value)
+                if type(value) is tuple and len(value) == 1:
+                    size += 1
+        finally:
+            self._measuring.discard(id(value))
+        return size + 2 + 2 * max(0, len(value) - 1)
+
+
 def trim(
     value,
     max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
@@ -55,52 +118,77 @@ def trim(
     """
     Truncates a value to ```MAX_VARIABLE_SIZE```.
 
-    The method of truncation depends on the type of value.
+    The method of truncation depends on the type of value. Dict items are
+    kept smallest first. Sizes count the characters of the text representation
+    of values. They are memoized per value, and the sizes of containers and of
+    trimmed values are derived from the sizes of their items instead of
+    serializing them again.
     """
-    options = {
-        "max_depth": max_depth,
-        "max_size": max_size,
-        "object_hook": object_hook,
-        "_depth": _depth + 1,
-    }
-
-    if _depth > max_depth:
+    return _trim(value, max_size, max_depth, object_hook, _depth, _size, _Sizer())[0]
+
+
+def _trim(value, max_size, max_depth, object_hook, depth, size, sizer):
+    """
+    Returns the trimmed value along with its text and repr sizes, which are
+    derived from the trimmed items rather than measured again.
+    """
+    if depth > max_depth:
         if not isinstance(value, str):
             value = json.dumps(value)
-        return trim(value, _size=_size, max_size=max_size)
+        # Values past the maximum depth are never passed to the object hook.
+        result = truncatechars(value, max_size - size)
+        return result, len(result), sizer.repr_size(result)
 
-    elif isinstance(value, dict):
+    if isinstance(value, dict):
         result = {}
-        _size += 2
-        for k in sorted(value.keys(), key=lambda x: (len(force_text(value[x])), x)):
-            v = value[k]
-            trim_v = trim(v, _size=_size, **options)
+        size += 2
+        items_size = 0
+        for k in sorted(value.keys(), key=lambda x: (sizer.str_size(value[x]), x)):
+            trim_v, str_size, repr_size = _trim(
+                value[k], max_size, max_depth, object_hook, depth + 1, size, sizer
+            )
             result[k] = trim_v
-            _size += len(force_text(trim_v)) + 1
-            if _size >= max_size:
+            items_size += sizer.repr_size(k) + 2 + repr_size
+            size += str_size + 1
+            if size >= max_size:
                 break
+        result_size = items_size + 2 + 2 * max(0, len(result) - 1)
+        sizes = (result_size, result_size)
 
     elif isinstance(value, (list, tuple)):
         result = []
-        _size += 2
+        size += 2
+        items_size = 0
         for v in value:
-            trim_v = trim(v, _size=_size, **options)
+            trim_v, str_size, repr_size = _trim(
+                v, max_size, max_depth, object_hook, depth + 1, size, sizer
+            )
             result.append(trim_v)
-            _size += len(force_text(trim_v))
-            if _size >= max_size:
+            items_size += repr_size
+            size += str_size
+            if size >= max_size:
                 break
         if isinstance(value, tuple):
             result = tuple(result)
+            if len(result) == 1:
+                items_size += 1
+        result_size = items_size + 2 + 2 * max(0, len(result) - 1)
+        sizes = (result_size, result_size)
 
     elif isinstance(value, str):
-        result = truncatechars(value, max_size - _size)
+        result = truncatechars(value, max_size - size)
+        sizes = (len(result), sizer.repr_size(result))
 
     else:
         result = value
-
-    if object_hook is None:
-        return result
-    return object_hook(result)
+        sizes = None
+
+    if object_hook is not None:
+        result = object_hook(result)
+        sizes = None
+    if sizes is None:
+        return result, sizer.str_size(result), sizer.repr_size(result)
+    return result, sizes[0], sizes[1]
 
 
 def get_path(data: PathSearchable, *path, **kwargs):
@@ -1,5 +1,12 @@
-from sentry.api.serializers import Serializer, serialize
-from sentry.testutils import TestCase
+import threading
+from unittest import mock
+
+import pytest
+from django.db import connections
+
+from sentry.api.serializers import AttrFetcher, Serializer, resolve_attr_fetchers, serialize
+from sentry.testutils import TestCase, TransactionTestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import control_silo_test
 
 
@@ -78,3 +85,70 @@ class BaseSerializerTest(TestCase):
         result = serialize(foo, serializer=ParentSerializer())
         assert result["parent"] == "something"
         assert result["child"] is None
+
+
+def get_fetchers(calls):
+    def fetch(name, value):
+        def inner(**kwargs):
+            calls.append((name, threading.current_thread().name))
+            return value + sum(kwargs.values())
+
+        return inner
+
+    return {
+        "c": AttrFetcher(fetch("c", 100), depends_on=("a", "b"), io_bound=True),
+        "a": AttrFetcher(fetch("a", 1), io_bound=True),
+        "b": AttrFetcher(fetch("b", 10)),
+    }
+
+
+@control_silo_test(stable=True)
+class ResolveAttrFetchersTest(TestCase):
+    def test_dependency_order(self):
+        calls = []
+        assert resolve_attr_fetchers(get_fetchers(calls)) == {"a": 1, "b": 10, "c": 111}
+        assert [name for name, _ in calls][-1] == "c"
+        assert {thread for _, thread in calls} == {threading.current_thread().name}
+
+    def test_concurrent_in_transaction(self):
+        # Other threads would not see changes made within the test's transaction.
+        calls = []
+        with override_options({"api.serializers.concurrent-attr-fetchers": True}):
+            assert resolve_attr_fetchers(get_fetchers(calls)) == {"a": 1, "b": 10, "c": 111}
+        assert {thread for _, thread in calls} == {threading.current_thread().name}
+
+    def test_unresolvable(self):
+        fetchers = {
+            "a": AttrFetcher(lambda b: b, depends_on=("b",)),
+            "b": AttrFetcher(lambda a: a, depends_on=("a",)),
+        }
+        with pytest.raises(ValueError):
+            resolve_attr_fetchers(fetchers)
+
+
+@control_silo_test(stable=True)
+class ConcurrentResolveAttrFetchersTest(TransactionTestCase):
+    @override_options({"api.serializers.concurrent-attr-fetchers": True})
+    def test_concurrent(self):
+        calls = []
+        with mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all_mock:
+            result = resolve_attr_fetchers(get_fetchers(calls))
+        assert result == {"a": 1, "b": 10, "c": 111}
+        threads = dict(calls)
+        assert threads["b"] == threading.current_thread().name
+        assert threads["a"] != threading.current_thread().name
+        assert threads["c"] != threading.current_thread().name
+        # Pool threads close their connections after every fetch
+        assert close_all_mock.call_count == 2
+
+    @override_options({"api.serializers.concurrent-attr-fetchers": True})
+    def test_concurrent_overlaps_inline_fetchers(self):
+        started = threading.Event()
+        fetchers = {
+            # Listed first, but only runs once the I/O-bound fetcher was submitted
+            "inline": AttrFetcher(lambda: started.wait(timeout=5)),
+            "io": AttrFetcher(started.set, io_bound=True),
+        }
+        assert resolve_attr_fetchers(fetchers) == {"inline": True, "io": None}
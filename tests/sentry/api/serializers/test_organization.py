@@ -87,7 +87,7 @@ class OrganizationSerializerTest(TestCase):
             "transaction-name-mark-scrubbed-as-sanitized",
         }
 
-    @mock.patch("sentry.features.batch_has")
+    @mock.patch.object(features.default_manager, "batch_has")
     def test_organization_batch_has(self, mock_batch):
         user = self.create_user()
         organization = self.create_organization(owner=user)
@@ -217,7 +217,7 @@ class ProjectSerializerTest(TestCase):
         assert result["hasAccess"] is True
         assert result["isMember"] is True
 
-    @mock.patch("sentry.features.batch_has")
+    @mock.patch.object(features.default_manager, "batch_has")
     def test_project_batch_has(self, mock_batch):
         mock_batch.return_value = {
             f"project:{self.project.id}": {
@@ -236,6 +236,7 @@ class ProjectSerializerTest(TestCase):
         mock_features.has = test_features.has
         mock_features.batch_has = test_features.batch_has
         mock_features.has_for_batch = test_features.has_for_batch
+        mock_features.prefetch = test_features.prefetch
 
         early_flag = "projects:TEST_early"
         red_flag = "projects:TEST_red"
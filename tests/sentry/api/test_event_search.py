@@ -16,10 +16,12 @@ from sentry.api.event_search import (
     SearchKey,
     SearchValue,
     parse_search_query,
+    search_terms_cache,
 )
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
+from sentry.snuba.dataset import Dataset
 from sentry.utils import json
 
 fixture_path = "fixtures/search-syntax"
@@ -634,6 +636,57 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         assert search_filter.value.value == 'a"b'
 
 
+class ParseSearchQueryCacheTest(SimpleTestCase):
+    def setUp(self):
+        search_terms_cache.clear()
+
+    def test_cached_terms(self):
+        query = "user.email:foo@example.com release:1.2.1 hello"
+        result = parse_search_query(query)
+        assert search_terms_cache.misses == 1
+
+        cached = parse_search_query(query)
+        assert cached == result
+        assert search_terms_cache.hits == 1
+
+        # Callers get their own list
+        cached.append("junk")
+        assert parse_search_query(query) == result
+
+    def test_keyed_by_config_and_params(self):
+        query = "user.email:foo@example.com"
+        parse_search_query(query)
+        parse_search_query(query, config=SearchConfig())
+        parse_search_query(query, params={"project_id": [1]})
+        parse_search_query(query, config_overrides={"allowed_keys": {"user.email"}})
+        assert search_terms_cache.hits == 0
+
+        parse_search_query(query, params={"project_id": [1]})
+        assert search_terms_cache.hits == 1
+
+    @freeze_time("2023-01-01 12:00:00")
+    def test_relative_dates_not_cached(self):
+        parse_search_query("timestamp:-24h")
+        with freeze_time("2023-01-02 12:00:00"):
+            result = parse_search_query("timestamp:-24h")
+        assert search_terms_cache.hits == 0
+        assert result[0].value.raw_value == timezone.now() - timedelta(hours=24)
+
+    def test_builder_not_cached(self):
+        from sentry.search.events.builder import UnresolvedQuery
+
+        builder = UnresolvedQuery(dataset=Dataset.Discover, params={})
+        parse_search_query("hello", builder=builder)
+        parse_search_query("hello", builder=builder)
+        assert search_terms_cache.hits == search_terms_cache.misses == 0
+
+    def test_errors_not_cached(self):
+        for _ in range(2):
+            with pytest.raises(InvalidSearchQuery):
+                parse_search_query("(user.email:foo")
+        assert search_terms_cache.hits == 0
+
+
 @pytest.mark.parametrize(
     "raw,result",
     [
@@ -0,0 +1,73 @@
+import os
+import random
+
+from freezegun import freeze_time
+
+from sentry.api.event_search import (
+    SearchVisitor,
+    default_config,
+    event_search_grammar,
+    parse_search_query,
+    search_terms_cache,
+)
+from sentry.constants import MODULE_ROOT
+from sentry.exceptions import InvalidSearchQuery
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+
+fixtures_path = os.path.join(MODULE_ROOT, os.pardir, os.pardir, "fixtures/search-syntax")
+
+
+def load_queries():
+    """
+    Returns a stream of query strings, drawn from the search syntax fixtures
+    shared with the frontend. A few queries are much more popular than the
+    rest, like saved searches and dashboards are in practice.
+    """
+    corpus = []
+    for file in sorted(os.listdir(fixtures_path)):
+        with open(os.path.join(fixtures_path, file)) as fp:
+            for case in json.load(fp):
+                if case.get("raisesError"):
+                    continue
+                try:
+                    parse_search_query(case["query"])
+                except InvalidSearchQuery:
+                    continue
+                corpus.append(case["query"])
+    search_terms_cache.clear()
+
+    rng = random.Random(1)
+    rng.shuffle(corpus)
+    weights = [1 / (rank + 1) for rank in range(len(corpus))]
+    return rng.choices(corpus, weights=weights, k=5000)
+
+
+def parse_uncached(query):
+    return SearchVisitor(default_config).visit(event_search_grammar.parse(query))
+
+
+@requires_benchmark
+def test_benchmark_parse_uncached(benchmark):
+    queries = load_queries()
+    benchmark(lambda: [parse_uncached(query) for query in queries])
+
+
+@requires_benchmark
+def test_benchmark_parse_cached(benchmark):
+    queries = load_queries()
+
+    def run():
+        search_terms_cache.clear()
+        return [parse_search_query(query) for query in queries]
+
+    benchmark(run)
+    lookups = search_terms_cache.hits + search_terms_cache.misses
+    benchmark.extra_info["hit_rate"] = search_terms_cache.hits / lookups
+
+
+@freeze_time()
+def test_cached_terms_match_uncached():
+    for query in set(load_queries()):
+        assert parse_search_query(query) == parse_uncached(query)
+        assert parse_search_query(query) == parse_uncached(query)
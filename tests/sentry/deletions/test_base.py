@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.db.models import QuerySet
+
+from sentry import deletions
+from sentry.deletions import base
+from sentry.deletions.base import BaseRelation, ModelRelation, _split_independent
+from sentry.models import Group, GroupMeta, GroupSeen, GroupSnooze
+from sentry.testutils import TestCase, TransactionTestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test(stable=True)
+class ModelDeletionTaskTest(TestCase):
+    def create_meta(self, count):
+        group = self.create_group()
+        for i in range(count):
+            GroupMeta.objects.create(group=group, key=f"key{i}", value="value")
+        return group
+
+    @override_options({"deletions.set-based-engine": True})
+    def test_chunk_keyset_pagination(self):
+        group = self.create_meta(5)
+        other = self.create_meta(1)
+
+        task = deletions.get(
+            model=GroupMeta, query={"group_id": group.id}, query_limit=2, chunk_size=2
+        )
+        assert task.chunk()
+        assert task.last_id is not None
+        while task.chunk():
+            pass
+
+        assert not GroupMeta.objects.filter(group_id=group.id).exists()
+        assert GroupMeta.objects.filter(group_id=other.id).count() == 1
+
+    @override_options({"deletions.set-based-engine": True})
+    def test_delete_set_based(self):
+        group = self.create_meta(3)
+        task = deletions.get(model=GroupMeta, query={"group_id": group.id})
+        assert task.can_delete_set_based(GroupMeta.objects.filter(group_id=group.id))
+
+        with mock.patch.object(
+            QuerySet, "_raw_delete", autospec=True, side_effect=QuerySet._raw_delete
+        ) as raw_delete:
+            while task.chunk():
+                pass
+
+        # All rows are deleted with a single query
+        assert raw_delete.call_count == 1
+        assert not GroupMeta.objects.filter(group_id=group.id).exists()
+
+    @override_options({"deletions.set-based-engine": True})
+    def test_delete_set_based_cached_manager(self):
+        group = self.create_group()
+        GroupSnooze.objects.create(group=group)
+        task = deletions.get(model=GroupSnooze, query={"group_id": group.id})
+
+        # The manager invalidates its cache on deletion
+        assert not task.can_delete_set_based(GroupSnooze.objects.filter(group_id=group.id))
+
+    def test_delete_set_based_disabled(self):
+        group = self.create_meta(1)
+        task = deletions.get(model=GroupMeta, query={"group_id": group.id})
+        assert not task.can_delete_set_based(GroupMeta.objects.filter(group_id=group.id))
+
+    def test_estimate(self):
+        group = self.create_meta(3)
+        GroupSeen.objects.create(group=group, project=group.project, user_id=self.user.id)
+
+        counts = deletions.get(model=Group, query={"id": group.id}).estimate()
+
+        assert counts["sentry.Group"] == 1
+        assert counts["sentry.GroupMeta"] == 3
+        assert counts["sentry.GroupSeen"] == 1
+        # Nothing was deleted
+        assert Group.objects.filter(id=group.id).exists()
+        assert GroupMeta.objects.filter(group_id=group.id).count() == 3
+
+    def test_split_independent(self):
+        meta = ModelRelation(GroupMeta, {"group_id": 1})
+        seen = ModelRelation(GroupSeen, {"group_id": 1})
+        event_data = BaseRelation({"groups": []}, task=None)
+        assert _split_independent([meta, seen, event_data]) == ([meta, seen], [event_data])
+
+        group = ModelRelation(Group, {"id": 1})
+        assert _split_independent([group, meta, seen]) == ([], [group, meta, seen])
+
+        other_meta = ModelRelation(GroupMeta, {"id": 1})
+        assert _split_independent([meta, seen, other_meta]) == ([seen], [meta, other_meta])
+
+
+@region_silo_test(stable=True)
+class ConcurrentChildDeletionTest(TransactionTestCase):
+    @override_options({"deletions.set-based-engine": True})
+    def test_delete_children_concurrently(self):
+        group = self.create_group()
+        GroupMeta.objects.create(group=group, key="key", value="value")
+        GroupSeen.objects.create(group=group, project=group.project, user_id=self.user.id)
+        event_data_task = mock.Mock()
+        event_data_task.return_value.chunk.return_value = False
+
+        task = deletions.get(model=Group, query={"id": group.id})
+        with mock.patch.object(
+            base, "_drain_in_worker", wraps=base._drain_in_worker
+        ) as drain_in_worker:
+            task.delete_children(
+                [
+                    ModelRelation(GroupMeta, {"group_id": group.id}),
+                    ModelRelation(GroupSeen, {"group_id": group.id}),
+                    BaseRelation({"groups": [group]}, task=event_data_task),
+                ]
+            )
+
+        # Relations of models are deleted in workers, the others meanwhile.
+        assert {call.args[0].model for call in drain_in_worker.call_args_list} == {
+            GroupMeta,
+            GroupSeen,
+        }
+        assert event_data_task.return_value.chunk.call_count == 1
+        assert not GroupMeta.objects.filter(group_id=group.id).exists()
+        assert not GroupSeen.objects.filter(group_id=group.id).exists()
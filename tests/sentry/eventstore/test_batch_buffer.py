@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from sentry.eventstore.batch_buffer import EventIdBatchBuffer
+from sentry.utils import redis
+from sentry.utils.dates import to_timestamp
+
+
+@pytest.fixture
+def buffer():
+    return EventIdBatchBuffer(redis.redis_clusters.get("default"))
+
+
+@pytest.fixture
+def key():
+    return f"test:batch-buffer:{{{uuid.uuid4().hex}}}"
+
+
+def make_events(count):
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(minutes=count)
+    return [(start + timedelta(minutes=i), uuid.uuid4().hex) for i in range(count)]
+
+
+def test_push_and_pop(buffer, key):
+    events = make_events(10)
+    assert buffer.size(key) == 0
+    assert buffer.push(key, events[5:], ttl=60) == 5
+    assert buffer.push(key, events[:5], ttl=60) == 10
+    assert buffer.push(key, [], ttl=60) == 10
+    assert 0 < buffer.client.ttl(key) <= 60
+
+    event_ids, min_datetime, max_datetime = buffer.pop(key, 3)
+    # The earliest events are popped first
+    assert event_ids == [event_id for _, event_id in events[:3]]
+    assert min_datetime == events[0][0]
+    assert max_datetime == events[2][0]
+    assert buffer.size(key) == 7
+
+
+def test_pop_all(buffer, key):
+    events = make_events(25)
+    buffer.push(key, events, ttl=60)
+
+    with mock.patch("sentry.eventstore.batch_buffer.POP_CHUNK_SIZE", 10):
+        event_ids, min_datetime, max_datetime = buffer.pop_all(key)
+
+    assert event_ids == [event_id for _, event_id in events]
+    assert min_datetime == events[0][0]
+    assert max_datetime == events[-1][0]
+    assert not buffer.client.exists(key)
+    assert buffer.pop_all(key) == ([], None, None)
+
+
+def test_seal(buffer, key):
+    assert buffer.seal(key) is None
+
+    events = make_events(3)
+    buffer.push(key, events, ttl=60)
+    new_key = buffer.seal(key)
+    assert new_key is not None
+    assert buffer.sizes([key, new_key]) == [0, 3]
+
+
+def test_legacy_list(buffer, key):
+    events = make_events(4)
+    buffer.client.lpush(
+        key, *(f"{to_timestamp(datetime)};{event_id}" for datetime, event_id in events[:2])
+    )
+
+    assert buffer.push(key, events[2:], ttl=60) == 4
+    assert buffer.sizes([key]) == [4]
+
+    event_ids, min_datetime, max_datetime = buffer.pop_all(key)
+    assert set(event_ids) == {event_id for _, event_id in events}
+    assert min_datetime == events[0][0]
+    assert max_datetime == events[-1][0]
+    assert not buffer.client.exists(key)
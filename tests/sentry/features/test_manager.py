@@ -8,6 +8,7 @@ from sentry.features import Feature
 from sentry.features.base import FeatureHandlerStrategy
 from sentry.models import User
 from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
 
 
 class MockBatchHandler(features.BatchFeatureHandler):
@@ -280,3 +281,113 @@ class FeatureManagerTest(TestCase):
 
         assert "feat:4" in manager.entity_features
         assert "feat:5" in manager.entity_features
+
+    def test_has_memoized(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", features.ProjectFeature)
+        handler = mock.Mock(features=["projects:feature"], return_value=True)
+        manager.add_handler(handler)
+        other_project = self.create_project()
+
+        # Not memoized outside of a request or task
+        assert manager.has("projects:feature", self.project, actor=self.user)
+        assert manager.has("projects:feature", self.project, actor=self.user)
+        assert handler.call_count == 2
+
+        handler.reset_mock()
+        with manager.memoize():
+            assert manager.has("projects:feature", self.project, actor=self.user)
+            with manager.memoize():
+                assert manager.has("projects:feature", self.project, actor=self.user)
+            assert manager.has("projects:feature", self.project, actor=self.user)
+            assert handler.call_count == 1
+
+            # Keyed on the entity and the actor
+            assert manager.has("projects:feature", other_project, actor=self.user)
+            assert manager.has("projects:feature", self.project)
+            assert handler.call_count == 3
+
+            # Checks with other arguments aren't memoized
+            assert manager.has("projects:feature", project=self.project)
+            assert manager.has("projects:feature", project=self.project)
+            assert handler.call_count == 5
+
+        handler.reset_mock()
+        assert manager.has("projects:feature", self.project, actor=self.user)
+        assert handler.call_count == 1
+
+    def test_has_memo_disabled(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", features.ProjectFeature)
+        handler = mock.Mock(features=["projects:feature"], return_value=True)
+        manager.add_handler(handler)
+
+        with override_options({"features.check-memo.enabled": False}), manager.memoize():
+            assert manager.has("projects:feature", self.project, actor=self.user)
+            assert manager.has("projects:feature", self.project, actor=self.user)
+        assert handler.call_count == 2
+
+    def test_prefetch_projects(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", features.ProjectFeature)
+        manager.add("projects:registered", features.ProjectFeature)
+        entity_handler = MockBatchHandler()
+        manager.add_entity_handler(entity_handler)
+
+        class RegisteredHandler(features.BatchFeatureHandler):
+            features = frozenset(["projects:registered"])
+            hit_counter = 0
+
+            def _check_for_batch(self, feature_name, organization, actor):
+                self.hit_counter += 1
+                return False
+
+        registered_handler = RegisteredHandler()
+        manager.add_handler(registered_handler)
+        projects = [self.create_project(organization=self.organization) for _ in range(3)]
+
+        with manager.memoize():
+            results = manager.prefetch(
+                ["projects:feature", "projects:registered"],
+                self.organization,
+                projects=projects,
+                actor=self.user,
+            )
+            assert results == {
+                project: {"projects:feature": True, "projects:registered": False}
+                for project in projects
+            }
+            # One batch for all projects
+            assert registered_handler.hit_counter == 1
+
+            with mock.patch.object(entity_handler, "has") as entity_has:
+                for project in projects:
+                    assert manager.has("projects:feature", project, actor=self.user)
+                    assert not manager.has("projects:registered", project, actor=self.user)
+                assert not entity_has.called
+            assert registered_handler.hit_counter == 1
+
+    def test_prefetch_organization(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", features.OrganizationFeature)
+        manager.add("organizations:other", features.OrganizationFeature)
+        manager.add_entity_handler(MockBatchHandler())
+
+        with self.settings(SENTRY_FEATURES={"organizations:other": True}):
+            results = manager.prefetch(
+                ["organizations:feature", "organizations:other"], self.organization, actor=self.user
+            )
+
+        assert results == {
+            self.organization: {"organizations:feature": True, "organizations:other": True}
+        }
+
+    def test_batch_has_no_entity_multiple_projects(self):
+        manager = features.FeatureManager()
+        manager.add("projects:feature", features.ProjectFeature)
+        manager.add_handler(MockBatchHandler())
+        projects = [self.create_project(organization=self.organization) for _ in range(2)]
+
+        results = manager.batch_has(["projects:feature"], actor=self.user, projects=projects)
+        for project in projects:
+            assert results[f"project:{project.id}"]["projects:feature"]
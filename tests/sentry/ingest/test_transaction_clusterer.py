@@ -23,7 +23,7 @@ from sentry.ingest.transaction_clusterer.rules import (
     update_rules,
 )
 from sentry.ingest.transaction_clusterer.tasks import cluster_projects, spawn_clusterers
-from sentry.ingest.transaction_clusterer.tree import TreeClusterer
+from sentry.ingest.transaction_clusterer.tree import IncrementalTreeClusterer, TreeClusterer
 from sentry.models import Organization, Project
 from sentry.relay.config import get_project_config
 from sentry.testutils.helpers import Feature
@@ -58,6 +58,58 @@ def test_single_leaf():
     assert clusterer.get_rules() == ["/a/*/**"]
 
 
+def test_incremental_matches_tree_clusterer():
+    transaction_names = [
+        "/a/b0/c/d0/e",
+        "/a/b0/c/d1/e",
+        "/a/b0/c/d2/e",
+        "/a/b1/c/d0/e",
+        "/a/b1/c/d1/e/",
+        "/a/b1/c/d2/e",
+        "/a/b2/c/d0/e",
+        "/a/b2/c/d1/e/",
+        "/a/b2/c/d2/e",
+        "/a/b2/c1/d2/e",
+    ]
+
+    state = None
+    for batch in (transaction_names[:4], transaction_names[4:]):
+        clusterer = IncrementalTreeClusterer.loads(state, merge_threshold=3)
+        clusterer.add_input(batch)
+        rules = clusterer.get_rules()
+        state = clusterer.dumps()
+
+    assert rules == ["/a/*/c/*/**", "/a/*/**"]
+
+
+def test_incremental_only_recomputes_changed_subtrees():
+    clusterer = IncrementalTreeClusterer(merge_threshold=3)
+    clusterer.add_input(["/a/b1/c/", "/a/b2/c/", "/a/b3/c/", "/x/y1", "/x/y2"])
+    assert clusterer.get_rules() == ["/a/*/**"]
+
+    with mock.patch.object(
+        IncrementalTreeClusterer,
+        "_get_rule_paths",
+        autospec=True,
+        side_effect=IncrementalTreeClusterer._get_rule_paths,
+    ) as get_rule_paths:
+        clusterer.add_input(["/x/y3"])
+        assert clusterer.get_rules() == ["/a/*/**", "/x/*/**"]
+
+    # Only the root, the empty leading segment, /a (served from the cache)
+    # and /x (now merged) are visited.
+    assert get_rule_paths.call_count == 4
+
+
+def test_incremental_expired_state():
+    clusterer = IncrementalTreeClusterer(merge_threshold=2, created_at=0)
+    clusterer.add_input(["/a/b1/c/", "/a/b2/c/"])
+    assert clusterer.get_rules() == ["/a/*/**"]
+
+    clusterer = IncrementalTreeClusterer.loads(clusterer.dumps(), merge_threshold=2, max_age=60)
+    assert clusterer.get_rules() == []
+
+
 @mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 5)
 def test_collection():
     org = Organization(pk=666)
@@ -298,6 +350,26 @@ def test_clusterer_only_runs_when_enough_transactions(mock_update_rules, default
     )
 
 
+@mock.patch("sentry.ingest.transaction_clusterer.tasks.MERGE_THRESHOLD", 2)
+@mock.patch("sentry.ingest.transaction_clusterer.rules.update_rules")
+@pytest.mark.django_db
+def test_incremental_clusterer_keeps_state(mock_update_rules, default_project):
+    project = default_project
+    with override_options({"txnames.incremental-clusterer": True}):
+        _store_transaction_name(project, "/transaction/number/1")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, []
+        )
+
+        # The first name is remembered even though the set was cleared
+        _store_transaction_name(project, "/transaction/number/2")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, ["/transaction/number/*/**"]
+        )
+
+
 @pytest.mark.django_db
 def test_get_deleted_project():
     deleted_project = Project(pk=666, organization=Organization(pk=666))
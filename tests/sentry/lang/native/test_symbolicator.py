@@ -1,4 +1,5 @@
 import copy
+from unittest import mock
 
 import pytest
 
@@ -7,6 +8,7 @@ from sentry.lang.native.sources import (
     redact_internal_sources,
     reverse_aliases_map,
 )
+from sentry.lang.native.symbolicator import SymbolicatorPoller, SymbolicatorSession
 from sentry.testutils.helpers import Feature
 
 CUSTOM_SOURCE_CONFIG = """
@@ -267,3 +269,40 @@ class TestAliasReversion:
         reverse_aliases = reverse_aliases_map(builtin_sources)
         expected = {"sentry:ios-source": "sentry:ios", "sentry:tvos-source": "sentry:ios"}
         assert reverse_aliases == expected
+
+
+class TestSymbolicatorPoller:
+    def test_wait_for_completed(self):
+        sess = SymbolicatorSession(url="http://symbolicator", project_id="1", event_id="abc")
+        responses = [
+            {"status": "pending", "request_id": "req", "retry_after": 1},
+            {"status": "completed", "stacktraces": []},
+        ]
+
+        with mock.patch.object(SymbolicatorSession, "query_task", side_effect=responses):
+            poller = SymbolicatorPoller(interval=0)
+            response, polls = poller.wait_for(sess, "req", timeout=5)
+
+        assert response == {"status": "completed", "stacktraces": []}
+        assert polls == 2
+        assert poller._pending == {}
+
+    def test_wait_for_timeout(self):
+        sess = SymbolicatorSession(url="http://symbolicator", project_id="1", event_id="abc")
+        poller = SymbolicatorPoller()
+
+        with mock.patch.object(poller, "_ensure_running"):
+            response, polls = poller.wait_for(sess, "req", timeout=0)
+
+        assert response == {"status": "pending", "request_id": "req", "retry_after": 0}
+        assert polls == 0
+        assert "req" in poller._pending
+
+    def test_query_task_long_poll(self):
+        sess = SymbolicatorSession(url="http://symbolicator", project_id="1", event_id="abc")
+
+        with mock.patch.object(sess, "_request") as request:
+            sess.query_task("req")
+            sess.query_task("req", timeout=3)
+
+        assert [c.kwargs["params"]["timeout"] for c in request.call_args_list] == [0, 3]
@@ -0,0 +1,103 @@
+from threading import Thread
+from unittest import mock
+
+from sentry.metrics.aggregating import AggregatingMetricsBackend, MetricsBuffer
+from sentry.metrics.base import MetricsBackend
+
+
+def make_backend(**options):
+    backend = AggregatingMetricsBackend("sentry.metrics.dummy.DummyMetricsBackend", **options)
+    inner = backend.buffer.backend = mock.Mock(spec=MetricsBackend)
+    inner.batch.return_value = mock.MagicMock()
+    return backend, inner
+
+
+def test_counters_aggregated():
+    backend, inner = make_backend(flush_interval=60)
+
+    for _ in range(10):
+        backend.incr("foo")
+        backend.incr("foo", tags={"a": "1", "b": "2"})
+        # Tags are the same regardless of their order
+        backend.incr("foo", tags={"b": "2", "a": "1"}, amount=2)
+        backend.incr("foo", instance="bar")
+    backend.flush()
+
+    assert inner.incr.call_count == 3
+    inner.incr.assert_has_calls(
+        [
+            mock.call("foo", None, {}, 10),
+            mock.call("foo", None, {"a": "1", "b": "2"}, 30),
+            mock.call("foo", "bar", {}, 10),
+        ],
+        any_order=True,
+    )
+    inner.batch.assert_called_once_with()
+
+    # Nothing is sent twice
+    inner.reset_mock()
+    backend.flush()
+    assert not inner.incr.called
+
+
+def test_counters_sampled():
+    backend, inner = make_backend(flush_interval=60)
+
+    with mock.patch("sentry.metrics.base.random", return_value=0.95):
+        backend.incr("foo", sample_rate=0.1)
+    with mock.patch("sentry.metrics.base.random", return_value=0.5):
+        backend.incr("foo", sample_rate=0.1)
+    backend.flush()
+
+    inner.incr.assert_called_once_with("foo", None, {}, 10)
+
+
+def test_gauges_and_timings():
+    backend, inner = make_backend(flush_interval=60)
+
+    backend.gauge("foo", 1, tags={"a": "1"})
+    backend.gauge("foo", 2, tags={"a": "1"})
+    backend.timing("foo", 10)
+    backend.timing("foo", 20, sample_rate=0.5)
+    backend.flush()
+
+    inner.gauge.assert_called_once_with("foo", 2, None, {"a": "1"})
+    assert inner.timing.call_args_list == [
+        mock.call("foo", 10, None, {}, 1),
+        mock.call("foo", 20, None, {}, 0.5),
+    ]
+
+
+def test_shared_across_threads():
+    backend, inner = make_backend(flush_interval=60)
+
+    threads = [Thread(target=lambda: [backend.incr("foo") for _ in range(100)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    backend.flush()
+
+    inner.incr.assert_called_once_with("foo", None, {}, 400)
+
+
+def test_flush_when_full():
+    inner = mock.Mock(spec=MetricsBackend)
+    inner.batch.return_value = mock.MagicMock()
+    buffer = MetricsBuffer(inner, flush_interval=60, max_size=2)
+
+    with mock.patch.object(buffer._wake, "set") as wake:
+        buffer.incr(("foo", None, ()), 1)
+        buffer.incr(("foo", None, ()), 1)
+        assert not wake.called
+        buffer.timing(("bar", None, ()), 1, 1)
+        assert wake.called
+
+
+def test_flush_errors_ignored():
+    backend, inner = make_backend(flush_interval=60)
+    inner.incr.side_effect = RuntimeError()
+
+    backend.incr("foo")
+    backend.flush()
+    assert inner.incr.called
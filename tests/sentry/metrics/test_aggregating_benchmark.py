@@ -0,0 +1,44 @@
+from unittest import mock
+
+import pytest
+
+from sentry.metrics.aggregating import AggregatingMetricsBackend
+from sentry.metrics.statsd import StatsdMetricsBackend
+from sentry.testutils.skips import requires_benchmark
+
+TAGS = {"consumer": "ingest-events", "event_type": "error", "result": "success"}
+
+
+def record(backend):
+    # Roughly what an ingest consumer records per event
+    for i in range(10):
+        backend.incr("ingest.events", tags=TAGS)
+        backend.timing("ingest.process", 0.5 + i, tags=TAGS)
+        backend.gauge("ingest.queue_size", i, tags=TAGS)
+
+
+@pytest.fixture
+def statsd_backend():
+    backend = StatsdMetricsBackend(prefix="sentrytest.")
+    try:
+        yield backend
+    finally:
+        backend.client._sock.close()
+
+
+@requires_benchmark
+def test_benchmark_statsd(benchmark, statsd_backend):
+    benchmark(record, statsd_backend)
+
+
+@requires_benchmark
+def test_benchmark_aggregating(benchmark):
+    backend = AggregatingMetricsBackend(
+        "sentry.metrics.statsd.StatsdMetricsBackend",
+        {"prefix": "sentrytest."},
+        flush_interval=60,
+    )
+    # Flushing happens on the background thread, outside of the hot path
+    with mock.patch.object(backend.buffer, "_start"):
+        benchmark(record, backend)
+    backend.flush()
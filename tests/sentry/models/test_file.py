@@ -1,13 +1,17 @@
 import os
+from hashlib import sha1
 from io import BytesIO
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from django.core.files.base import ContentFile
 from django.db import DatabaseError
 
 from sentry.models import File, FileBlob, FileBlobIndex
+from sentry.models.files.abstractfile import CachedFileBlobIndexWrapper
+from sentry.models.files.utils import AssembleChecksumMismatch
 from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 
 
@@ -166,3 +170,85 @@ class FileTest(TestCase):
 
         f = file.getfile(prefetch=True)
         assert f.read() == random_data
+
+    def test_assemble_from_file_blob_ids(self):
+        blobs = [FileBlob.from_file(ContentFile(os.urandom(size))) for size in (1000, 10, 0, 1)]
+        # Blobs can be repeated
+        blob_ids = [blob.id for blob in blobs] + [blobs[0].id]
+        data = b"".join(blob.getfile().read() for blob in blobs) + blobs[0].getfile().read()
+
+        file = File.objects.create(name="test.bin", type="default")
+        tf = file.assemble_from_file_blob_ids(blob_ids, sha1(data).hexdigest())
+
+        assert tf.read() == data
+        assert file.size == len(data)
+        assert file.checksum == sha1(data).hexdigest()
+        assert file.getfile().read() == data
+        indexes = FileBlobIndex.objects.filter(file=file).order_by("id")
+        assert [(i.blob_id, i.offset) for i in indexes] == [
+            (blobs[0].id, 0),
+            (blobs[1].id, 1000),
+            (blobs[2].id, 1010),
+            (blobs[3].id, 1010),
+            (blobs[0].id, 1011),
+        ]
+
+    def test_assemble_from_file_blob_ids_checksum_mismatch(self):
+        blob = FileBlob.from_file(ContentFile(b"foo bar"))
+        file = File.objects.create(name="test.bin", type="default")
+
+        with pytest.raises(AssembleChecksumMismatch):
+            file.assemble_from_file_blob_ids([blob.id], sha1(b"foo").hexdigest())
+
+        assert not FileBlobIndex.objects.filter(file=file).exists()
+
+    @override_options(
+        {
+            "filestore.block-cache.enabled": True,
+            "filestore.block-cache.block-size": 2,
+            "filestore.block-cache.read-ahead": 2,
+        }
+    )
+    def test_block_cache(self):
+        data = b"abcdefghijklmnopqrstuvwxyz"
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(BytesIO(data), 5)
+
+        with file1.getfile() as fp:
+            assert isinstance(fp.file, CachedFileBlobIndexWrapper)
+            assert fp.read() == data
+
+            fp.seek(7)
+            assert fp.tell() == 7
+            assert fp.read(6) == data[7:13]
+            assert fp.tell() == 13
+
+            fp.seek(-3, 2)
+            assert fp.read() == b"xyz"
+            assert fp.read() == b""
+
+            fp.seek(1000)
+            assert fp.tell() == 1000
+            assert fp.read() == b""
+
+            with pytest.raises(IOError):
+                fp.seek(-1)
+
+        with pytest.raises(ValueError):
+            fp.read()
+
+    def test_block_cache_range_reads(self):
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(BytesIO(b"abcdefghijklmnopqrstuvwxyz"), 5)
+        indexes = FileBlobIndex.objects.filter(file=file1).select_related("blob")
+
+        blobfile = MagicMock()
+        blobfile.__enter__.return_value = blobfile
+        blobfile.read_range.return_value = b"hi"
+        with patch.object(FileBlob, "getfile", return_value=blobfile):
+            wrapper = CachedFileBlobIndexWrapper(indexes.order_by("offset"), block_size=2)
+            wrapper.seek(7)
+            assert wrapper.read(2) == b"hi"
+
+        blobfile.read_range.assert_called_once_with(2, 4)
+        assert not blobfile.seek.called
@@ -0,0 +1,39 @@
+"""Measures assembling a file from blobs stored with the filesystem storage backend."""
+import os
+from hashlib import sha1
+
+import pytest
+from django.core.files.base import ContentFile
+
+from sentry.models import File, FileBlob
+from sentry.testutils.skips import requires_benchmark
+
+#: Number of blobs a file is assembled from
+BLOBS = 64
+
+#: Size of each blob
+BLOB_SIZE = 1024 * 1024
+
+
+@pytest.fixture
+def blobs():
+    return [FileBlob.from_file(ContentFile(os.urandom(BLOB_SIZE))) for _ in range(BLOBS)]
+
+
+def assemble(blob_ids, checksum):
+    file = File.objects.create(name="test.bin", type="default")
+    file.assemble_from_file_blob_ids(blob_ids, checksum).close()
+
+
+@requires_benchmark
+@pytest.mark.django_db
+def test_benchmark_assemble_from_file_blob_ids(blobs, benchmark):
+    checksum = sha1()
+    for blob in blobs:
+        with blob.getfile() as f:
+            checksum.update(f.read())
+
+    benchmark.pedantic(assemble, args=([blob.id for blob in blobs], checksum.hexdigest()), rounds=5)
+    benchmark.extra_info["megabytes_per_second"] = (
+        BLOBS * BLOB_SIZE / (1024 * 1024) / benchmark.stats.stats.mean
+    )
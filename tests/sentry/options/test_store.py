@@ -1,3 +1,5 @@
+import os
+import time
 from functools import cached_property
 from unittest.mock import patch
 from uuid import uuid1
@@ -8,6 +10,7 @@ from django.core.cache.backends.locmem import LocMemCache
 
 from sentry.models import Option
 from sentry.options import OptionsManager
+from sentry.options.invalidation import OptionsInvalidation
 from sentry.options.manager import UpdateChannel
 from sentry.options.store import OptionsStore
 from sentry.testutils import TestCase
@@ -161,3 +164,85 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    def make_invalidation(self, listening=True):
+        invalidation = OptionsInvalidation("default", ttl=300, channel=f"test-{uuid1().hex}")
+        if listening:
+            invalidation._pid = os.getpid()
+            invalidation._listening = True
+        return invalidation
+
+    def test_invalidation_published(self):
+        store, key = self.store, self.key
+        store.set_invalidation_impl(self.make_invalidation())
+
+        with patch.object(store.invalidation, "publish") as publish:
+            store.set(key, "bar", UpdateChannel.CLI)
+            publish.assert_called_once_with(key.cache_key)
+
+            publish.reset_mock()
+            store.delete(key)
+            publish.assert_called_once_with(key.cache_key)
+
+        # Failing to publish doesn't fail the update
+        with patch.object(store.invalidation, "publish", side_effect=RuntimeError()):
+            assert store.set(key, "baz", UpdateChannel.CLI)
+        assert store.get(key) == "baz"
+
+    @patch("sentry.options.store.time")
+    def test_invalidation_ttl(self, mocked_time):
+        store, key = self.store, self.make_key(10, 0)
+        mocked_time.return_value = 0
+        store.set(key, "bar", UpdateChannel.CLI)
+        store.flush_local_cache()
+
+        # Not subscribed, so values are kept for their own TTL
+        store.set_invalidation_impl(self.make_invalidation(listening=False))
+        with patch.object(store.invalidation, "listen"):
+            assert store.get(key) == "bar"
+        assert store._local_cache[key.cache_key][1] == 10
+
+        store.flush_local_cache()
+        store.set_invalidation_impl(self.make_invalidation())
+        assert store.get(key) == "bar"
+        assert store._local_cache[key.cache_key][1] == 300
+
+        # Values invalidated while fetching them keep their own TTL
+        store.flush_local_cache()
+
+        def get_invalidated(cache_key):
+            store.invalidation._generation += 1
+            return "bar"
+
+        with patch.object(store.cache, "get", side_effect=get_invalidated):
+            assert store.get(key) == "bar"
+        assert store._local_cache[key.cache_key][1] == 10
+
+    def test_invalidation_listener(self):
+        store, key = self.store, self.key
+        invalidation = self.make_invalidation(listening=False)
+        store.set_invalidation_impl(invalidation)
+
+        store.set(key, "bar", UpdateChannel.CLI)
+        invalidation.listen(store)
+        self.addCleanup(invalidation.stop)
+        thread = invalidation._thread
+        deadline = time.monotonic() + 5
+        while invalidation.generation() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert invalidation.generation() == 0
+
+        # Another process changes the option
+        store._local_cache[key.cache_key] = ("bar", 2**31, 2**31)
+        Option.objects.filter(key=key.name).update(value="lol")
+        store.cache.set(key.cache_key, "lol")
+        invalidation.publish(key.cache_key)
+
+        while key.cache_key in store._local_cache and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.get(key) == "lol"
+        assert invalidation.generation() == 1
+
+        invalidation.stop()
+        assert not thread.is_alive()
+        assert invalidation.generation() is None
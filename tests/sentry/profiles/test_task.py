@@ -8,7 +8,13 @@ from django.urls import reverse
 
 from sentry.lang.javascript.processing import _handles_frame as is_valid_javascript_frame
 from sentry.models import Project
-from sentry.profiles.task import _deobfuscate, _normalize, _process_symbolicator_results_for_sample
+from sentry.profiles.task import (
+    _deobfuscate,
+    _expand_interned_frames,
+    _intern_sample_frames,
+    _normalize,
+    _process_symbolicator_results_for_sample,
+)
 from sentry.testutils import TestCase
 from sentry.testutils.factories import get_fixture_path
 from sentry.utils import json
@@ -419,3 +425,41 @@ class ProfilesProcessTaskTest(TestCase):
         _process_symbolicator_results_for_sample(profile, stacktraces, frames_sent)
 
         assert profile["profile"]["stacks"] == [[0, 1, 2, 3]]
+
+    def test_intern_sample_frames(self):
+        frame_a = {"instruction_addr": "0x1", "package": "/usr/lib/libA"}
+        frame_b = {"instruction_addr": "0x2", "package": "/usr/lib/libA"}
+        samples = [
+            {"frames": [{**frame_a, "adjust_instruction_addr": False}, dict(frame_b)]},
+            {"frames": [dict(frame_b), dict(frame_a)]},
+            {"frames": [{**frame_a, "adjust_instruction_addr": False}, dict(frame_b)]},
+        ]
+
+        unique_frames, sample_frame_indices = _intern_sample_frames(samples)
+
+        assert unique_frames == [
+            {**frame_a, "adjust_instruction_addr": False},
+            frame_b,
+            frame_a,
+        ]
+        assert sample_frame_indices == [[0, 1], [1, 2], [0, 1]]
+
+        # returned from symbolicator, the first frame has an inlined caller
+        stacktraces = [
+            {
+                "frames": [
+                    {"function": "a_inline", "original_index": 0},
+                    {"function": "a", "original_index": 0},
+                    {"function": "b", "original_index": 1},
+                    {"function": "a", "original_index": 2},
+                ]
+            }
+        ]
+
+        expanded = _expand_interned_frames(stacktraces, sample_frame_indices)
+
+        assert [[f["function"] for f in s["frames"]] for s in expanded] == [
+            ["a_inline", "a", "b"],
+            ["b", "a"],
+            ["a_inline", "a", "b"],
+        ]
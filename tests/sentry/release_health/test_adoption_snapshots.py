@@ -0,0 +1,127 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+from rediscluster.nodemanager import NodeManager
+
+from sentry.release_health import adoption_snapshots
+from sentry.release_health.metrics import MetricsReleaseHealthBackend
+from sentry.snuba.metrics import get_series
+from sentry.testutils import BaseMetricsTestCase, TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.redis import RetryingRedisCluster
+
+pytestmark = pytest.mark.sentry_metrics
+
+
+def _initialize_single_node(nodes):
+    # Serve every slot from the test server, which doesn't run in cluster mode.
+    node = nodes.set_node("localhost", 6379, server_type="master")
+    nodes.slots = {slot: [node] for slot in range(nodes.RedisClusterHashSlots)}
+    nodes.populate_startup_nodes()
+
+
+class AdoptionSnapshotsTest(BaseMetricsTestCase, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = MetricsReleaseHealthBackend()
+        self.bulk_store_sessions(
+            [
+                self.build_session(release="foo@1.0.0", environment="prod"),
+                self.build_session(release="foo@1.0.0", environment="prod"),
+                self.build_session(release="foo@2.0.0", environment="prod"),
+                self.build_session(release="foo@2.0.0", environment="canary"),
+            ]
+        )
+        self.project_releases = [
+            (self.project.id, "foo@1.0.0"),
+            (self.project.id, "foo@2.0.0"),
+            (self.project.id, "foo@3.0.0"),
+        ]
+
+    def test_take_snapshots(self):
+        snapshots = adoption_snapshots.take_snapshots(
+            self.organization.id, [self.project.id], timezone.now()
+        )
+        assert snapshots == {
+            (self.project.id, None): ((4, 4), {"foo@1.0.0": (2, 2), "foo@2.0.0": (2, 2)}),
+            (self.project.id, "prod"): ((3, 3), {"foo@1.0.0": (2, 2), "foo@2.0.0": (1, 1)}),
+            (self.project.id, "canary"): ((1, 1), {"foo@2.0.0": (1, 1)}),
+        }
+
+    def test_get_release_adoption(self):
+        adoption_snapshots.update_snapshots(self.organization.id, [self.project.id], timezone.now())
+
+        for environments in (None, ["prod"], ["canary"]):
+            expected = self.backend.get_release_adoption(self.project_releases, environments)
+            with override_options({"release-health.adoption-snapshots.enabled": True}), mock.patch(
+                "sentry.release_health.metrics.get_series", wraps=get_series
+            ) as get_series_mock:
+                assert (
+                    self.backend.get_release_adoption(self.project_releases, environments)
+                    == expected
+                )
+            assert get_series_mock.call_count == 0
+
+    def test_get_adoption_counts(self):
+        now = timezone.now()
+        adoption_snapshots.update_snapshots(self.organization.id, [self.project.id], now)
+
+        with override_options({"release-health.adoption-snapshots.enabled": True}):
+            assert adoption_snapshots.get_adoption_counts(self.project_releases, ["prod"], now) == (
+                {self.project.id: 3},
+                {self.project.id: 3},
+                {(self.project.id, "foo@1.0.0"): 2, (self.project.id, "foo@2.0.0"): 1},
+                {(self.project.id, "foo@1.0.0"): 2, (self.project.id, "foo@2.0.0"): 1},
+            )
+            # Adoption in several environments is not snapshotted
+            assert (
+                adoption_snapshots.get_adoption_counts(
+                    self.project_releases, ["prod", "canary"], now
+                )
+                is None
+            )
+            # Nor of projects without sessions
+            assert (
+                adoption_snapshots.get_adoption_counts(
+                    [(self.create_project().id, "foo@1.0.0")], None, now
+                )
+                is None
+            )
+            # Stale snapshots are not read
+            assert (
+                adoption_snapshots.get_adoption_counts(
+                    self.project_releases, None, now + timedelta(minutes=20)
+                )
+                is None
+            )
+
+        assert adoption_snapshots.get_adoption_counts(self.project_releases, None, now) is None
+
+    @mock.patch.object(NodeManager, "initialize", _initialize_single_node)
+    def test_store_snapshots_cluster(self):
+        client = RetryingRedisCluster(
+            startup_nodes=[{"host": "localhost", "port": 6379}], decode_responses=True
+        )
+        now = timezone.now()
+        snapshots = adoption_snapshots.take_snapshots(self.organization.id, [self.project.id], now)
+        keys = [adoption_snapshots._get_key(*key) for key in snapshots]
+        try:
+            with mock.patch.object(adoption_snapshots, "_get_client", return_value=client):
+                adoption_snapshots.store_snapshots(snapshots, now)
+                # Releases which are gone are removed
+                del snapshots[self.project.id, "prod"][1]["foo@2.0.0"]
+                adoption_snapshots.store_snapshots(snapshots, now)
+
+                with override_options({"release-health.adoption-snapshots.enabled": True}):
+                    assert adoption_snapshots.get_adoption_counts(
+                        self.project_releases, ["prod"], now
+                    ) == (
+                        {self.project.id: 3},
+                        {self.project.id: 3},
+                        {(self.project.id, "foo@1.0.0"): 2},
+                        {(self.project.id, "foo@1.0.0"): 2},
+                    )
+        finally:
+            client.delete(*keys)
@@ -191,3 +191,17 @@ class StorageRecordingTestCase(RecordingTestCaseMixin, TransactionTestCase):
             retention_days=30,
         )
         return StorageBlob().get(recording_segment)
+
+
+class MultiprocessingRecordingTestCase(FilestoreRecordingTestCase):
+    # Multiprocessing is disabled in tests, so batches are processed the way each subprocess
+    # would process them, but inline.
+    @staticmethod
+    def processing_factory():
+        return ProcessReplayRecordingStrategyFactory(num_processes=2)
+
+
+class ThreadedRecordingTestCase(FilestoreRecordingTestCase):
+    @staticmethod
+    def processing_factory():
+        return ProcessReplayRecordingStrategyFactory(num_threads=1, max_pending_futures=1)
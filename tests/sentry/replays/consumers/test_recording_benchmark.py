@@ -0,0 +1,95 @@
+"""Measures the throughput of the recording consumer, in segments per second.
+
+Segments are stored with the filestore driver, i.e. on the local filesystem in tests. Uploads
+to object storage are slower, which is simulated by delaying each upload by `UPLOAD_LATENCY`.
+"""
+import time
+import uuid
+import zlib
+from datetime import datetime
+from unittest import mock
+
+import msgpack
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import BrokerValue, Message, Partition, Topic
+
+from sentry.replays.consumers.recording import ProcessReplayRecordingStrategyFactory
+from sentry.replays.lib.storage import FilestoreBlob
+from sentry.testutils.skips import requires_benchmark
+
+#: Number of segments submitted per round
+SEGMENTS = 50
+
+#: Seconds each upload is delayed by
+UPLOAD_LATENCY = 0.02
+
+
+def make_messages(project):
+    payload = zlib.compress(b'[{"type":5,"data":{"tag":"breadcrumb","payload":{}}}]' * 100)
+    partition = Partition(Topic("ingest-replay-recordings"), 0)
+    messages = []
+    for offset in range(SEGMENTS):
+        message = {
+            "type": "replay_recording_not_chunked",
+            "replay_id": uuid.uuid4().hex,
+            "org_id": project.organization_id,
+            "key_id": 123,
+            "project_id": project.id,
+            "received": int(time.time()),
+            "retention_days": 30,
+            "payload": b'{"segment_id":1}\n' + payload,
+        }
+        messages.append(
+            Message(
+                BrokerValue(
+                    KafkaPayload(b"key", msgpack.packb(message), []),
+                    partition,
+                    offset,
+                    datetime.now(),
+                )
+            )
+        )
+    return messages
+
+
+def consume(factory, messages):
+    commits = []
+    strategy = factory.create_with_partitions(
+        lambda offsets, force=False: commits.append(offsets), {}
+    )
+    for message in messages:
+        strategy.submit(message)
+        strategy.poll()
+    strategy.close()
+    strategy.join(timeout=60)
+
+    # Offsets are committed in order.
+    offsets = [offset for commit in commits for offset in commit.values()]
+    assert offsets == sorted(offsets)
+    assert offsets[-1] == SEGMENTS
+
+
+@pytest.fixture
+def slow_uploads():
+    set_ = FilestoreBlob.set
+
+    def set(self, *args, **kwargs):
+        time.sleep(UPLOAD_LATENCY)
+        return set_(self, *args, **kwargs)
+
+    with mock.patch.object(FilestoreBlob, "set", set):
+        yield
+
+
+@requires_benchmark
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("num_threads", [1, 4, 16])
+def test_benchmark_recording_consumer(default_project, slow_uploads, num_threads, benchmark):
+    factory = ProcessReplayRecordingStrategyFactory(
+        num_threads=num_threads, max_pending_futures=SEGMENTS
+    )
+    benchmark.pedantic(
+        consume, setup=lambda: ((factory, make_messages(default_project)), {}), rounds=5
+    )
+    benchmark.extra_info["segments_per_second"] = SEGMENTS / benchmark.stats.stats.mean
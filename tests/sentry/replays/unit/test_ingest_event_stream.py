@@ -0,0 +1,118 @@
+import datetime
+import zlib
+from unittest import mock
+
+import pytest
+
+from sentry.replays.testutils import (
+    mock_rrweb_div_helloworld,
+    mock_rrweb_node,
+    mock_segment_breadcrumb,
+    mock_segment_console,
+    mock_segment_fullsnapshot,
+    mock_segment_init,
+)
+from sentry.replays.usecases.ingest import event_stream
+from sentry.replays.usecases.ingest.event_stream import iter_custom_events
+from sentry.utils import json
+
+
+def make_click(timestamp: datetime.datetime, node_id: int):
+    return mock_segment_breadcrumb(
+        timestamp,
+        {
+            "timestamp": timestamp.timestamp(),
+            "type": "default",
+            "category": "ui.click",
+            "message": "div#hello",
+            "data": {
+                "nodeId": node_id,
+                "node": {
+                    "id": node_id,
+                    "tagName": "div",
+                    "attributes": {"id": "hello", "class": "[b] {c}"},
+                    "textContent": 'Hello, "world"!',
+                },
+            },
+        },
+    )
+
+
+def make_segment():
+    now = datetime.datetime.now()
+    return [
+        *mock_segment_init(now),
+        *mock_segment_fullsnapshot(
+            now,
+            [
+                mock_rrweb_div_helloworld(),
+                mock_rrweb_node(tagName="span", attributes={"tag": "breadcrumb"}),
+                mock_rrweb_node(textContent='"tag": {"breadcrumb"} ]\\'),
+            ],
+        ),
+        *mock_segment_console(now),
+        *make_click(now, 1),
+        *make_click(now, 2),
+    ]
+
+
+def custom_events(segment):
+    return [event for event in segment if event["type"] == 5]
+
+
+def test_iter_custom_events():
+    segment = make_segment()
+    data = json.dumps(segment).encode()
+    assert list(iter_custom_events(data)) == custom_events(segment)
+
+
+@mock.patch.object(event_stream, "CHUNK_SIZE", 3)
+def test_iter_custom_events_compressed():
+    segment = make_segment()
+    data = json.dumps(segment).encode()
+
+    stream = iter_custom_events(zlib.compress(data))
+    assert list(stream) == custom_events(segment)
+    assert stream.exhausted
+    assert stream.size_uncompressed == len(data)
+
+
+@mock.patch.object(event_stream, "CHUNK_SIZE", 64)
+def test_iter_custom_events_long_strings():
+    now = datetime.datetime.now()
+    segment = [
+        *mock_segment_fullsnapshot(
+            now, [mock_rrweb_node(tagName="img", attributes={"src": '\\"]}[{' * 10000})]
+        ),
+        *make_click(now, 1),
+    ]
+    data = json.dumps(segment).encode()
+
+    assert list(iter_custom_events(zlib.compress(data))) == custom_events(segment)
+
+
+def test_iter_custom_events_stops_reading():
+    segment = make_segment()
+    data = json.dumps(segment).encode()
+
+    stream = iter_custom_events(zlib.compress(data))
+    events = iter(stream)
+    assert next(events) == custom_events(segment)[0]
+    events.close()
+    assert not stream.exhausted
+
+
+def test_iter_custom_events_empty():
+    assert list(iter_custom_events(b"[]")) == []
+    assert list(iter_custom_events(zlib.compress(b"[]"))) == []
+
+
+def test_iter_custom_events_invalid():
+    data = json.dumps(make_segment()).encode()
+
+    with pytest.raises(ValueError):
+        list(iter_custom_events(data[:-1]))
+    with pytest.raises(zlib.error):
+        list(iter_custom_events(zlib.compress(data)[:-8]))
+    with pytest.raises(ValueError):
+        list(iter_custom_events(zlib.compress(b'{"type": 5}')))
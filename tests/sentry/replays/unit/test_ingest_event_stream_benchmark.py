@@ -0,0 +1,123 @@
+import base64
+import datetime
+import random
+import tracemalloc
+import zlib
+
+import pytest
+
+from sentry.replays.testutils import (
+    mock_rrweb_node,
+    mock_segment_breadcrumb,
+    mock_segment_fullsnapshot,
+    mock_segment_init,
+)
+from sentry.replays.usecases.ingest import decompress
+from sentry.replays.usecases.ingest.dom_index import get_user_actions
+from sentry.replays.usecases.ingest.event_stream import iter_custom_events
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+
+
+def mock_dom(depth: int, width: int):
+    if depth == 0:
+        return [mock_rrweb_node(textContent="Lorem ipsum dolor sit amet " * 4)]
+    return [
+        mock_rrweb_node(
+            tagName="div",
+            attributes={"class": "row col-6 container", "style": "margin: 0 auto;"},
+            childNodes=mock_dom(depth - 1, width),
+        )
+        for _ in range(width)
+    ]
+
+
+def mock_recording(clicks: int, mutations: int = 2000, image_size: int = 0) -> bytes:
+    """
+    A large recording: a full snapshot, DOM mutations and a few clicks. The snapshot can contain
+    an image inlined as a data URL of `image_size` bytes.
+    """
+    now = datetime.datetime.now()
+    dom = mock_dom(5, 6)
+    if image_size:
+        image = base64.b64encode(
+            random.Random(1).getrandbits(image_size * 8).to_bytes(image_size, "big")
+        )
+        dom.append(
+            mock_rrweb_node(
+                tagName="img", attributes={"src": f"data:image/png;base64,{image.decode()}"}
+            )
+        )
+    segment = [*mock_segment_init(now), *mock_segment_fullsnapshot(now, dom)]
+    for i in range(mutations):
+        segment.append(
+            {
+                "type": 3,
+                "timestamp": 0,
+                "data": {"source": 0, "adds": [{"parentId": i, "node": mock_dom(2, 4)[0]}]},
+            }
+        )
+        if clicks and i % (mutations // clicks) == 0:
+            segment.extend(
+                mock_segment_breadcrumb(
+                    now,
+                    {
+                        "timestamp": now.timestamp(),
+                        "type": "default",
+                        "category": "ui.click",
+                        "data": {
+                            "node": {
+                                "id": i,
+                                "tagName": "a",
+                                "attributes": {},
+                                "textContent": "Click",
+                            }
+                        },
+                    },
+                )
+            )
+    return zlib.compress(json.dumps(segment).encode())
+
+
+RECORDINGS = {
+    "few_clicks": mock_recording(clicks=5),
+    "many_clicks": mock_recording(clicks=100),
+    "inlined_image": mock_recording(clicks=5, mutations=100, image_size=3 * 1024 * 1024),
+}
+
+
+def parse_whole(segment_bytes):
+    events = json.loads(decompress(segment_bytes), use_rapid_json=True)
+    return get_user_actions(1, "a" * 32, events)
+
+
+def parse_streaming(segment_bytes):
+    return get_user_actions(1, "a" * 32, iter_custom_events(segment_bytes))
+
+
+def run_traced(func, segment_bytes, extra_info):
+    tracemalloc.start()
+    try:
+        func(segment_bytes)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    extra_info["peak_memory"] = max(peak, extra_info.get("peak_memory", 0))
+
+
+@requires_benchmark
+@pytest.mark.parametrize("recording", sorted(RECORDINGS))
+@pytest.mark.parametrize("func", [parse_whole, parse_streaming], ids=["whole", "streaming"])
+def test_benchmark_click_extraction(recording, func, benchmark):
+    segment_bytes = RECORDINGS[recording]
+    assert parse_streaming(segment_bytes) == parse_whole(segment_bytes)
+    benchmark(func, segment_bytes)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("recording", sorted(RECORDINGS))
+@pytest.mark.parametrize("func", [parse_whole, parse_streaming], ids=["whole", "streaming"])
+def test_benchmark_click_extraction_memory(recording, func, benchmark):
+    benchmark.pedantic(
+        run_traced, args=(func, RECORDINGS[recording], benchmark.extra_info), rounds=5
+    )
@@ -0,0 +1,63 @@
+import threading
+import zlib
+from unittest import mock
+
+import pytest
+
+from sentry.replays.lib.storage import RecordingSegmentStorageMeta
+from sentry.replays.usecases import reader
+from sentry.replays.usecases.reader import download_segments, iter_decompress
+
+
+def make_segment(segment_id: int) -> RecordingSegmentStorageMeta:
+    return RecordingSegmentStorageMeta(
+        project_id=1,
+        replay_id="a" * 32,
+        segment_id=segment_id,
+        retention_days=30,
+    )
+
+
+def test_iter_decompress():
+    data = b'[{"hello":"world"}]' * 1000
+    assert b"".join(iter_decompress(data)) == data
+    assert list(iter_decompress(data)) == [data]
+
+    chunks = list(iter_decompress(zlib.compress(data), chunk_size=100))
+    assert b"".join(chunks) == data
+    assert max(len(chunk) for chunk in chunks) == 100
+
+    with pytest.raises(zlib.error):
+        list(iter_decompress(zlib.compress(data)[:-10]))
+
+
+def test_download_segments():
+    blobs = {0: zlib.compress(b'[{"a":0}]'), 1: None, 2: b'[{"a":2}]'}
+
+    def download(segment, transaction, current_hub):
+        return blobs[segment.segment_id]
+
+    with mock.patch.object(reader, "download_segment_blob", side_effect=download):
+        result = b"".join(download_segments([make_segment(i) for i in range(3)]))
+
+    assert result == b'[[{"a":0}],[],[{"a":2}]]'
+
+
+@mock.patch.object(reader, "DOWNLOAD_READ_AHEAD", 2)
+def test_download_segments_read_ahead():
+    downloaded = []
+    lock = threading.Lock()
+
+    def download(segment, transaction, current_hub):
+        with lock:
+            downloaded.append(segment.segment_id)
+        return b"[]"
+
+    with mock.patch.object(reader, "download_segment_blob", side_effect=download):
+        stream = download_segments([make_segment(i) for i in range(10)])
+        assert next(stream) == b"["
+        assert next(stream) == b"[]"
+        reader._get_download_pool().submit(lambda: None).result()
+        # The first segment was streamed, so at most 3 were requested.
+        assert len(downloaded) <= 3
+        stream.close()
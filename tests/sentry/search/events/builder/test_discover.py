@@ -1,5 +1,6 @@
 import datetime
 import re
+from unittest import mock
 
 import pytest
 from django.utils import timezone
@@ -14,6 +15,7 @@ from sentry.search.events import constants
 from sentry.search.events.builder import QueryBuilder
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.snuba import QueryOutsideRetentionError
 from sentry.utils.validators import INVALID_ID_DETAILS
 
@@ -810,3 +812,67 @@ class QueryBuilderTest(TestCase):
                 query="profile.id:foo",
                 selected_columns=["count()"],
             )
+
+
+@override_options({"discover.query-plan-cache": True})
+class QueryPlanTest(TestCase):
+    def setUp(self):
+        self.start = datetime.datetime.now(tz=timezone.utc).replace(
+            hour=10, minute=15, second=0, microsecond=0
+        ) - datetime.timedelta(days=2)
+        self.end = self.start + datetime.timedelta(days=1)
+        self.projects = [self.project.id, self.create_project().id]
+
+    def build(self, start, selected_columns, **kwargs):
+        params = {
+            "project_id": self.projects,
+            "organization_id": self.organization.id,
+            "start": start,
+            "end": start + datetime.timedelta(days=1),
+        }
+        with mock.patch.object(
+            QueryBuilder, "resolve_select", autospec=True, side_effect=QueryBuilder.resolve_select
+        ) as resolve_select:
+            builder = QueryBuilder(
+                Dataset.Discover,
+                params,
+                query="transaction:foo",
+                selected_columns=selected_columns,
+                **kwargs,
+            )
+        return builder, resolve_select.call_count
+
+    def test_reuses_plan_across_time_ranges(self):
+        columns = ["project", "transaction", "count()", "p95(transaction.duration)"]
+        first, calls = self.build(self.start, columns, orderby=["-count()"])
+        assert calls == 1
+
+        second, calls = self.build(self.end, columns, orderby=["-count()"])
+        assert calls == 0
+        assert second.columns == first.columns
+        assert second.orderby == first.orderby
+        assert second.groupby == first.groupby
+        assert second.aggregates == first.aggregates
+        assert second.function_alias_map.keys() == first.function_alias_map.keys()
+        assert Condition(Column("timestamp"), Op.GTE, self.end) in second.where
+        assert second.value_resolver_map["project"](self.project.id) == self.project.slug
+        second.get_snql_query().validate()
+
+    def test_time_dependent_plan_not_reused(self):
+        _, calls = self.build(self.start, ["transaction", "epm()"])
+        assert calls == 1
+        second, calls = self.build(self.end, ["transaction", "epm()"])
+        assert calls == 1
+        second.get_snql_query().validate()
+
+    def test_plan_keyed_by_projects(self):
+        self.build(self.start, ["transaction", "count()"])
+        self.projects = [self.project.id]
+        _, calls = self.build(self.start, ["transaction", "count()"])
+        assert calls == 1
+
+    def test_disabled(self):
+        with override_options({"discover.query-plan-cache": False}):
+            self.build(self.start, ["transaction", "count()"])
+            _, calls = self.build(self.start, ["transaction", "count()"])
+        assert calls == 1
@@ -137,3 +137,29 @@ def test_merge_pii_configs_rule_references():
             },
         },
     }
+
+
+@pytest.mark.django_db
+def test_cached_pii_configs(default_project):
+    from sentry.datascrubbing import get_all_pii_configs, get_cached_pii_configs
+
+    project = default_project
+    project.update_option(
+        "sentry:relay_pii_config",
+        '{"applications": {"extra.test_cached_pii_configs": ["@anything:remove"]}}',
+    )
+
+    configs, cached = get_cached_pii_configs(project)
+    assert not cached
+    assert [pii_config.config for pii_config in configs] == list(get_all_pii_configs(project))
+    assert configs[0].num_applications == 1
+    assert configs[0].total_rules == 1
+
+    assert get_cached_pii_configs(project) == (configs, True)
+
+    # Changing any of the options invalidates the configs
+    project.update_option("sentry:sensitive_fields", ["test_cached_pii_configs"])
+    new_configs, cached = get_cached_pii_configs(project)
+    assert not cached
+    assert new_configs != configs
+    assert [pii_config.config for pii_config in new_configs] == list(get_all_pii_configs(project))
@@ -1,12 +1,21 @@
+from unittest import mock
+
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict, load_grouping_config
 from sentry.stacktraces.processing import (
+    LocalFrameCache,
+    StacktraceProcessor,
     find_stacktraces_in_data,
     get_crash_frame_from_event_data,
+    get_stacktrace_processing_task,
+    local_frame_cache,
+    lookup_frame_cache,
     normalize_stacktraces_for_grouping,
+    write_frame_cache,
 )
 from sentry.testutils import TestCase
+from sentry.utils.cache import cache
 
 
 class FindStacktracesTest(TestCase):
@@ -419,3 +428,72 @@ class NormalizeInApptest(TestCase):
 )
 def test_get_crash_frame(event):
     assert get_crash_frame_from_event_data(event)["marco"] == "polo"
+
+
+class FrameCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        local_frame_cache.clear()
+        self.addCleanup(local_frame_cache.clear)
+
+    def test_lookup_batches_and_fills_local_cache(self):
+        with mock.patch.object(cache, "get_many", return_value={"pf:a": 1, "pf:b": 2}) as get_many:
+            assert lookup_frame_cache(["pf:a", "pf:b", "pf:c"]) == {
+                "pf:a": 1,
+                "pf:b": 2,
+                "pf:c": None,
+            }
+            get_many.assert_called_once_with(["pf:a", "pf:b", "pf:c"])
+
+            # served from the local cache, only the miss goes to the shared cache
+            get_many.return_value = {}
+            assert lookup_frame_cache(["pf:a", "pf:b", "pf:c"])["pf:a"] == 1
+            assert get_many.call_args_list[-1] == mock.call(["pf:c"])
+
+    def test_processing_task_shares_cache_values(self):
+        class Processor(StacktraceProcessor):
+            def handles_frame(self, frame, stacktrace_info):
+                return True
+
+            def preprocess_frame(self, processable_frame):
+                processable_frame.set_cache_key_from_values(processable_frame.frame["function"])
+
+        data = {
+            "stacktrace": {
+                "frames": [{"function": "foo"}, {"function": "bar"}, {"function": "foo"}]
+            }
+        }
+        infos = find_stacktraces_in_data(data)
+        processor = Processor(data, infos, project=self.project)
+
+        with mock.patch.object(
+            cache, "get_many", side_effect=lambda keys: {key: key for key in keys}
+        ) as get_many:
+            task = get_stacktrace_processing_task(infos, [processor])
+
+        # one batched lookup with a key per distinct frame
+        assert get_many.call_count == 1
+        assert len(get_many.call_args[0][0]) == 2
+
+        foo, bar, other_foo = (frame.cache_value for frame in task.iter_processable_frames())
+        assert foo is not None and foo == other_foo
+        assert bar not in (None, foo)
+
+    def test_write_batches(self):
+        with mock.patch.object(cache, "set_many") as set_many:
+            write_frame_cache({"pf:a": 1, "pf:b": 2})
+
+        assert set_many.call_count == 1
+        assert local_frame_cache.get_many(["pf:a", "pf:b"]) == {"pf:a": 1, "pf:b": 2}
+
+    def test_local_cache_bounded(self):
+        local_cache = LocalFrameCache(max_size=2, timeout=60)
+        local_cache.set_many({"a": 1, "b": 2})
+        assert local_cache.get_many(["a"]) == {"a": 1}
+        local_cache.set_many({"c": 3})
+        assert local_cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+    def test_local_cache_expiry(self):
+        local_cache = LocalFrameCache(max_size=2, timeout=-1)
+        local_cache.set_many({"a": 1})
+        assert local_cache.get_many(["a"]) == {}
@@ -1,7 +1,9 @@
+from queue import Queue
 from unittest import mock
 
 import pytest
 
+from sentry import tsdb
 from sentry.utils import metrics
 
 
@@ -44,3 +46,38 @@ def test_wraps():
         args, kwargs = timing.call_args
         assert args[0] == "key"
         assert args[3] == {"foo": True, "result": "success"}
+
+
+def test_internal_metrics_aggregated():
+    internal = metrics.InternalMetrics(flush_interval=60)
+
+    with mock.patch("sentry.tsdb.incr_multi") as incr_multi:
+        for _ in range(10):
+            internal.incr("key")
+            internal.incr("key", instance="instance", amount=2)
+
+        # Pending increments are written on close
+        internal.close()
+
+    assert incr_multi.call_count == 1
+    (items,), _ = incr_multi.call_args
+    assert sorted(items) == [
+        (tsdb.models.internal, "key", {"count": 10}),
+        (tsdb.models.internal, "key.instance", {"count": 20}),
+    ]
+
+
+def test_internal_metrics_dropped():
+    internal = metrics.InternalMetrics(queue_size=1)
+    internal._started = True
+    internal.q = Queue(maxsize=1)
+
+    internal.incr("key")
+    internal.incr("key")
+    assert internal.dropped == 1
+
+    with mock.patch("sentry.utils.metrics.backend") as backend:
+        internal._write({})
+
+    backend.incr.assert_called_once_with("internal_metrics.dropped", amount=1)
+    assert internal.dropped == 0
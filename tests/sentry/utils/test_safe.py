@@ -1,12 +1,17 @@
+import random
 import unittest
+from collections import OrderedDict
 from functools import partial
 from unittest.mock import Mock, patch
 
 import pytest
+from django.utils.encoding import force_text
 
 from sentry.testutils import TestCase
+from sentry.utils import json
 from sentry.utils.canonical import CanonicalKeyDict
 from sentry.utils.safe import (
+    _Sizer,
     get_path,
     safe_execute,
     safe_urlencode,
@@ -14,10 +19,84 @@ from sentry.utils.safe import (
     setdefault_path,
     trim,
 )
+from sentry.utils.strings import truncatechars
 
 a_very_long_string = "a" * 1024
 
 
+def reference_trim(value, max_size=512, max_depth=6, object_hook=None, _depth=0, _size=0):
+    """The original implementation of `trim`, which serializes values at every level."""
+    options = {
+        "max_depth": max_depth,
+        "max_size": max_size,
+        "object_hook": object_hook,
+        "_depth": _depth + 1,
+    }
+
+    if _depth > max_depth:
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        return reference_trim(value, _size=_size, max_size=max_size)
+
+    elif isinstance(value, dict):
+        result = {}
+        _size += 2
+        for k in sorted(value.keys(), key=lambda x: (len(force_text(value[x])), x)):
+            v = value[k]
+            trim_v = reference_trim(v, _size=_size, **options)
+            result[k] = trim_v
+            _size += len(force_text(trim_v)) + 1
+            if _size >= max_size:
+                break
+
+    elif isinstance(value, (list, tuple)):
+        result = []
+        _size += 2
+        for v in value:
+            trim_v = reference_trim(v, _size=_size, **options)
+            result.append(trim_v)
+            _size += len(force_text(trim_v))
+            if _size >= max_size:
+                break
+        if isinstance(value, tuple):
+            result = tuple(result)
+
+    elif isinstance(value, str):
+        result = truncatechars(value, max_size - _size)
+
+    else:
+        result = value
+
+    if object_hook is None:
+        return result
+    return object_hook(result)
+
+
+def random_payload(rng, depth=0, budget=None):
+    budget = [60] if budget is None else budget
+    if depth > 8 or budget[0] <= 0 or rng.random() < 0.35:
+        return rng.choice(
+            [
+                lambda: "".join(
+                    rng.choice("ab'\"\\\n \xfc\U0001f600")
+                    for _ in range(rng.randrange(rng.choice([5, 50, 400])))
+                ),
+                lambda: rng.randrange(-(10**6), 10**6),
+                lambda: rng.random() * 1e20,
+                lambda: None,
+                lambda: True,
+            ]
+        )()
+
+    size = rng.randrange(5)
+    budget[0] -= size
+    kind = rng.choice([dict, OrderedDict, list, tuple])
+    if kind in (dict, OrderedDict):
+        keys = ["a", "b", f"key{rng.randrange(100)}"]
+        return kind((rng.choice(keys), random_payload(rng, depth + 1, budget)) for _ in range(size))
+    return kind(random_payload(rng, depth + 1, budget) for _ in range(size))
+
+
 class TrimTest(unittest.TestCase):
     def test_simple_string(self):
         assert trim(a_very_long_string) == a_very_long_string[:509] + "..."
@@ -60,6 +139,44 @@ class TrimTest(unittest.TestCase):
         a = {"a": {"b": {"c": []}}}
         assert trm(a) == {"a": {"b": {"c": "[]"}}}
 
+    def test_matches_reference(self):
+        rng = random.Random(0)
+        hooks = [None, lambda x: x, lambda x: ("hooked", x) if isinstance(x, dict) else x]
+        for _ in range(2000):
+            value = random_payload(rng)
+            options = {
+                "max_size": rng.choice([12, 50, 200, 512, 4096]),
+                "max_depth": rng.choice([0, 1, 2, 3, 6]),
+                "object_hook": rng.choice(hooks),
+            }
+            expected = reference_trim(value, **options)
+            result = trim(value, **options)
+            assert repr(result) == repr(expected), (value, options)
+
+
+class SizerTest(unittest.TestCase):
+    def test_container_sizes(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            value = random_payload(rng)
+            sizer = _Sizer()
+            assert sizer.repr_size(value) == len(repr(value))
+            assert sizer.str_size(value) == len(force_text(value))
+
+    def test_nested_containers_are_serialized_once(self):
+        value = {"a": [{"b": ("c",)}, ["d", 1, None]]}
+        sizer = _Sizer()
+        with patch("sentry.utils.safe.repr", create=True, side_effect=repr) as repr_mock:
+            assert sizer.repr_size(value) == len(repr(value))
+        # Only leaves are serialized, once each
+        assert repr_mock.call_count == 6
+
+    def test_recursive_containers(self):
+        value = {"a": [1, 2]}
+        value["a"].append(value)
+        assert _Sizer().repr_size(value) == len(repr(value))
+        assert _Sizer().repr_size(value["a"]) == len(repr(value["a"]))
+
 
 class SafeExecuteTest(TestCase):
     def test_with_nameless_function(self):
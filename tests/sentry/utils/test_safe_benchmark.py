@@ -0,0 +1,24 @@
+import pytest
+
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.safe import trim
+
+
+def nested_payload(depth, width):
+    if depth == 0:
+        return "x" * 40
+    return {f"key{i}": nested_payload(depth - 1, width) for i in range(width)}
+
+
+# Events with oversized `extra` and `contexts`, several levels deep
+OVERSIZED_EVENT = {
+    "extra": nested_payload(6, 5),
+    "contexts": {f"context{i}": nested_payload(4, 6) for i in range(5)},
+    "breadcrumbs": [{"data": nested_payload(3, 4), "message": "y" * 200} for _ in range(100)],
+}
+
+
+@requires_benchmark
+@pytest.mark.parametrize("max_size", [512, 8192, 1 << 20])
+def test_benchmark_trim(benchmark, max_size):
+    benchmark(trim, OVERSIZED_EVENT, max_size=max_size, max_depth=8)
@@ -1,17 +1,22 @@
 import time
 from datetime import datetime, timedelta
 from datetime import timezone as dt_timezone
+from unittest import mock
 
 import pytest
 import pytz
+from django.db import connections
 from django.utils import timezone
 
+from sentry.release_health import metrics as release_health_metrics
 from sentry.release_health.base import OverviewStat
 from sentry.release_health.metrics import MetricsReleaseHealthBackend
 from sentry.release_health.sessions import SessionsReleaseHealthBackend
 from sentry.sentry_metrics.configuration import UseCaseKey
+from sentry.snuba.metrics import get_series
 from sentry.snuba.sessions import _make_stats
-from sentry.testutils.cases import BaseMetricsTestCase, SnubaTestCase, TestCase
+from sentry.testutils.cases import BaseMetricsTestCase, SnubaTestCase, TestCase, TransactionTestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 
 pytestmark = pytest.mark.sentry_metrics
@@ -416,6 +421,33 @@ class SnubaSessionsTest(TestCase, SnubaTestCase):
             },
         }
 
+    def test_get_release_health_data_overview_query_fan_out(self):
+        project_releases = [
+            (self.project.id, self.session_release),
+            (self.project.id, self.session_crashed_release),
+        ]
+        for stat in ("users", "sessions"):
+            expected = self.backend.get_release_health_data_overview(
+                project_releases,
+                summary_stats_period="24h",
+                health_stats_period="24h",
+                stat=stat,
+            )
+            with override_options({"release-health.overview-query-fan-out": True}), mock.patch(
+                "sentry.release_health.metrics.get_series", wraps=get_series
+            ) as get_series_mock:
+                data = self.backend.get_release_health_data_overview(
+                    project_releases,
+                    summary_stats_period="24h",
+                    health_stats_period="24h",
+                    stat=stat,
+                )
+            assert data == expected
+
+            if isinstance(self.backend, MetricsReleaseHealthBackend):
+                # Durations, merged totals, health stats and two for adoption
+                assert get_series_mock.call_count == 5
+
     def test_fetching_release_sessions_time_bounds_for_different_release(self):
         """
         Test that ensures only session bounds for releases are calculated according
@@ -1685,3 +1717,44 @@ class InitWithoutUserTestCase(TestCase, SnubaTestCase):
             "users_errored": 0,
             "users_healthy": 2,
         }
+
+
+@region_silo_test
+class ReleaseHealthOverviewFanOutTest(BaseMetricsTestCase, TransactionTestCase):
+    """
+    Overview queries are run one after another within transactions, such as
+    those `TestCase` runs its tests in.
+    """
+
+    backend = MetricsReleaseHealthBackend()
+
+    def test_get_release_health_data_overview_concurrent(self):
+        self.bulk_store_sessions(
+            [
+                self.build_session(release="foo@1.0.0"),
+                self.build_session(release="foo@1.0.0", status="crashed"),
+                self.build_session(release="foo@2.0.0"),
+            ]
+        )
+        project_releases = [(self.project.id, "foo@1.0.0"), (self.project.id, "foo@2.0.0")]
+        expected = self.backend.get_release_health_data_overview(
+            project_releases, summary_stats_period="24h", health_stats_period="24h"
+        )
+        assert expected[self.project.id, "foo@1.0.0"]["total_sessions"] == 2
+
+        with override_options({"release-health.overview-query-fan-out": True}), mock.patch.object(
+            release_health_metrics,
+            "_run_overview_query_in_worker",
+            wraps=release_health_metrics._run_overview_query_in_worker,
+        ) as worker_mock, mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all_mock:
+            data = self.backend.get_release_health_data_overview(
+                project_releases, summary_stats_period="24h", health_stats_period="24h"
+            )
+
+        assert data == expected
+        # Durations, totals, adoption and health stats
+        assert worker_mock.call_count == 4
+        # Every worker closes the connections it opened
+        assert close_all_mock.call_count == 4
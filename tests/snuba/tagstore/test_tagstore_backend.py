@@ -1,5 +1,6 @@
 from datetime import timedelta
 from functools import cached_property
+from unittest import mock
 
 import pytest
 from django.utils import timezone
@@ -12,6 +13,7 @@ from sentry.search.events.constants import (
     SEMVER_BUILD_ALIAS,
     SEMVER_PACKAGE_ALIAS,
 )
+from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT
 from sentry.tagstore.exceptions import (
     GroupTagKeyNotFound,
     GroupTagValueNotFound,
@@ -23,6 +25,8 @@ from sentry.tagstore.types import GroupTagValue, TagValue
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.cases import PerformanceIssueTestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import snuba
 from sentry.utils.samples import load_data
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
@@ -221,6 +225,79 @@ class TagStorageTest(TestCase, SnubaTestCase, SearchIssueTestMixin, PerformanceI
         assert {v.value for v in top_release_values} == {"100", "200"}
         assert all(v.times_seen == 1 for v in top_release_values)
 
+    @override_options({"tagstore.batched-group-tag-keys": True})
+    def test_get_group_tag_keys_and_top_values_batched(self):
+        tenant_ids = {"referrer": "r", "organization_id": 1234}
+        with mock.patch.object(snuba, "bulk_raw_query", wraps=snuba.bulk_raw_query) as query:
+            # As loaded by the tags sidebar
+            result = list(
+                self.ts.get_group_tag_keys_and_top_values(
+                    self.proj1group1, [self.proj1env1.id], value_limit=10, tenant_ids=tenant_ids
+                )
+            )
+            # Totals and top values are fetched with a single batch of queries.
+            assert query.call_count == 1
+
+            tags = [r.key for r in result]
+            assert set(tags) == {
+                "foo",
+                "baz",
+                "environment",
+                "sentry:release",
+                "sentry:user",
+                "level",
+            }
+
+            result.sort(key=lambda r: r.key)
+            assert result[0].key == "baz"
+            assert result[0].top_values[0].value == "quux"
+            assert result[0].count == 2
+
+            assert result[4].key == "sentry:release"
+            assert result[4].count == 2
+            assert result[4].values_seen == 2
+            top_release_values = result[4].top_values
+            assert {v.value for v in top_release_values} == {"100", "200"}
+            assert all(v.times_seen == 1 for v in top_release_values)
+
+            # Loaded again, for the tag distribution and by the tag key details,
+            # the keys come from the cache.
+            result = self.ts.get_group_tag_keys_and_top_values(
+                self.proj1group1, [self.proj1env1.id], tenant_ids=tenant_ids
+            )
+            assert {r.key for r in result} == set(tags)
+            result = self.ts.get_group_tag_keys_and_top_values(
+                self.proj1group1,
+                [self.proj1env1.id],
+                keys=["environment", "sentry:release"],
+                value_limit=TOP_VALUES_DEFAULT_LIMIT,
+                tenant_ids=tenant_ids,
+            )
+            assert {r.key for r in result} == {"environment", "sentry:release"}
+            result = self.ts.get_group_tag_keys_and_top_values(
+                self.proj1group1,
+                [self.proj1env1.id],
+                keys=["sentry:release"],
+                value_limit=1,
+                tenant_ids=tenant_ids,
+            )
+            assert len(result[0].top_values) == 1
+
+            tag_key = self.ts.get_group_tag_key(
+                self.proj1group1, self.proj1env1.id, "sentry:release", tenant_ids=tenant_ids
+            )
+            assert tag_key.key == "sentry:release"
+            assert {v.value for v in tag_key.top_values} == {"100", "200"}
+            assert query.call_count == 1
+
+            # Keys the group doesn't have are remembered, too.
+            for _ in range(2):
+                with pytest.raises(GroupTagKeyNotFound):
+                    self.ts.get_group_tag_key(
+                        self.proj1group1, self.proj1env1.id, "notreal", tenant_ids=tenant_ids
+                    )
+            assert query.call_count == 2
+
     def test_get_group_tag_keys_and_top_values_perf_issue(self):
         perf_group, env = self.perf_group_and_env
 